@@ -0,0 +1,314 @@
+# benchmarks/golden.py
+"""
+출력 동등성 검증 (고정 합성 입력에 대한 기준 출력 기록 → 대체 구현과 비교)
+
+산출물: clean_data → add_features → prepare_time_series → stl → prophet → arima → metrics
+- record: 현재 구현의 산출물을 GOLDEN_DIR에 기록 (산출물별 .npz + manifest.json)
+- check: 현재 코드(또는 --override로 교체한 구현)를 다시 실행해 산출물별 허용 오차로 비교
+  교체한 구현의 출력은 하위 산출물 입력으로 그대로 전달 (처음 달라진 산출물부터 영향 확인)
+
+사용 예:
+    python benchmarks/golden.py record
+    python benchmarks/golden.py check
+    python benchmarks/golden.py check --only clean_data prepare_time_series
+    python benchmarks/golden.py check --override clean_data=processed.cleaner_fast:clean_data
+"""
+import os
+import sys
+import json
+import argparse
+import importlib
+import logging
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic import generate_ratio_data
+
+GOLDEN_DIR = os.path.join(ROOT, 'benchmarks', 'golden')
+GOLDEN_INPUT = {'n_groups': 8, 'n_periods': 156, 'freq': 'W', 'seed': 2025}
+FIT_GROUPS = 3  # 모델 학습 산출물(prophet·arima·metrics) 대상 그룹 수
+HORIZON = 26
+MAX_DETAILS = 5  # 산출물별 불일치 상세 표시 개수
+
+# 산출물별 허용 오차 (np.isclose 기준: |a - b| <= atol + rtol * |b|)
+TOLERANCES = {
+    'clean_data': {'rtol': 0.0, 'atol': 1e-12},
+    'add_features': {'rtol': 1e-9, 'atol': 1e-9},
+    'prepare_time_series': {'rtol': 1e-9, 'atol': 1e-9},
+    'stl': {'rtol': 1e-6, 'atol': 1e-8},
+    'prophet': {'rtol': 1e-3, 'atol': 1e-3},
+    'arima': {'rtol': 1e-4, 'atol': 1e-4},
+    'metrics': {'rtol': 1e-3, 'atol': 1e-4}
+}
+ARTIFACTS = tuple(TOLERANCES)
+
+# 산출물 계산 (ctx: 상위 산출물, impl: 교체 가능한 구현) ----------------------
+def _default_impls() -> Dict[str, Callable]:
+    from processed.cleaner import clean_data
+    from modeling.data_preprocessor import add_features, prepare_time_series, clean_data as filter_series
+    from modeling.stl_decomposer import decompose_trend
+    from modeling.prophet_model import prophet_forecast
+    from modeling.arima_model import train_arima
+    from modeling.evaluator import evaluate_forecasts
+    return {
+        'clean_data': clean_data,
+        'add_features': add_features,
+        'prepare_time_series': lambda df: filter_series(prepare_time_series(df)),
+        'stl': lambda df: decompose_trend(df)['decompositions'],
+        'prophet': lambda train: prophet_forecast(
+            train.reset_index(drop=True), pd.Series(train.index), periods=HORIZON, validate=False, fast=True
+        ),
+        'arima': lambda train: train_arima(train.reset_index(drop=True), n_periods=HORIZON, method='fourier', max_workers=1),
+        'metrics': evaluate_forecasts
+    }
+
+def _train_series(decomposed: Dict[str, Dict]) -> Dict[str, pd.Series]:
+    return {group: decomposed[group]['observed'][:-HORIZON] for group in sorted(decomposed)[:FIT_GROUPS]}
+
+def compute(
+    artifacts: Sequence[str],
+    overrides: Optional[Dict[str, Callable]] = None
+) -> Dict[str, Any]:
+    """
+    산출물 계산 (요청한 산출물까지 상위 산출물 포함)
+    Returns:
+        {산출물: 비교용 값} - DataFrame·Series·ndarray·스칼라 및 이들의 중첩 dict
+    """
+    impls = {**_default_impls(), **(overrides or {})}
+    last = max(ARTIFACTS.index(name) for name in artifacts)
+    outputs, ctx = {}, {'raw': generate_ratio_data(**GOLDEN_INPUT)}
+    for name in ARTIFACTS[:last + 1]:
+        if name == 'clean_data':
+            ctx['cleaned'] = outputs[name] = impls[name](ctx['raw'].copy())
+        elif name == 'add_features':
+            ctx['features'] = outputs[name] = impls[name](ctx['cleaned'].copy())
+        elif name == 'prepare_time_series':
+            ctx['series'] = outputs[name] = impls[name](ctx['features'].copy())
+        elif name == 'stl':
+            ctx['decomposed'] = impls[name](ctx['series'])
+            outputs[name] = {group: data for group, data in ctx['decomposed'].items() if data is not None}
+        elif name == 'prophet':
+            ctx['prophet'] = {group: impls[name](train) for group, train in _train_series(ctx['decomposed']).items()}
+            outputs[name] = {
+                group: {
+                    'yhat': fit['yhat'],
+                    'forecast_details': fit['forecast_details'],
+                    'changepoints': fit['changepoints']
+                }
+                for group, fit in ctx['prophet'].items()
+            }
+        elif name == 'arima':
+            ctx['arima'] = {group: impls[name](train) for group, train in _train_series(ctx['decomposed']).items()}
+            outputs[name] = {
+                group: {
+                    'forecast': np.asarray(forecast, dtype=float),
+                    'order': np.asarray(model.order),
+                    'aic': float(model.aic())
+                }
+                for group, (model, forecast) in ctx['arima'].items()
+            }
+        elif name == 'metrics':
+            from modeling.arima_model import ensemble_forecast
+            forecasts = {
+                group: {
+                    'prophet': {'yhat': ctx['prophet'][group]['yhat']},
+                    'ensemble': ensemble_forecast(
+                        pd.Series(ctx['prophet'][group]['yhat'][-HORIZON:]),
+                        pd.Series(np.asarray(ctx['arima'][group][1], dtype=float)),
+                        (0.5, 0.5)
+                    )
+                }
+                for group in ctx['prophet']
+            }
+            outputs[name] = impls[name]({group: ctx['decomposed'][group] for group in forecasts}, forecasts)
+    return {name: outputs[name] for name in artifacts}
+
+# 평탄화·저장 ---------------------------------------------------------------
+def flatten(value: Any, prefix: str = '') -> Dict[str, np.ndarray]:
+    """중첩 산출물 → {경로: 배열} (DataFrame은 컬럼·인덱스별, 문자열은 유니코드 배열)"""
+    flat = {}
+    join = lambda key: f'{prefix}/{key}' if prefix else str(key)
+    if isinstance(value, Mapping):
+        for key in sorted(value, key=str):
+            flat.update(flatten(value[key], join(key)))
+    elif isinstance(value, pd.DataFrame):
+        flat[join('@index')] = _to_array(value.index)
+        for column in value.columns:
+            flat[join(column)] = _to_array(value[column])
+    elif isinstance(value, pd.Series):
+        flat[join('@index')] = _to_array(value.index)
+        flat[prefix or 'values'] = _to_array(value)
+    elif isinstance(value, (np.ndarray, list, tuple, pd.Index)):
+        flat[prefix] = _to_array(value)
+    elif value is None or isinstance(value, (str, bool, int, float, np.generic)):
+        flat[prefix] = _to_array([value])
+    return flat
+
+def _to_array(values: Any) -> np.ndarray:
+    array = np.asarray(values)
+    if isinstance(values, (pd.Series, pd.Index)) and pd.api.types.is_datetime64_any_dtype(values.dtype):
+        return np.asarray(values, dtype='datetime64[ns]')
+    if array.dtype == object or pd.api.types.is_extension_array_dtype(getattr(values, 'dtype', None)):
+        try:
+            return np.asarray(values, dtype=float)
+        except (TypeError, ValueError):
+            return np.asarray([str(v) for v in np.ravel(array)]).reshape(array.shape)
+    return array
+
+def record(golden_dir: str = GOLDEN_DIR, artifacts: Sequence[str] = ARTIFACTS) -> Dict[str, int]:
+    """현재 구현 산출물 기록 → {산출물: 배열 수}"""
+    os.makedirs(golden_dir, exist_ok=True)
+    outputs = compute(artifacts)
+    manifest = {'input': GOLDEN_INPUT, 'fit_groups': FIT_GROUPS, 'horizon': HORIZON, 'artifacts': {}}
+    manifest_path = os.path.join(golden_dir, 'manifest.json')
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest['artifacts'] = json.load(f).get('artifacts', {})
+    for name, value in outputs.items():
+        flat = flatten(value)
+        np.savez_compressed(os.path.join(golden_dir, f'{name}.npz'), **{f'a{i}': array for i, array in enumerate(flat.values())})
+        manifest['artifacts'][name] = {
+            'paths': list(flat),
+            'versions': _versions()
+        }
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return {name: len(manifest['artifacts'][name]['paths']) for name in outputs}
+
+def load(name: str, golden_dir: str = GOLDEN_DIR) -> Dict[str, np.ndarray]:
+    """기록된 산출물 → {경로: 배열}"""
+    with open(os.path.join(golden_dir, 'manifest.json'), 'r', encoding='utf-8') as f:
+        paths = json.load(f)['artifacts'][name]['paths']
+    with np.load(os.path.join(golden_dir, f'{name}.npz'), allow_pickle=False) as data:
+        return {path: data[f'a{i}'] for i, path in enumerate(paths)}
+
+def _versions() -> Dict[str, str]:
+    versions = {'numpy': np.__version__, 'pandas': pd.__version__}
+    for module in ('statsmodels', 'prophet', 'pmdarima'):
+        try:
+            versions[module] = importlib.import_module(module).__version__
+        except ImportError:
+            pass
+    return versions
+
+# 비교 ---------------------------------------------------------------------
+def compare_arrays(expected: np.ndarray, actual: np.ndarray, rtol: float, atol: float) -> Dict[str, Any]:
+    """
+    배열 1개 비교
+    Returns:
+        {'ok', 'reason', 'mismatched', 'max_abs', 'max_rel'}
+    """
+    if expected.shape != actual.shape:
+        return {'ok': False, 'reason': f'shape {expected.shape} → {actual.shape}', 'mismatched': None, 'max_abs': None, 'max_rel': None}
+    numeric = np.issubdtype(expected.dtype, np.number) or expected.dtype == bool
+    if not numeric or not (np.issubdtype(actual.dtype, np.number) or actual.dtype == bool):
+        if np.issubdtype(expected.dtype, np.datetime64) and np.issubdtype(actual.dtype, np.datetime64):
+            mismatch = expected.astype('datetime64[ns]') != actual.astype('datetime64[ns]')
+        else:
+            mismatch = expected.astype(str) != actual.astype(str)
+        count = int(np.sum(mismatch))
+        return {'ok': count == 0, 'reason': 'value' if count else '', 'mismatched': count, 'max_abs': None, 'max_rel': None}
+
+    expected = expected.astype(float)
+    actual = actual.astype(float)
+    close = np.isclose(actual, expected, rtol=rtol, atol=atol, equal_nan=True)
+    diff = np.abs(actual - expected)
+    finite = np.isfinite(diff)
+    max_abs = float(diff[finite].max()) if finite.any() else 0.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rel = diff / np.abs(expected)
+    rel = rel[np.isfinite(rel)]
+    count = int((~close).sum())
+    return {
+        'ok': count == 0, 'reason': 'tolerance' if count else '', 'mismatched': count,
+        'max_abs': max_abs, 'max_rel': float(rel.max()) if rel.size else 0.0
+    }
+
+def check(
+    artifacts: Sequence[str] = ARTIFACTS,
+    overrides: Optional[Dict[str, Callable]] = None,
+    golden_dir: str = GOLDEN_DIR,
+    tolerances: Optional[Dict[str, Dict[str, float]]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    기록된 산출물과 비교
+    Returns:
+        {산출물: {'ok', 'checked', 'mismatched', 'max_abs', 'max_rel', 'details': [(경로, 사유)]}}
+    """
+    tolerances = {**TOLERANCES, **(tolerances or {})}
+    outputs = compute(artifacts, overrides)
+    report = {}
+    for name, value in outputs.items():
+        expected = load(name, golden_dir)
+        actual = flatten(value)
+        details = [(path, 'missing') for path in expected if path not in actual]
+        details += [(path, 'unexpected') for path in actual if path not in expected]
+        max_abs = max_rel = 0.0
+        for path in expected:
+            if path not in actual:
+                continue
+            result = compare_arrays(expected[path], actual[path], **tolerances[name])
+            max_abs = max(max_abs, result['max_abs'] or 0.0)
+            max_rel = max(max_rel, result['max_rel'] or 0.0)
+            if not result['ok']:
+                reason = result['reason']
+                if result['mismatched']:
+                    reason += f" ({result['mismatched']}개, max_abs={result['max_abs']}, max_rel={result['max_rel']})"
+                details.append((path, reason))
+        report[name] = {
+            'ok': not details, 'checked': len(expected), 'mismatched': len(details),
+            'max_abs': max_abs, 'max_rel': max_rel, 'details': details
+        }
+    return report
+
+def format_report(report: Dict[str, Dict[str, Any]]) -> str:
+    """비교 결과 표 + 불일치 상세"""
+    lines = [f"{'artifact':<20} {'status':<6} {'checked':>7} {'diff':>5} {'max_abs':>10} {'max_rel':>10}"]
+    for name, result in report.items():
+        lines.append(
+            f"{name:<20} {'OK' if result['ok'] else 'DIFF':<6} {result['checked']:>7} {result['mismatched']:>5} "
+            f"{result['max_abs']:>10.3g} {result['max_rel']:>10.3g}"
+        )
+        for path, reason in result['details'][:MAX_DETAILS]:
+            lines.append(f"    {path}: {reason}")
+        if len(result['details']) > MAX_DETAILS:
+            lines.append(f"    ... 외 {len(result['details']) - MAX_DETAILS}개")
+    return '\n'.join(lines)
+
+def _load_override(spec: str) -> Tuple[str, Callable]:
+    """'산출물=모듈:함수' → (산출물, 함수)"""
+    try:
+        name, target = spec.split('=', 1)
+        module, func = target.split(':', 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"형식 오류 (산출물=모듈:함수): {spec}")
+    if name not in ARTIFACTS:
+        raise argparse.ArgumentTypeError(f"알 수 없는 산출물: {name}")
+    return name, getattr(importlib.import_module(module), func)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='출력 동등성 검증')
+    parser.add_argument('command', choices=('record', 'check'))
+    parser.add_argument('--only', nargs='+', choices=ARTIFACTS, default=list(ARTIFACTS), help='대상 산출물')
+    parser.add_argument('--override', action='append', default=[], type=_load_override, help='산출물=모듈:함수 (대체 구현)')
+    parser.add_argument('--golden-dir', default=GOLDEN_DIR, help='기준 출력 경로')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    if args.command == 'record':
+        counts = record(args.golden_dir, args.only)
+        for name, count in counts.items():
+            print(f"{name}: {count}개 배열 기록")
+        return 0
+
+    report = check(args.only, dict(args.override), args.golden_dir)
+    print(format_report(report))
+    return 0 if all(result['ok'] for result in report.values()) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,296 @@
+# benchmarks/pipeline_bench.py
+"""
+파이프라인 단계별 실행 시간·메모리 측정 (합성 데이터, 그룹 수 × 기간 수 격자)
+
+- 시간: 단계별 repeat회 실행 중앙값 (입력 복사는 측정 제외)
+- 메모리: 단계마다 새 프로세스(fork)에서 1회 더 실행해 측정 (이전 단계·측정의 최대값이 섞이지 않음)
+    peak_mb: 단계 프로세스 Python 힙 최대 할당량 (tracemalloc, 프로세스 풀 워커 제외)
+    rss_mb: 단계 프로세스 최대 RSS 증가량 (시작 시점 대비)
+    workers_rss_mb: 프로세스 풀 워커 중 최대 RSS 증가량 (fork 워커는 단계 프로세스 메모리를 공유하므로 같은 기준, 풀 미사용 시 없음)
+- 모델 학습 단계(prophet_forecast, train_arima)는 fit_sample개 그룹만 실행해 그룹당 시간을 측정하고 전체 그룹 수로 환산
+- 리포트 출력은 임시 디렉터리에 기록
+
+사용 예:
+    python benchmarks/pipeline_bench.py
+    python benchmarks/pipeline_bench.py --groups 10 100 1000 --periods 104 156 --stages clean_data decompose_trend
+    python benchmarks/pipeline_bench.py --save benchmarks/pipeline_baseline.json
+    python benchmarks/pipeline_bench.py --baseline benchmarks/pipeline_baseline.json --tolerance 0.3
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+import tempfile
+import statistics
+import tracemalloc
+import multiprocessing
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd
+from benchmarks.synthetic import generate_ratio_data, synthetic_forecasts
+from modeling.tracing import peak_rss_mb
+
+STAGES = (
+    'clean_data', 'add_features', 'prepare_time_series', 'decompose_trend',
+    'prophet_forecast', 'train_arima', 'evaluate_forecasts', 'generate_insights'
+)
+FIT_STAGES = ('prophet_forecast', 'train_arima')
+MEMORY_KEYS = ('peak_mb', 'rss_mb', 'workers_rss_mb')  # 회귀 비교 대상 메모리 지표
+HORIZON = 26
+
+# 단계 정의 (ctx: 이전 단계 산출물) ----------------------------------------
+def _clean_data(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    from processed.cleaner import clean_data
+    return {'cleaned': clean_data(ctx['raw'].copy())}
+
+def _add_features(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    from modeling.data_preprocessor import add_features
+    return {'features': add_features(ctx['cleaned'].copy())}
+
+def _prepare_time_series(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    from modeling.data_preprocessor import prepare_time_series, clean_data
+    return {'series': clean_data(prepare_time_series(ctx['features'].copy()))}
+
+def _decompose_trend(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    from modeling.stl_decomposer import decompose_trend
+    return {'decomposed': decompose_trend(ctx['series'])['decompositions']}
+
+def _train_frames(ctx: Dict[str, Any]) -> Dict[str, pd.Series]:
+    """학습 구간 (마지막 HORIZON 기간 제외), fit_sample개 그룹"""
+    groups = sorted(ctx['decomposed'])[:ctx['fit_sample']]
+    return {group: ctx['decomposed'][group]['observed'][:-HORIZON] for group in groups}
+
+def _prophet_forecast(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    from modeling.prophet_model import prophet_forecast
+    fits = {}
+    for group, train in _train_frames(ctx).items():
+        fits[group] = prophet_forecast(
+            train.reset_index(drop=True), pd.Series(train.index), periods=HORIZON, validate=False, fast=True
+        )
+    return {'prophet_fits': fits, 'fitted_groups': len(fits)}
+
+def _train_arima(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    from modeling.arima_model import train_arima
+    fits = {}
+    for group, train in _train_frames(ctx).items():
+        fits[group] = train_arima(train.reset_index(drop=True), n_periods=HORIZON, method='fourier', max_workers=1)
+    return {'arima_fits': fits, 'fitted_groups': len(fits)}
+
+def _evaluate_forecasts(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    from modeling.evaluator import evaluate_forecasts
+    return {'results': evaluate_forecasts(ctx['decomposed'], ctx['forecasts'])}
+
+def _generate_insights(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    from modeling.insights_generator import generate_insights
+    generate_insights(ctx['decomposed'], ctx['forecasts'], ctx['results'])
+    return {}
+
+STAGE_FUNCS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    'clean_data': _clean_data,
+    'add_features': _add_features,
+    'prepare_time_series': _prepare_time_series,
+    'decompose_trend': _decompose_trend,
+    'prophet_forecast': _prophet_forecast,
+    'train_arima': _train_arima,
+    'evaluate_forecasts': _evaluate_forecasts,
+    'generate_insights': _generate_insights
+}
+
+# 측정 --------------------------------------------------------------------
+def _measure_memory(func: Callable[[Dict[str, Any]], Dict[str, Any]], ctx: Dict[str, Any], conn: Any) -> None:
+    """메모리 측정 (fork된 새 프로세스에서 실행, 결과는 파이프로 전달)"""
+    try:
+        start_rss = peak_rss_mb()
+        tracemalloc.start()
+        func(ctx)
+        peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+        rss, workers = peak_rss_mb(), peak_rss_mb(children=True)
+        conn.send({
+            'peak_mb': round(peak_mb, 2),
+            'rss_mb': round(rss - start_rss, 1) if rss is not None else None,
+            'workers_rss_mb': round(max(workers - start_rss, 0.0), 1) if workers else None
+        })
+    except BaseException as e:
+        conn.send({'error': f'{type(e).__name__}: {e}'})
+    finally:
+        conn.close()
+
+def measure(func: Callable[[Dict[str, Any]], Dict[str, Any]], ctx: Dict[str, Any], repeat: int, memory: bool) -> Dict[str, Any]:
+    """
+    단계 1개 측정
+    Returns:
+        {'median_s', 'min_s', 'peak_mb', 'rss_mb', 'workers_rss_mb'} 및 마지막 실행 산출물('outputs')
+        fork를 지원하지 않는 플랫폼에서는 현재 프로세스에서 측정 (rss_mb·workers_rss_mb 없음, peak_mb는 워커 제외)
+    """
+    timings = []
+    outputs = {}
+    for _ in range(repeat):
+        started = time.perf_counter()
+        outputs = func(ctx)
+        timings.append(time.perf_counter() - started)
+
+    usage = {'peak_mb': None, 'rss_mb': None, 'workers_rss_mb': None}
+    if memory and 'fork' in multiprocessing.get_all_start_methods():
+        fork = multiprocessing.get_context('fork')
+        receiver, sender = fork.Pipe(duplex=False)
+        process = fork.Process(target=_measure_memory, args=(func, ctx, sender))
+        process.start()
+        sender.close()
+        result = receiver.recv()
+        process.join()
+        if 'error' in result:
+            raise RuntimeError(f"메모리 측정 실패: {result['error']}")
+        usage.update(result)
+    elif memory:
+        tracemalloc.start()
+        try:
+            func(ctx)
+            usage['peak_mb'] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+        finally:
+            tracemalloc.stop()
+    return {
+        'median_s': round(statistics.median(timings), 4),
+        'min_s': round(min(timings), 4),
+        **usage,
+        'outputs': outputs
+    }
+
+def benchmark_cell(
+    n_groups: int,
+    n_periods: int,
+    stages: List[str],
+    freq: str = 'W',
+    repeat: int = 3,
+    fit_sample: int = 5,
+    memory: bool = True,
+    seed: int = 0
+) -> Dict[str, Dict[str, Any]]:
+    """격자 1칸 (그룹 수 × 기간 수) 단계별 측정 - 선택되지 않은 선행 단계는 측정 없이 실행"""
+    ctx = {'raw': generate_ratio_data(n_groups, n_periods, freq, seed=seed), 'fit_sample': fit_sample}
+    last = max(STAGES.index(stage) for stage in stages)
+    results = {}
+    for stage in STAGES[:last + 1]:
+        if stage in ('evaluate_forecasts', 'generate_insights') and 'forecasts' not in ctx:
+            ctx['forecasts'] = synthetic_forecasts(ctx['decomposed'], HORIZON, seed)
+        if stage not in stages:
+            if stage not in FIT_STAGES:
+                ctx.update(STAGE_FUNCS[stage](ctx))
+            continue
+        result = measure(STAGE_FUNCS[stage], ctx, 1 if stage in FIT_STAGES else repeat, memory)
+        outputs = result.pop('outputs')
+        if stage in FIT_STAGES:
+            # 그룹당 시간 → 전체 그룹 환산
+            fitted = max(outputs.get('fitted_groups', 0), 1)
+            result['per_group_s'] = round(result['median_s'] / fitted, 4)
+            result['projected_s'] = round(result['per_group_s'] * len(ctx['decomposed']), 2)
+        else:
+            ctx.update(outputs)
+        results[stage] = result
+    return results
+
+def run_grid(
+    groups: List[int],
+    periods: List[int],
+    stages: List[str],
+    **options: Any
+) -> Dict[str, Dict[str, Any]]:
+    """
+    격자 전체 측정 (리포트 출력은 임시 디렉터리에서 실행)
+    Returns:
+        {'{단계}@{그룹 수}x{기간 수}': 측정 결과}
+    """
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='pipeline_bench_') as workdir:
+        os.chdir(workdir)
+        try:
+            for n_groups in groups:
+                for n_periods in periods:
+                    cell = benchmark_cell(n_groups, n_periods, stages, **options)
+                    for stage, result in cell.items():
+                        results[f'{stage}@{n_groups}x{n_periods}'] = {
+                            'stage': stage, 'groups': n_groups, 'periods': n_periods, **result
+                        }
+                        print(_format_row(results[f'{stage}@{n_groups}x{n_periods}']), flush=True)
+        finally:
+            os.chdir(cwd)
+    return results
+
+def _format_mb(value: Optional[float]) -> str:
+    return f"{value:9.1f}MB" if value is not None else ' ' * 11
+
+def _format_row(result: Dict[str, Any]) -> str:
+    memory = ' '.join(_format_mb(result.get(key)) for key in MEMORY_KEYS)
+    line = f"{result['stage']:<20} {result['groups']:>6} x {result['periods']:<5} {result['median_s']:9.3f}s {memory}"
+    if 'projected_s' in result:
+        line += f"  (그룹당 {result['per_group_s']:.3f}s → 전체 {result['projected_s']:.1f}s)"
+    return line
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float,
+    min_seconds: float = 0.01,
+    min_mb: float = 1.0
+) -> List[str]:
+    """기준값 대비 회귀 목록 (시간·메모리가 tolerance 비율 이상 증가, min_seconds·min_mb 미만 값은 비교 제외)"""
+    regressions = []
+    for key, result in results.items():
+        before = baseline.get(key)
+        if before is None:
+            continue
+        time_key = 'per_group_s' if 'per_group_s' in result else 'median_s'
+        old, new = before.get(time_key), result[time_key]
+        if old and max(old, new) >= min_seconds and new > old * (1 + tolerance):
+            regressions.append(f"{key} 시간: {old:.3f}s → {new:.3f}s (+{(new / old - 1) * 100:.0f}%)")
+        for memory_key in MEMORY_KEYS:
+            old, new = before.get(memory_key), result.get(memory_key)
+            if old and new and max(old, new) >= min_mb and new > old * (1 + tolerance):
+                regressions.append(f"{key} {memory_key}: {old:.1f}MB → {new:.1f}MB (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='파이프라인 단계별 시간·메모리 벤치마크')
+    parser.add_argument('--groups', type=int, nargs='+', default=[10, 100, 1000], help='그룹 수 격자')
+    parser.add_argument('--periods', type=int, nargs='+', default=[156], help='그룹별 기간 수 격자')
+    parser.add_argument('--freq', default='W', choices=('W', 'D'), help='합성 데이터 주기')
+    parser.add_argument('--stages', nargs='+', default=list(STAGES), choices=STAGES, help='측정할 단계')
+    parser.add_argument('--repeat', type=int, default=3, help='단계별 반복 횟수 (중앙값 사용, 학습 단계는 1회)')
+    parser.add_argument('--fit-sample', type=int, default=5, help='학습 단계 측정 그룹 수')
+    parser.add_argument('--no-memory', action='store_true', help='메모리 측정(별도 프로세스 실행) 생략')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', help='결과 JSON 저장 경로 (기준값 갱신)')
+    parser.add_argument('--baseline', help='비교할 기준값 JSON')
+    parser.add_argument('--tolerance', type=float, default=0.3, help='허용 증가 비율')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    print(f"{'stage':<20} {'groups':>6} x {'len':<5} {'median':>10} {'heap':>11} {'rss':>11} {'workers':>11}")
+    results = run_grid(
+        args.groups, args.periods, args.stages, freq=args.freq, repeat=args.repeat,
+        fit_sample=args.fit_sample, memory=not args.no_memory, seed=args.seed
+    )
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.save}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            failures = compare(results, json.load(f), args.tolerance)
+        if failures:
+            print("\n성능 회귀:")
+            for failure in failures:
+                print(f"  {failure}")
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,124 @@
+# benchmarks/startup_time.py
+"""
+파이프라인 진입점 임포트 시간 측정 (python -X importtime)
+
+사용 예:
+    python benchmarks/startup_time.py
+    python benchmarks/startup_time.py --repeat 5 --top 15
+    python benchmarks/startup_time.py --save benchmarks/startup_baseline.json
+    python benchmarks/startup_time.py --baseline benchmarks/startup_baseline.json --tolerance 0.3
+"""
+import os
+import re
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_POINTS = ['connector.connect', 'modeling.run_phase2']
+IMPORTTIME_PATTERN = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)")
+
+def measure_import(module: str) -> Tuple[float, List[Tuple[str, float, float]]]:
+    """
+    새 인터프리터에서 모듈 임포트 1회 측정
+    Returns:
+        (전체 누적 시간(ms), [(모듈명, 자체 시간(ms), 누적 시간(ms))])
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{module} 임포트 실패:\n{proc.stderr[-2000:]}")
+
+    entries = []
+    total = 0.0
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, name = match.groups()
+        entries.append((name, int(self_us) / 1000, int(cumulative_us) / 1000))
+        if name == module:
+            total = int(cumulative_us) / 1000
+    return total, entries
+
+def benchmark(modules: List[str], repeat: int, top: int) -> Dict[str, Dict]:
+    """모듈별 반복 측정 (중앙값) 및 누적 시간 상위 임포트"""
+    results = {}
+    for module in modules:
+        totals, last_entries = [], []
+        for _ in range(repeat):
+            total, last_entries = measure_import(module)
+            totals.append(total)
+        # 누적 시간 상위 임포트 (마지막 측정 기준)
+        heaviest = sorted(
+            (entry for entry in last_entries if entry[0] != module),
+            key=lambda entry: entry[2], reverse=True
+        )[:top]
+        results[module] = {
+            'median_ms': round(statistics.median(totals), 1),
+            'min_ms': round(min(totals), 1),
+            'max_ms': round(max(totals), 1),
+            'heaviest': [
+                {'module': name, 'self_ms': round(self_ms, 1), 'cumulative_ms': round(cum_ms, 1)}
+                for name, self_ms, cum_ms in heaviest
+            ]
+        }
+    return results
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """기준값 대비 회귀 목록 (median이 tolerance 비율 이상 증가)"""
+    regressions = []
+    for module, result in results.items():
+        if module not in baseline:
+            continue
+        before, after = baseline[module]['median_ms'], result['median_ms']
+        if after > before * (1 + tolerance):
+            regressions.append(f"{module}: {before:.1f}ms → {after:.1f}ms (+{(after / before - 1) * 100:.0f}%)")
+    return regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='파이프라인 진입점 임포트 시간 측정')
+    parser.add_argument('modules', nargs='*', default=ENTRY_POINTS, help='측정할 모듈 (기본: 진입점)')
+    parser.add_argument('--repeat', type=int, default=3, help='모듈별 반복 횟수 (중앙값 사용)')
+    parser.add_argument('--top', type=int, default=10, help='누적 시간 상위 임포트 표시 개수')
+    parser.add_argument('--save', help='결과 JSON 저장 경로 (기준값 갱신)')
+    parser.add_argument('--baseline', help='비교할 기준값 JSON')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='허용 증가 비율')
+    parser.add_argument('--max-ms', type=float, help='모듈별 절대 상한(ms)')
+    args = parser.parse_args()
+
+    results = benchmark(args.modules, args.repeat, args.top)
+    for module, result in results.items():
+        print(f"\n{module}: median {result['median_ms']:.1f}ms (min {result['min_ms']:.1f}, max {result['max_ms']:.1f})")
+        for item in result['heaviest']:
+            print(f"  {item['cumulative_ms']:8.1f}ms  {item['module']}")
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.save}")
+
+    failures = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            failures += compare(results, json.load(f), args.tolerance)
+    if args.max_ms is not None:
+        failures += [
+            f"{module}: {result['median_ms']:.1f}ms > 상한 {args.max_ms:.1f}ms"
+            for module, result in results.items() if result['median_ms'] > args.max_ms
+        ]
+    if failures:
+        print("\n임포트 시간 회귀:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+# benchmarks/synthetic.py
+"""
+벤치마크용 합성 검색 비율 데이터 생성 (시드 고정, DataLab 형식)
+- 구간별 선형 추세(변화점) + 연간 계절성(Fourier) + 요일 패턴(일간) + 잡음
+- 급등(spike), 누락 기간(gap), 변동 없는 그룹 포함
+- 요청 단위(최대 5개 그룹)로 최대값 100 정규화
+
+사용 예:
+    python benchmarks/synthetic.py --groups 1000 --periods 156 --output /tmp/synthetic.csv
+"""
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+from typing import Dict
+
+FREQUENCIES = {'W': 'W-SUN', 'D': 'D'}
+DATALAB_MAX_GROUPS = 5  # DataLab 요청당 그룹 수 (정규화 단위)
+
+def generate_ratio_data(
+    n_groups: int,
+    n_periods: int,
+    freq: str = 'W',
+    start: str = '2022-04-03',
+    seed: int = 0,
+    n_changepoints: int = 3,
+    spike_rate: float = 0.01,
+    gap_rate: float = 0.02,
+    flat_rate: float = 0.01
+) -> pd.DataFrame:
+    """
+    합성 검색 비율 데이터
+    Args:
+        n_groups: 키워드 그룹 수
+        n_periods: 그룹별 기간 수 (freq 단위)
+        freq: 'W'(주간) / 'D'(일간)
+        spike_rate: 기간별 급등 확률
+        gap_rate: 기간별 누락 확률
+        flat_rate: 변동 없는 그룹 비율 (전처리 변동성 필터 대상)
+    Returns:
+        (date, group_name, ratio) - 같은 인자면 항상 같은 결과
+    """
+    if freq not in FREQUENCIES:
+        raise ValueError(f"지원하지 않는 주기: {freq}")
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start, periods=n_periods, freq=FREQUENCIES[freq])
+    weeks = ((dates - dates[0]).days.values / 7.0)[None, :]
+
+    # 1. 구간별 선형 추세 (변화점마다 기울기 변경)
+    level = rng.uniform(5, 60, (n_groups, 1))
+    slope = rng.normal(0, 0.05, (n_groups, 1)) * level / 10
+    changepoints = np.sort(rng.uniform(0, weeks.max(), (n_groups, n_changepoints)), axis=1)
+    deltas = rng.normal(0, 0.08, (n_groups, n_changepoints)) * level / 10
+    trend = level + slope * weeks
+    for k in range(n_changepoints):
+        trend += deltas[:, [k]] * np.maximum(0, weeks - changepoints[:, [k]])
+
+    # 2. 연간 계절성 (Fourier 2차) + 요일 패턴
+    seasonal = np.zeros_like(trend)
+    for order in (1, 2):
+        amplitude = rng.normal(0, 0.15 / order, (n_groups, 1)) * level
+        phase = rng.uniform(0, 2 * np.pi, (n_groups, 1))
+        seasonal += amplitude * np.sin(2 * np.pi * order * weeks / 52.18 + phase)
+    if freq == 'D':
+        weekday = rng.normal(0, 0.05, (n_groups, 7)) * level
+        seasonal += weekday[:, dates.dayofweek.values]
+
+    # 3. 잡음·급등
+    values = (trend + seasonal) * (1 + rng.normal(0, 0.05, trend.shape))
+    spikes = rng.random(values.shape) < spike_rate
+    values = np.where(spikes, values * rng.uniform(1.5, 4.0, values.shape), values)
+    values = np.clip(values, 0, None)
+    flat = rng.random(n_groups) < flat_rate
+    values[flat] = level[flat]
+
+    # 4. 요청 단위 최대값 100 정규화
+    for start_idx in range(0, n_groups, DATALAB_MAX_GROUPS):
+        block = values[start_idx:start_idx + DATALAB_MAX_GROUPS]
+        peak = block.max()
+        if peak > 0:
+            values[start_idx:start_idx + DATALAB_MAX_GROUPS] = block / peak * 100
+    values = np.round(values, 5)
+
+    # 5. 긴 형식 변환 + 누락 기간
+    names = np.array([f'Synthetic{i:05d}' for i in range(n_groups)])
+    df = pd.DataFrame({
+        'date': np.tile(dates.strftime('%Y-%m-%d').values, n_groups),
+        'group_name': np.repeat(names, n_periods),
+        'ratio': values.ravel()
+    })
+    keep = rng.random(len(df)) >= gap_rate
+    return df[keep].reset_index(drop=True)
+
+def synthetic_forecasts(decomposed: Dict[str, Dict], horizon: int = 26, seed: int = 0) -> Dict[str, Dict]:
+    """평가·리포트 단계 입력용 예측 (모델 학습 대신 최근 추세 + 잡음)"""
+    rng = np.random.default_rng(seed)
+    forecasts = {}
+    for group, data in decomposed.items():
+        trend = np.asarray(data['trend'][-horizon:], dtype=float)
+        yhat = trend * (1 + rng.normal(0, 0.05, len(trend)))
+        forecasts[group] = {
+            'prophet': {'yhat': yhat},
+            'ensemble': pd.Series(0.5 * yhat + 0.5 * trend * (1 + rng.normal(0, 0.05, len(trend))))
+        }
+    return forecasts
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='합성 검색 비율 데이터 생성')
+    parser.add_argument('--groups', type=int, default=100, help='그룹 수')
+    parser.add_argument('--periods', type=int, default=156, help='그룹별 기간 수')
+    parser.add_argument('--freq', default='W', choices=tuple(FREQUENCIES), help='주기')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', required=True, help='CSV 저장 경로')
+    args = parser.parse_args()
+
+    df = generate_ratio_data(args.groups, args.periods, args.freq, seed=args.seed)
+    df.to_csv(args.output, index=False)
+    print(f"{len(df)}행 저장: {args.output}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,74 @@
+# modeling/arima_estimator.py
+from sklearn.base import BaseEstimator
+import pandas as pd
+import numpy as np
+import joblib
+from typing import Optional, Tuple
+
+class ARIMAModel(BaseEstimator):
+    def __init__(self, 
+                 seasonal: bool = True,
+                 max_p: int = 3,
+                 max_q: int = 3,
+                 max_d: int = 1,
+                 m: int = None,
+                 stepwise: bool = True):
+        self.seasonal = seasonal
+        self.max_p = max_p
+        self.max_q = max_q
+        self.max_d = max_d
+        self.m = m
+        self.stepwise = stepwise
+        self.model = None
+        
+    def _detect_seasonality(self, series: pd.Series) -> int:
+        """FFT 기반 계절성 주기 감지"""
+        from scipy.fftpack import fft
+        fft_vals = np.abs(fft(series))
+        non_zero = fft_vals[:len(series)//2] > 0
+        if non_zero.any():
+            dominant_freq = np.argmax(fft_vals[:len(series)//2])
+            return max(1, len(series) // dominant_freq)
+        return 1
+
+    def fit(self, X: pd.Series, exog=None):
+        if self.m is None:
+            self.m = self._detect_seasonality(X)
+            
+        from pmdarima import auto_arima
+        self.model = auto_arima(
+            X,
+            seasonal=self.seasonal,
+            max_p=self.max_p,
+            max_q=self.max_q,
+            max_d=self.max_d,
+            m=self.m,
+            stepwise=self.stepwise,
+            suppress_warnings=True,
+            error_action='ignore',
+            X=exog
+        )
+        return self
+
+    def predict(self, n_periods: int, exog=None) -> Tuple[pd.Series, np.ndarray]:
+        if self.model is None:
+            raise ValueError("모델이 학습되지 않았습니다.")
+        pred, conf_int = self.model.predict(
+            n_periods=n_periods,
+            X=exog,
+            return_conf_int=True
+        )
+        return pd.Series(pred, name='forecast'), conf_int
+    
+    def save(self, path: str):
+        """모델 저장 전 검증"""
+        if self.model is None:
+            raise ValueError("저장할 모델이 없습니다.")
+        joblib.dump(self.model, path)
+        
+    @classmethod
+    def load(cls, path: str, mmap_mode: Optional[str] = None):
+        loaded = joblib.load(path, mmap_mode=mmap_mode)
+        model = cls()
+        model.model = loaded
+        return model
@@ -1,83 +1,31 @@
 # modeling/arima_model.py
-from pmdarima import auto_arima
-from sklearn.base import BaseEstimator
 import pandas as pd
 import numpy as np
 import warnings
-import joblib
+import json
+import os
 import logging
-from typing import Tuple, Dict, Any
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Tuple, Dict, Any, List, Optional
 from modeling.evaluator import calculate_mape, calculate_rmse, calculate_r2
+from modeling.scheduler import default_workers
+from modeling.cache_utils import fingerprint
+from modeling.model_registry import ModelRegistry
+logger = logging.getLogger(__name__)
 
 logging.basicConfig(level=logging.INFO)
 warnings.filterwarnings("ignore", category=UserWarning)
 
-class ARIMAModel(BaseEstimator):
-    def __init__(self, 
-                 seasonal: bool = True,
-                 max_p: int = 3,
-                 max_q: int = 3,
-                 max_d: int = 1,
-                 m: int = None,
-                 stepwise: bool = True):
-        self.seasonal = seasonal
-        self.max_p = max_p
-        self.max_q = max_q
-        self.max_d = max_d
-        self.m = m
-        self.stepwise = stepwise
-        self.model = None
-        
-    def _detect_seasonality(self, series: pd.Series) -> int:
-        """FFT 기반 계절성 주기 감지"""
-        from scipy.fftpack import fft
-        fft_vals = np.abs(fft(series))
-        non_zero = fft_vals[:len(series)//2] > 0
-        if non_zero.any():
-            dominant_freq = np.argmax(fft_vals[:len(series)//2])
-            return max(1, len(series) // dominant_freq)
-        return 1
-
-    def fit(self, X: pd.Series, exog=None):
-        if self.m is None:
-            self.m = self._detect_seasonality(X)
-            
-        self.model = auto_arima(
-            X,
-            seasonal=self.seasonal,
-            max_p=self.max_p,
-            max_q=self.max_q,
-            max_d=self.max_d,
-            m=self.m,
-            stepwise=self.stepwise,
-            suppress_warnings=True,
-            error_action='ignore',
-            exogenous=exog
-        )
-        return self
+if TYPE_CHECKING:
+    from pmdarima.arima import ARIMA
 
-    def predict(self, n_periods: int, exog=None) -> Tuple[pd.Series, np.ndarray]:
-        if self.model is None:
-            raise ValueError("모델이 학습되지 않았습니다.")
-        pred, conf_int = self.model.predict(
-            n_periods=n_periods,
-            exogenous=exog,
-            return_conf_int=True
-        )
-        return pd.Series(pred, name='forecast'), conf_int
-    
-    def save(self, path: str):
-        """모델 저장 전 검증"""
-        if self.model is None:
-            raise ValueError("저장할 모델이 없습니다.")
-        joblib.dump(self.model, path)
-        
-    @classmethod
-    def load(cls, path: str):
-        loaded = joblib.load(path)
-        model = cls()
-        model.model = loaded
-        return model
+def __getattr__(name: str):
+    """ARIMAModel(sklearn 추정기) 지연 임포트 (기존 pickle 경로 호환)"""
+    if name == 'ARIMAModel':
+        from modeling.arima_estimator import ARIMAModel
+        return ARIMAModel
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # 외부 유틸리티 함수 -------------------------------------------------
 def prepare_exogenous_features(df: pd.DataFrame) -> pd.DataFrame:
@@ -98,15 +46,287 @@ def ensemble_forecast(
         + arima_pred * weights[1]
     ).rename('ensemble_forecast')
 
-def train_arima(series: pd.Series, n_periods: int = 26) -> tuple:
-    """모델 객체와 예측값 반환"""
-    model = auto_arima(
-        series,
-        seasonal=True,
-        m=52,
-        stepwise=True,
-        suppress_warnings=True
+# Fourier 계절성 ARIMA ---------------------------------------------
+YEARLY_PERIOD = 365.25 / 7  # 주간 데이터 연간 주기
+
+def fourier_terms(n: int, period: float = YEARLY_PERIOD, K: int = 1, offset: int = 0) -> Optional[np.ndarray]:
+    """Fourier 외생변수 (sin/cos K쌍), K=0이면 None"""
+    if K == 0:
+        return None
+    t = np.arange(offset, offset + n)[:, None]
+    k = np.arange(1, K + 1)[None, :]
+    angle = 2 * np.pi * k * t / period
+    return np.hstack([np.sin(angle), np.cos(angle)])
+
+class FourierARIMA:
+    """Fourier 항 외생변수 기반 비계절 ARIMA (pmdarima 모델 인터페이스 호환)"""
+
+    def __init__(self, model: 'ARIMA', K: int, period: float, n_obs: int):
+        self.model = model
+        self.K = K
+        self.period = period
+        self.n_obs = n_obs
+
+    @property
+    def order(self) -> tuple:
+        return self.model.order
+
+    @property
+    def seasonal_order(self) -> tuple:
+        return self.model.seasonal_order
+
+    def aic(self) -> float:
+        return self.model.aic()
+
+    def predict(self, n_periods: int = 10, return_conf_int: bool = False, alpha: float = 0.05):
+        X = fourier_terms(n_periods, self.period, self.K, offset=self.n_obs)
+        return self.model.predict(n_periods=n_periods, X=X, return_conf_int=return_conf_int, alpha=alpha)
+
+    def predict_in_sample(self):
+        X = fourier_terms(self.n_obs, self.period, self.K)
+        return self.model.predict_in_sample(X=X)
+
+    def update(self, y, maxiter: Optional[int] = None):
+        """신규 관측치 반영 (차수 유지, 현재 계수에서 시작해 maxiter회 최적화로 계수도 재추정)"""
+        X = fourier_terms(len(y), self.period, self.K, offset=self.n_obs)
+        self.model.update(y, X=X, maxiter=maxiter)
+        self.n_obs += len(y)
+        return self
+
+def _fit_fourier_candidate(args: Tuple[np.ndarray, tuple, int, float]) -> Tuple[float, tuple, int]:
+    """후보 (order, K) 적합 후 AIC 반환 (프로세스 풀 워커)"""
+    from pmdarima.arima import ARIMA
+    values, order, K, period = args
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            model = ARIMA(order=order, suppress_warnings=True, with_intercept=order[1] < 2)
+            model.fit(values, X=fourier_terms(len(values), period, K))
+        return model.aic(), order, K
+    except Exception:
+        return np.inf, order, K
+
+def search_fourier_arima(
+    series: pd.Series,
+    max_p: int = 3,
+    max_q: int = 3,
+    max_K: int = 6,
+    period: float = YEARLY_PERIOD,
+    d: Optional[int] = None,
+    patience: int = 1,
+    max_workers: Optional[int] = None
+) -> FourierARIMA:
+    """
+    Fourier 항 수(K)와 비계절 차수 탐색
+    K별 후보 차수를 병렬 적합하고, AIC 개선이 patience회 연속 없으면 조기 종료
+    """
+    from pmdarima.arima import ARIMA, ndiffs
+    values = np.asarray(series, dtype=float)
+    if d is None:
+        d = ndiffs(values, test='kpss', max_d=1)
+    orders = [(p, d, q) for p in range(max_p + 1) for q in range(max_q + 1)]
+    max_K = min(max_K, int(period // 2))
+    
+    best = (np.inf, None, 0)
+    stall = 0
+    workers = max_workers or default_workers()
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for K in range(max_K + 1):
+            wave = [(values, order, K, period) for order in orders]
+            if executor is not None:
+                scores = list(executor.map(_fit_fourier_candidate, wave))
+            else:
+                scores = [_fit_fourier_candidate(args) for args in wave]
+            
+            wave_best = min(scores, key=lambda score: score[0])
+            if wave_best[0] < best[0]:
+                best, stall = wave_best, 0
+            else:
+                stall += 1
+                if stall >= patience:
+                    break
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    
+    aic, order, K = best
+    if order is None:
+        raise ValueError("적합 가능한 ARIMA 후보가 없습니다.")
+    logger.info(f"Fourier ARIMA 선택: order={order}, K={K}, AIC={aic:.2f}")
+    
+    # 선택 후보 재적합 (원본 시리즈 유지)
+    model = ARIMA(order=order, suppress_warnings=True, with_intercept=order[1] < 2)
+    model.fit(series, X=fourier_terms(len(values), period, K))
+    return FourierARIMA(model, K, period, len(values))
+
+def train_arima(
+    series: pd.Series,
+    n_periods: int = 26,
+    method: str = 'sarima',
+    **search_kwargs
+) -> tuple:
+    """
+    모델 객체와 예측값 반환
+    method: 'sarima'(auto_arima, m=52 계절 ARIMA) / 'fourier'(Fourier 항 + 비계절 ARIMA)
+    """
+    from pmdarima import auto_arima
+    if method == 'fourier':
+        model = search_fourier_arima(series, **search_kwargs)
+    elif method == 'sarima':
+        model = auto_arima(
+            series,
+            seasonal=True,
+            m=52,
+            stepwise=True,
+            suppress_warnings=True
+        )
+    else:
+        raise ValueError(f"지원하지 않는 ARIMA 방식: {method}")
+    forecast = model.predict(n_periods=n_periods)
+    return model, forecast
+
+# 차수 캐시 기반 재학습 -------------------------------------------------
+def _order_cache_path(style: str, model_dir: str) -> str:
+    return os.path.join(model_dir, f"{style}_arima_order.json")
+
+def model_order(model) -> Dict[str, Any]:
+    """학습된 모델의 차수 정보 (_refit_known_order 입력 형식)"""
+    return {
+        'method': 'fourier' if isinstance(model, FourierARIMA) else 'sarima',
+        'order': list(model.order),
+        'seasonal_order': list(model.seasonal_order),
+        'fourier_k': getattr(model, 'K', 0),
+        'period': getattr(model, 'period', None)
+    }
+
+def load_order_cache(style: str, model_dir: str = 'modeling/models') -> Optional[Dict[str, Any]]:
+    """저장된 ARIMA 차수 정보 로드"""
+    path = _order_cache_path(style, model_dir)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_order_cache(style: str, meta: Dict[str, Any], model_dir: str = 'modeling/models') -> None:
+    """ARIMA 차수 정보 저장 (모델 pkl과 같은 경로)"""
+    os.makedirs(model_dir, exist_ok=True)
+    with open(_order_cache_path(style, model_dir), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+def _insample_rmse(model, series: pd.Series) -> float:
+    """학습 구간 RMSE (차분 초기 구간 제외)"""
+    fitted = np.asarray(model.predict_in_sample(), dtype=float)
+    actual = np.asarray(series, dtype=float)
+    skip = model.order[1] + 1
+    return float(np.sqrt(np.mean((actual[skip:] - fitted[skip:]) ** 2)))
+
+def _refit_known_order(series: pd.Series, meta: Dict[str, Any]):
+    """저장된 차수로 계수만 재추정"""
+    from pmdarima.arima import ARIMA
+    order = tuple(meta['order'])
+    model = ARIMA(
+        order=order,
+        seasonal_order=tuple(meta['seasonal_order']),
+        suppress_warnings=True,
+        with_intercept=order[1] < 2
+    )
+    if meta['method'] == 'fourier':
+        model.fit(series, X=fourier_terms(len(series), meta['period'], meta['fourier_k']))
+        return FourierARIMA(model, meta['fourier_k'], meta['period'], len(series))
+    return model.fit(series)
+
+def _load_previous_model(style: str, series: pd.Series, meta: Dict[str, Any], model_dir: str):
+    """이전 실행 학습 구간 모델 로드 (학습 데이터가 현재 시리즈의 앞부분과 동일한 경우만)"""
+    registry = ModelRegistry(model_dir)
+    n_obs = meta.get('n_obs', 0)
+    if (style, 'arima_holdout') not in registry or n_obs > len(series):
+        return None
+    if registry.entry(style, 'arima_holdout')['meta'].get('n_obs') != n_obs:
+        return None
+    if fingerprint(np.asarray(series[:n_obs], dtype=float)) != meta.get('data_fingerprint'):
+        return None
+    try:
+        model = registry.load(style, 'arima_holdout')
+    except Exception as e:
+        logger.warning(f"[{style}] 이전 ARIMA 모델 로드 실패: {str(e)}")
+        return None
+    # 차수 캐시와 방법·차수가 다른 모델(설정 변경 전 등록분)은 재사용하지 않음
+    if (
+        isinstance(model, FourierARIMA) != (meta.get('method') == 'fourier')
+        or list(model.order) != list(meta['order'])
+        or list(model.seasonal_order) != list(meta['seasonal_order'])
+        or getattr(model, 'K', 0) != meta.get('fourier_k', 0)
+    ):
+        return None
+    return model
+
+def train_arima_cached(
+    style: str,
+    series: pd.Series,
+    n_periods: int = 26,
+    method: str = 'sarima',
+    model_dir: str = 'modeling/models',
+    search_every_days: int = 28,
+    degrade_tolerance: float = 1.2,
+    force_search: bool = False,
+    **search_kwargs
+) -> tuple:
+    """
+    차수 캐시 기반 ARIMA 학습
+    - 저장된 차수가 있으면 이전 모델을 update()로 갱신(이전 계수에서 시작하는 짧은 재추정)하거나 같은 차수로 처음부터 재추정
+    - 전체 차수 탐색은 search_every_days 주기 경과 또는 학습 오차 악화(degrade_tolerance배 초과) 시에만 실행
+    """
+    meta = load_order_cache(style, model_dir)
+    now = datetime.now()
+    model, mode = None, 'search'
+    
+    # 1. 캐시 유효성 확인
+    cache_valid = (
+        not force_search
+        and meta is not None
+        and meta.get('method') == method
+        and (now - datetime.fromisoformat(meta['searched_at'])).days < search_every_days
     )
+    
+    # 2. 이전 모델 갱신 또는 계수 재추정
+    if cache_valid:
+        try:
+            model = _load_previous_model(style, series, meta, model_dir)
+            if model is not None:
+                new_obs = series[meta['n_obs']:]
+                if len(new_obs) > 0:
+                    model.update(new_obs)
+                mode = 'update'
+            else:
+                model = _refit_known_order(series, meta)
+                mode = 'refit'
+            
+            # 학습 오차 악화 시 전체 탐색
+            rmse = _insample_rmse(model, series)
+            if rmse > meta['insample_rmse'] * degrade_tolerance:
+                logger.info(f"[{style}] 학습 오차 악화 ({meta['insample_rmse']:.3f} → {rmse:.3f}), 차수 재탐색")
+                model, mode = None, 'search'
+        except Exception as e:
+            logger.warning(f"[{style}] 캐시 차수 재학습 실패: {str(e)}")
+            model, mode = None, 'search'
+    
+    # 3. 전체 차수 탐색
+    if model is None:
+        model, _ = train_arima(series, n_periods=1, method=method, **search_kwargs)
+    logger.info(f"[{style}] ARIMA {mode}: order={model.order}, seasonal_order={model.seasonal_order}")
+    
+    # 4. 차수 정보 저장
+    save_order_cache(style, {
+        **model_order(model),
+        'method': method,
+        'n_obs': len(series),
+        'data_fingerprint': fingerprint(np.asarray(series, dtype=float)),
+        'insample_rmse': _insample_rmse(model, series),
+        'searched_at': now.isoformat() if mode == 'search' else meta['searched_at'],
+        'updated_at': now.isoformat()
+    }, model_dir)
+    
     forecast = model.predict(n_periods=n_periods)
     return model, forecast
 
@@ -0,0 +1,338 @@
+# modeling/backtest.py
+import numpy as np
+import pandas as pd
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import logging
+from modeling.scheduler import TaskTimeout, run_longest_first, time_budget
+from modeling.cache_utils import DiskCache, fingerprint
+from modeling.evaluator import compute_metrics
+logger = logging.getLogger(__name__)
+
+BACKTEST_CACHE_VERSION = 1  # fold 계산 방식 변경 시 증가
+
+# 예측 모델 등록부 ------------------------------------------------------
+# 예측 함수 시그니처: (학습 DataFrame(ds, y), 예측 날짜, 파라미터) -> {'yhat', ['yhat_lower', 'yhat_upper']}
+FORECASTERS: Dict[str, Callable[..., Dict[str, np.ndarray]]] = {}
+
+def register_forecaster(name: str):
+    """백테스트 대상 예측 함수 등록 데코레이터 (모듈 최상위 함수만 프로세스 풀에서 사용 가능)"""
+    def decorator(func):
+        FORECASTERS[name] = func
+        return func
+    return decorator
+
+def get_forecaster(name: str) -> Callable[..., Dict[str, np.ndarray]]:
+    if name not in FORECASTERS:
+        raise KeyError(f"등록되지 않은 예측 모델: {name} (등록: {sorted(FORECASTERS)})")
+    return FORECASTERS[name]
+
+@register_forecaster('naive')
+def naive_forecaster(history: pd.DataFrame, future: pd.DatetimeIndex, params: Optional[Dict[str, Any]] = None) -> Dict[str, np.ndarray]:
+    """마지막 관측값 유지"""
+    return {'yhat': np.full(len(future), float(history['y'].iloc[-1]))}
+
+@register_forecaster('seasonal_naive')
+def seasonal_naive_forecaster(history: pd.DataFrame, future: pd.DatetimeIndex, params: Optional[Dict[str, Any]] = None) -> Dict[str, np.ndarray]:
+    """한 주기 전 값 반복 (params['season'], 기본 52)"""
+    season = (params or {}).get('season', 52)
+    values = history['y'].to_numpy(dtype=float)
+    if len(values) < season:
+        raise ValueError(f"계절 주기({season})보다 학습 데이터가 짧습니다.")
+    last_season = values[-season:]
+    return {'yhat': np.resize(last_season, len(future))}
+
+@register_forecaster('prophet')
+def prophet_forecaster(history: pd.DataFrame, future: pd.DatetimeIndex, params: Optional[Dict[str, Any]] = None) -> Dict[str, np.ndarray]:
+    """Prophet 학습·예측 (params: Prophet 하이퍼파라미터, 기본 PROPHET_PARAMS)"""
+    from modeling.prophet_model import _build_prophet_model
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+    model = _build_prophet_model(params)
+    model.fit(history[['ds', 'y']])
+    forecast = model.predict(pd.DataFrame({'ds': future}))
+    return {
+        'yhat': forecast['yhat'].values,
+        'yhat_lower': forecast['yhat_lower'].values,
+        'yhat_upper': forecast['yhat_upper'].values
+    }
+
+@register_forecaster('arima')
+def arima_forecaster(history: pd.DataFrame, future: pd.DatetimeIndex, params: Optional[Dict[str, Any]] = None) -> Dict[str, np.ndarray]:
+    """
+    ARIMA 학습·예측
+    params에 저장된 차수('order' 등 차수 캐시 메타데이터)가 있으면 계수만 재추정,
+    없으면 train_arima 탐색 (params: method 및 탐색 인자)
+    """
+    from modeling.arima_model import _refit_known_order, train_arima
+    params = dict(params or {})
+    interval_width = params.pop('interval_width', 0.8)
+    series = history['y'].reset_index(drop=True)
+    if 'order' in params:
+        model = _refit_known_order(series, params)
+    else:
+        if params.get('method') == 'fourier':
+            params.setdefault('max_workers', 1)  # 워커 프로세스 안에서 중첩 풀 생성 방지
+        model, _ = train_arima(series, n_periods=len(future), **params)
+    yhat, conf = model.predict(n_periods=len(future), return_conf_int=True, alpha=1 - interval_width)
+    conf = np.asarray(conf, dtype=float)
+    return {
+        'yhat': np.asarray(yhat, dtype=float),
+        'yhat_lower': conf[:, 0],
+        'yhat_upper': conf[:, 1]
+    }
+
+# fold 구성 ------------------------------------------------------------
+def make_folds(
+    n_obs: int,
+    horizon: int,
+    initial: int,
+    step: int,
+    window: str = 'expanding'
+) -> List[Tuple[int, int]]:
+    """
+    학습 구간 (시작, 끝) 위치 목록 (끝 위치 다음 horizon개가 평가 구간)
+    window: 'expanding'(처음부터 누적) / 'sliding'(최근 initial개 고정 길이)
+    cutoff는 시작 시점 기준 고정 격자라 데이터 추가 시에도 기존 fold가 유지됨
+    """
+    if window not in ('expanding', 'sliding'):
+        raise ValueError(f"지원하지 않는 윈도우 방식: {window}")
+    folds = []
+    for end in range(initial, n_obs - horizon + 1, step):
+        start = 0 if window == 'expanding' else end - initial
+        folds.append((start, end))
+    return folds
+
+class FoldTimeout(TaskTimeout):
+    """fold 시간 예산 초과"""
+
+def _time_budget(seconds: Optional[float]):
+    """fold 시간 제한 (SIGALRM, Unix 메인 스레드에서만 적용)"""
+    return time_budget(seconds, FoldTimeout)
+
+def _fold_key(task: Dict[str, Any]) -> str:
+    """fold 캐시 키 (모델명, 학습 데이터, 예측 날짜, 파라미터 지문)"""
+    return fingerprint(
+        'backtest', BACKTEST_CACHE_VERSION, task['name'],
+        task['history'], task['target']['ds'], task['params']
+    )
+
+def _run_fold(task: Dict[str, Any]) -> pd.DataFrame:
+    """단일 fold 학습·예측 (프로세스 풀 워커)"""
+    with _time_budget(task['time_budget']):
+        output = task['func'](task['history'], pd.DatetimeIndex(task['target']['ds']), task['params'])
+    fold = pd.DataFrame({
+        'ds': task['target']['ds'].values,
+        'yhat': np.asarray(output['yhat'], dtype=float)
+    })
+    for col in ('yhat_lower', 'yhat_upper'):
+        if col in output:
+            fold[col] = np.asarray(output[col], dtype=float)
+    fold['y'] = task['target']['y'].values
+    fold['cutoff'] = task['cutoff']
+    return fold
+
+# 실행 ----------------------------------------------------------------
+def run_backtest(
+    frames: Dict[str, pd.DataFrame],
+    forecasters: Iterable[str] = ('prophet', 'arima'),
+    horizon: int = 26,
+    initial: int = 104,
+    step: int = 26,
+    window: str = 'expanding',
+    cutoffs: Optional[Dict[str, Iterable[pd.Timestamp]]] = None,
+    params: Optional[Dict[str, Any]] = None,
+    group_params: Optional[Dict[str, Dict[str, Any]]] = None,
+    time_budget: Optional[float] = None,
+    max_workers: Optional[int] = None,
+    cache_dir: Optional[str] = None
+) -> Dict[str, Dict[str, pd.DataFrame]]:
+    """
+    등록된 예측 모델의 rolling-origin 백테스트 (전체 모델·그룹·fold 단일 프로세스 풀)
+    Args:
+        frames: {그룹명: ds/y 컬럼 DataFrame}
+        forecasters: FORECASTERS 등록 이름
+        horizon, initial, step: 예측 길이, 첫 학습 길이, cutoff 간격 (관측 개수)
+        window: 'expanding' / 'sliding'
+        cutoffs: {그룹명: cutoff 목록} - 지정 시 격자 대신 사용 (다른 모델 fold와 정렬)
+        params: {모델명: 파라미터} 공통 설정
+        group_params: {모델명: {그룹명: 파라미터}} 그룹별 설정 (params보다 우선)
+        time_budget: fold당 시간 제한(초), 초과 fold는 제외
+        cache_dir: fold 예측 캐시 경로 (None이면 캐시 미사용)
+    Returns:
+        {모델명: {그룹명: ds/yhat/[yhat_lower/yhat_upper]/y/cutoff 컬럼 DataFrame}}
+    """
+    forecasters = list(forecasters)
+    funcs = {name: get_forecaster(name) for name in forecasters}
+    params = params or {}
+    group_params = group_params or {}
+
+    # 1. (모델, 그룹, cutoff) 작업 구성
+    tasks = {}
+    for style, df in frames.items():
+        df = df.sort_values('ds').reset_index(drop=True)
+        if cutoffs is not None:
+            points = pd.DatetimeIndex(sorted(cutoffs.get(style, [])))
+            positions = df['ds'].searchsorted(points, side='right')
+            bounds = [
+                (0 if window == 'expanding' else max(0, end - initial), end, cutoff)
+                for end, cutoff in zip(positions, points) if 0 < end < len(df)
+            ]
+        else:
+            bounds = [
+                (start, end, df['ds'].iloc[end - 1])
+                for start, end in make_folds(len(df), horizon, initial, step, window)
+            ]
+
+        for start, end, cutoff in bounds:
+            history = df.iloc[start:end][['ds', 'y']].reset_index(drop=True)
+            target = df.iloc[end:end + horizon][['ds', 'y']].reset_index(drop=True)
+            for name in forecasters:
+                tasks[name, style, cutoff] = {
+                    'name': name,
+                    'func': funcs[name],
+                    'history': history,
+                    'target': target,
+                    'cutoff': cutoff,
+                    'params': group_params.get(name, {}).get(style, params.get(name)),
+                    'time_budget': time_budget
+                }
+
+    # 2. 캐시 조회 (같거나 더 긴 예산에서 시간 초과된 fold는 재실행하지 않음)
+    cache = DiskCache(cache_dir) if cache_dir else None
+    results, pending, keys = {}, {}, {}
+    skipped = 0
+    for task_key, task in tasks.items():
+        if cache is not None:
+            keys[task_key] = _fold_key(task)
+            cached = cache.get(keys[task_key])
+            if cached is not None:
+                results[task_key] = cached
+                continue
+            timed_out = cache.get(fingerprint(keys[task_key], 'timeout'))
+            if timed_out is not None and time_budget and timed_out >= time_budget:
+                skipped += 1
+                continue
+        pending[task_key] = task
+    logger.info(
+        f"백테스트 fold: 전체 {len(tasks)}개, 캐시 {len(results)}개, "
+        f"시간 초과 생략 {skipped}개, 실행 {len(pending)}개"
+    )
+
+    # 3. 미계산 fold 실행 (학습 길이가 긴 fold 우선)
+    costs = {task_key: len(task['history']) for task_key, task in pending.items()}
+    failures = 0
+    for task_key, fold, error in run_longest_first(_run_fold, pending, costs, max_workers):
+        if error is not None:
+            failures += 1
+            if cache is not None and isinstance(error, FoldTimeout):
+                cache.set(fingerprint(keys[task_key], 'timeout'), time_budget)
+            continue
+        results[task_key] = fold
+        if cache is not None:
+            cache.set(keys[task_key], fold)
+    if failures:
+        logger.warning(f"백테스트 fold {failures}개 실패 (시간 초과 포함)")
+
+    # 4. 모델·그룹별 결합
+    grouped: Dict[str, Dict[str, List[pd.DataFrame]]] = {}
+    for (name, style, _), fold in sorted(results.items(), key=lambda item: item[0][2]):
+        grouped.setdefault(name, {}).setdefault(style, []).append(fold)
+    return {
+        name: {style: pd.concat(folds, ignore_index=True) for style, folds in groups.items()}
+        for name, groups in grouped.items()
+    }
+
+# 집계 ----------------------------------------------------------------
+def stack_backtests(
+    member_folds: Dict[str, Dict[str, pd.DataFrame]],
+    columns: Iterable[str] = ('yhat',)
+) -> Tuple[List[str], List[str], Dict[str, np.ndarray], np.ndarray]:
+    """
+    모델별 rolling-origin 예측을 배열로 정렬
+    Args:
+        member_folds: {모델명: {그룹명: ds/yhat/y/cutoff 컬럼 DataFrame}}
+        columns: 정렬할 예측 컬럼
+    Returns:
+        (그룹 목록, 모델 목록, {컬럼: 예측 배열 (모델 × 그룹 × cutoff × horizon)}, 실측 배열 (그룹 × cutoff × horizon))
+        모든 모델에 존재하지 않는 칸은 NaN
+    """
+    members = list(member_folds)
+    groups = sorted(set.intersection(*(set(folds) for folds in member_folds.values()))) if members else []
+    if not groups:
+        raise ValueError("모든 모델에 공통된 백테스트 그룹이 없습니다.")
+    columns = list(columns)
+
+    # 그룹별 (cutoff, horizon 단계) 위치 계산 - 모델 간 정렬은 실제 cutoff·예측 날짜 기준
+    frames = {}
+    n_cutoffs, n_horizon = 1, 1
+    for group in groups:
+        cells = pd.concat(
+            [member_folds[member][group][['cutoff', 'ds']] for member in members], ignore_index=True
+        ).drop_duplicates().sort_values(['cutoff', 'ds'])
+        cells['c_idx'] = cells.groupby('cutoff', sort=True).ngroup()
+        cells['h_idx'] = cells.groupby('cutoff').cumcount()
+        n_cutoffs = max(n_cutoffs, cells['c_idx'].max() + 1)
+        n_horizon = max(n_horizon, cells['h_idx'].max() + 1)
+        for member in members:
+            frames[member, group] = member_folds[member][group].merge(cells, on=['cutoff', 'ds'], how='left')
+
+    preds = {col: np.full((len(members), len(groups), n_cutoffs, n_horizon), np.nan) for col in columns}
+    actual = np.full((len(groups), n_cutoffs, n_horizon), np.nan)
+    for m, member in enumerate(members):
+        for g, group in enumerate(groups):
+            df = frames[member, group]
+            c, h = df['c_idx'].values, df['h_idx'].values
+            for col in columns:
+                if col in df:
+                    preds[col][m, g, c, h] = df[col].values
+            actual[g, c, h] = df['y'].values
+
+    # 일부 모델에만 있는 칸 제외
+    valid = ~np.isnan(actual) & ~np.isnan(preds[columns[0]]).any(axis=0)
+    for col in columns:
+        preds[col][:, ~valid] = np.nan
+    actual[~valid] = np.nan
+    return groups, members, preds, actual
+
+def summarize_backtest(
+    member_folds: Dict[str, Dict[str, pd.DataFrame]],
+    frames: Optional[Dict[str, pd.DataFrame]] = None,
+    season: int = 1,
+    by_horizon: bool = False
+) -> pd.DataFrame:
+    """
+    백테스트 지표 요약 (모델별 독립 집계, 배치 계산)
+    Args:
+        frames: {그룹명: ds/y DataFrame} - 지정 시 MASE 척도 계산에 사용
+        by_horizon: True면 horizon 단계별(전체 그룹·cutoff 평균), False면 그룹별(전체 cutoff·horizon 평균)
+    Returns:
+        model, group(또는 horizon), rmse, mape, smape, mase, r2, bias, coverage 컬럼 DataFrame
+    """
+    rows = []
+    for name, folds in member_folds.items():
+        if not folds:
+            continue
+        groups, _, preds, actual = stack_backtests({name: folds}, ('yhat', 'yhat_lower', 'yhat_upper'))
+        insample = None
+        if frames is not None and not by_horizon:
+            n_max = max(len(frames[group]) for group in groups)
+            insample = np.full((len(groups), n_max), np.nan)
+            for g, group in enumerate(groups):
+                y = frames[group].sort_values('ds')['y'].to_numpy(dtype=float)
+                insample[g, :len(y)] = y
+        lower, upper = preds['yhat_lower'][0], preds['yhat_upper'][0]
+        has_interval = not np.isnan(lower).all()
+        metrics = compute_metrics(
+            actual, preds['yhat'][0],
+            lower=lower if has_interval else None,
+            upper=upper if has_interval else None,
+            insample=insample, season=season,
+            axis=(0, 1) if by_horizon else (1, 2)
+        )
+        labels = range(1, actual.shape[-1] + 1) if by_horizon else groups
+        frame = pd.DataFrame(metrics)
+        frame.insert(0, 'horizon' if by_horizon else 'group', list(labels))
+        frame.insert(0, 'model', name)
+        rows.append(frame)
+    if not rows:
+        return pd.DataFrame()
+    return pd.concat(rows, ignore_index=True)
@@ -0,0 +1,80 @@
+# modeling/cache_utils.py
+import os
+import json
+import hashlib
+import tempfile
+import numpy as np
+import pandas as pd
+from typing import Any
+import logging
+logger = logging.getLogger(__name__)
+
+def _update_hash(hasher, obj: Any) -> None:
+    """객체 유형별 해시 입력 변환"""
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        hasher.update(str(obj.columns.tolist() if isinstance(obj, pd.DataFrame) else obj.name).encode())
+        hasher.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+    elif isinstance(obj, pd.Index):
+        hasher.update(pd.util.hash_pandas_object(obj).values.tobytes())
+    elif isinstance(obj, np.ndarray):
+        hasher.update(f"{obj.dtype}{obj.shape}".encode())
+        hasher.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (list, tuple)):
+        hasher.update(b'[')
+        for item in obj:
+            _update_hash(hasher, item)
+        hasher.update(b']')
+    elif isinstance(obj, dict):
+        hasher.update(b'{')
+        for key in sorted(obj, key=str):
+            hasher.update(str(key).encode())
+            _update_hash(hasher, obj[key])
+        hasher.update(b'}')
+    else:
+        hasher.update(json.dumps(obj, default=str).encode())
+
+def fingerprint(*parts: Any) -> str:
+    """데이터·설정 지문 (SHA-256)"""
+    hasher = hashlib.sha256()
+    for part in parts:
+        _update_hash(hasher, part)
+    return hasher.hexdigest()
+
+class DiskCache:
+    """지문 키 기반 디스크 캐시 (원자적 쓰기)"""
+
+    def __init__(self, root: str, compress: int = 3):
+        self.root = root
+        self.compress = compress
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.pkl")
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        path = self._path(key)
+        if not os.path.exists(path):
+            return default
+        try:
+            import joblib
+            return joblib.load(path)
+        except Exception as e:
+            logger.warning(f"캐시 로드 실패 ({key[:12]}): {str(e)}")
+            return default
+
+    def set(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # 임시 파일 저장 후 교체 (중단 시 손상 방지)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        os.close(fd)
+        try:
+            import joblib
+            joblib.dump(value, tmp_path, compress=self.compress)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -0,0 +1,488 @@
+# modeling/containers.py
+"""
+그룹 × 시점 결과 컨테이너 (구조체 배열)
+- 성분별 연속 float64 배열 1개: (그룹 × 공통 날짜 축), 그룹 구간 밖은 NaN
+- 그룹 뷰는 배열 행 슬라이스 (복사 없음, GroupView.array), 성분 조회 시 pandas Series로 변환해 기존 소비자와 호환
+- 직렬화: 등간격 날짜 축은 (시작, 간격, 길이)만 저장, 그룹 뷰는 해당 그룹 구간만 저장
+- DecompositionSet: STL 분해 결과, ForecastSet: 그룹 예측 결과 (시계열은 배열, 모델 등 객체는 그룹별 dict)
+"""
+import numpy as np
+import pandas as pd
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import logging
+logger = logging.getLogger(__name__)
+
+DECOMPOSITION_COMPONENTS = ('observed', 'trend', 'seasonal', 'resid')
+# 예측 결과 성분 (Prophet 날짜 축 = 학습 구간 + 예측 구간)
+# trend·ratio: 학습 데이터 (학습 구간), yhat·yhat_lower·yhat_upper: Prophet 적합값·예측, arima: ARIMA 예측 (예측 구간)
+FORECAST_COMPONENTS = ('trend', 'ratio', 'yhat', 'yhat_lower', 'yhat_upper', 'arima')
+FORECAST_ARRAY_KEYS = ('prophet', 'arima_forecast', 'train_data')  # 배열에서 재구성하는 예측 dict 키
+PROPHET_ARRAY_KEYS = ('yhat', 'forecast_details')
+
+def _pack_axis(axis: pd.DatetimeIndex) -> Tuple:
+    """날짜 축 직렬화 형태 (등간격이면 시작·간격·길이만)"""
+    if len(axis) > 2 and axis.tz is None:
+        values = axis.asi8
+        steps = np.diff(values)
+        if (steps == steps[0]).all():
+            return ('range', int(values[0]), int(steps[0]), len(values), str(axis.dtype), axis.name)
+    return ('values', axis.values, axis.name)
+
+def _unpack_axis(packed: Tuple) -> pd.DatetimeIndex:
+    if packed[0] == 'range':
+        _, start, step, length, dtype, name = packed
+        values = (start + step * np.arange(length, dtype=np.int64)).view(np.dtype(dtype))
+        return pd.DatetimeIndex(values, name=name)
+    _, values, name = packed
+    return pd.DatetimeIndex(values, name=name)
+
+def _readonly(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+def _restore_view(owner: 'SeriesSet', group: str) -> Optional['GroupView']:
+    return owner[group]
+
+class SeriesSet(Mapping):
+    """
+    공통 날짜 축 위 그룹별 시계열 묶음 ({그룹: 뷰} 매핑)
+    - arrays[성분]: (그룹 × 축 길이) 배열
+    - spans[행]: 그룹 구간 [시작, 끝) (축 위에서 연속이 아닌 그룹은 positions[행]에 위치 배열)
+    - scalars[이름]: (그룹,) 그룹별 스칼라
+    - 값 없는 그룹(분해 실패 등)은 행 -1, 조회 시 None
+    """
+    __slots__ = ('axis', 'arrays', 'scalars', 'names', 'spans', 'positions', '_rows', '_indexes')
+    view_class: type = None  # 하위 클래스별 그룹 뷰 (모듈 끝에서 지정)
+
+    def __init__(
+        self,
+        axis: pd.DatetimeIndex,
+        arrays: Dict[str, np.ndarray],
+        scalars: Dict[str, np.ndarray],
+        names: Dict[str, Any],
+        spans: np.ndarray,
+        rows: Dict[str, int],
+        positions: Optional[Dict[int, np.ndarray]] = None
+    ):
+        self.axis = axis
+        self.arrays = {key: _readonly(np.ascontiguousarray(values, dtype=float)) for key, values in arrays.items()}
+        self.scalars = {key: _readonly(np.asarray(values, dtype=float)) for key, values in scalars.items()}
+        self.names = names
+        self.spans = spans
+        self.positions = positions or {}
+        self._rows = rows
+        self._indexes = {}  # 행별 날짜 인덱스 (축 슬라이스, 직렬화 제외)
+
+    # 생성 ---------------------------------------------------------------------
+    @classmethod
+    def from_series(
+        cls,
+        groups: Mapping,
+        components: Sequence[str],
+        scalars: Sequence[str] = ()
+    ) -> 'SeriesSet':
+        """
+        {그룹: {성분: Series, 스칼라명: 값} 또는 None} → 컨테이너
+        (그룹 안의 성분 Series는 같은 DatetimeIndex 공유, 인덱스는 정렬·중복 없음)
+        """
+        valid = [(group, data) for group, data in groups.items() if data is not None]
+        indexes = [pd.DatetimeIndex(data[components[0]].index) for _, data in valid]
+        if not indexes:
+            axis = pd.DatetimeIndex([])
+        elif all(index.equals(indexes[0]) for index in indexes[1:]):
+            axis = indexes[0]
+        else:
+            axis = pd.DatetimeIndex(np.unique(np.concatenate([index.values for index in indexes])), name=indexes[0].name)
+
+        arrays = {key: np.full((len(valid), len(axis)), np.nan) for key in components}
+        spans = np.zeros((len(valid), 2), dtype=np.int64)
+        positions = {}
+        for row, ((group, data), index) in enumerate(zip(valid, indexes)):
+            if not index.is_unique:
+                raise ValueError(f"[{group}] 날짜 중복")
+            start = int(axis.searchsorted(index[0])) if len(index) else 0
+            if axis[start:start + len(index)].equals(index):
+                spans[row] = start, start + len(index)
+                where = slice(start, start + len(index))
+            else:
+                where = positions[row] = axis.get_indexer(index)
+                spans[row] = where.min(), where.max() + 1
+            for key in components:
+                arrays[key][row, where] = np.asarray(data[key], dtype=float)
+
+        first = valid[0][1] if valid else {}
+        names = {key: getattr(first.get(key), 'name', None) for key in components}
+        values = {key: [data[key] for _, data in valid] for key in scalars}
+        rows, row = {}, 0
+        for group, data in groups.items():
+            rows[group] = row if data is not None else -1
+            row += data is not None
+        return cls(axis, arrays, values, names, spans, rows, positions)
+
+    @classmethod
+    def concat(cls, sets: Sequence['SeriesSet']) -> 'SeriesSet':
+        """컨테이너 병합 (날짜 축 합집합, 같은 그룹은 뒤쪽 우선)"""
+        sets = [item for item in sets if item is not None]
+        if not sets:
+            raise ValueError("병합할 컨테이너가 없습니다.")
+        axes = [item.axis for item in sets if len(item.axis)]
+        if axes and all(axis.equals(axes[0]) for axis in axes[1:]):
+            axis = axes[0]
+        elif axes:
+            axis = pd.DatetimeIndex(np.unique(np.concatenate([axis.values for axis in axes])), name=axes[0].name)
+        else:
+            axis = sets[0].axis
+
+        template = next((item for item in sets if len(item.spans)), sets[0])  # 성분·스칼라 구성 기준
+        owners = {}
+        for item in sets:
+            for group in item:
+                owners.pop(group, None)
+                owners[group] = item
+        valid = [(group, item) for group, item in owners.items() if item._rows[group] >= 0]
+        arrays = {key: np.full((len(valid), len(axis)), np.nan) for key in template.arrays}
+        scalars = {key: np.full(len(valid), np.nan) for key in template.scalars}
+        spans = np.zeros((len(valid), 2), dtype=np.int64)
+        positions = {}
+        offsets = {id(item): axis.get_indexer(item.axis) for item in sets}
+        for row, (group, item) in enumerate(valid):
+            source = item._rows[group]
+            where = offsets[id(item)][item._where(source)]
+            if len(where) and (np.diff(where) == 1).all():
+                spans[row] = where[0], where[-1] + 1
+            elif len(where):
+                positions[row] = where
+                spans[row] = where.min(), where.max() + 1
+            for key in arrays:
+                arrays[key][row, where] = item.arrays[key][source, item._where(source)]
+            for key in scalars:
+                scalars[key][row] = item.scalars[key][source]
+
+        rows, row = {}, 0
+        for group, item in owners.items():
+            rows[group] = row if item._rows[group] >= 0 else -1
+            row += item._rows[group] >= 0
+        return cls(axis, arrays, scalars, dict(template.names), spans, rows, positions)
+
+    def subset(self, groups: Sequence[str]) -> 'SeriesSet':
+        """선택 그룹만 복사 (날짜 축은 선택 그룹 구간으로 축소)"""
+        rows = [self._rows[group] for group in groups]
+        valid = [row for row in rows if row >= 0]
+        lo = int(self.spans[valid, 0].min()) if valid else 0
+        hi = int(self.spans[valid, 1].max()) if valid else 0
+        new_rows, position = {}, 0
+        for group, row in zip(groups, rows):
+            new_rows[group] = position if row >= 0 else -1
+            position += row >= 0
+        return type(self)(
+            self.axis[lo:hi],
+            {key: values[valid, lo:hi] for key, values in self.arrays.items()},
+            {key: values[valid] for key, values in self.scalars.items()},
+            dict(self.names),
+            self.spans[valid] - lo,
+            new_rows,
+            {new: self.positions[row] - lo for new, row in enumerate(valid) if row in self.positions}
+        )
+
+    # 조회 ---------------------------------------------------------------------
+    def __getitem__(self, group: str) -> Optional['GroupView']:
+        row = self._rows[group]
+        return self.view_class(self, row, group) if row >= 0 else None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, group: object) -> bool:
+        return group in self._rows
+
+    def _where(self, row: int) -> Any:
+        """행의 날짜 축 위치 (연속 구간이면 slice)"""
+        if row in self.positions:
+            return self.positions[row]
+        start, stop = self.spans[row]
+        return slice(int(start), int(stop))
+
+    @property
+    def nbytes(self) -> int:
+        """배열·날짜 축 메모리 (바이트)"""
+        return (
+            sum(values.nbytes for values in self.arrays.values())
+            + sum(values.nbytes for values in self.scalars.values())
+            + self.spans.nbytes + self.axis.nbytes
+        )
+
+    def to_pandas(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        """기존 형식 {그룹: {성분: Series, ...}} 변환"""
+        return {group: view.to_dict() if view is not None else None for group, view in self.items()}
+
+    # 직렬화 -------------------------------------------------------------------
+    def __getstate__(self) -> Dict[str, Any]:
+        return {
+            'axis': _pack_axis(self.axis), 'arrays': self.arrays, 'scalars': self.scalars,
+            'names': self.names, 'spans': self.spans, 'positions': self.positions, 'rows': self._rows
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        type(self).__init__(
+            self, _unpack_axis(state['axis']), state['arrays'], state['scalars'],
+            state['names'], state['spans'], state['rows'], state['positions']
+        )
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(groups={len(self)}, axis={len(self.axis)}, components={list(self.arrays)})"
+
+class GroupView(Mapping):
+    """그룹 1개 뷰 ({성분: Series, 스칼라명: 값} 매핑, 배열 행을 공유)"""
+    __slots__ = ('owner', 'row', 'group')
+
+    def __init__(self, owner: SeriesSet, row: int, group: str):
+        self.owner = owner
+        self.row = row
+        self.group = group
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        indexes = self.owner._indexes
+        if self.row not in indexes:
+            indexes[self.row] = self.owner.axis[self.owner._where(self.row)]
+        return indexes[self.row]
+
+    def array(self, key: str) -> np.ndarray:
+        """성분 배열 (연속 구간 그룹은 복사 없는 읽기 전용 뷰)"""
+        return self.owner.arrays[key][self.row, self.owner._where(self.row)]
+
+    def series(self, key: str) -> pd.Series:
+        return pd.Series(self.array(key), index=self.index, name=self.owner.names.get(key), copy=False)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.owner.arrays:
+            return self.series(key)
+        if key in self.owner.scalars:
+            return self.owner.scalars[key][self.row]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.owner.arrays
+        yield from self.owner.scalars
+
+    def __len__(self) -> int:
+        return len(self.owner.arrays) + len(self.owner.scalars)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.owner.arrays or key in self.owner.scalars
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: self[key] for key in self}
+
+    def __reduce__(self) -> Tuple:
+        # 그룹 단위 캐시·프로세스 전달 시 소유 컨테이너 전체 대신 해당 그룹만 직렬화
+        return _restore_view, (self.owner.subset([self.group]), self.group)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.group!r}, n={len(self.index)})"
+
+class DecompositionView(GroupView):
+    """STL 분해 그룹 뷰 (observed/trend/seasonal/resid Series + metrics dict + acf_score)"""
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'metrics':
+            return {name: self.owner.scalars[name][self.row] for name in self.owner.metric_names}
+        return super().__getitem__(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.owner.arrays
+        yield 'metrics'
+        yield 'acf_score'
+
+    def __len__(self) -> int:
+        return len(self.owner.arrays) + 2
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.owner.arrays or key in ('metrics', 'acf_score')
+
+class DecompositionSet(SeriesSet):
+    """STL 분해 결과 컨테이너 ({그룹: DecompositionView})"""
+    __slots__ = ()
+
+    @classmethod
+    def from_decompositions(cls, decompositions: Mapping) -> 'DecompositionSet':
+        """decompose_trend 그룹별 dict({성분: Series, 'metrics': dict, 'acf_score': float}) → 컨테이너"""
+        first = next((data for data in decompositions.values() if data is not None), None)
+        metric_names = list(first['metrics']) if first is not None else []
+        flat = {
+            group: None if data is None else {
+                **{key: data[key] for key in DECOMPOSITION_COMPONENTS},
+                **{name: data['metrics'][name] for name in metric_names},
+                'acf_score': data['acf_score']
+            }
+            for group, data in decompositions.items()
+        }
+        return cls.from_series(flat, DECOMPOSITION_COMPONENTS, [*metric_names, 'acf_score'])
+
+    @property
+    def metric_names(self) -> List[str]:
+        return [name for name in self.scalars if name != 'acf_score']
+
+class ForecastView(GroupView, MutableMapping):
+    """
+    예측 그룹 뷰 (_process_group 반환 dict와 같은 키)
+    - 'prophet'(yhat·forecast_details + 부가 항목), 'arima_forecast', 'train_data'는 조회 시 배열에서 재구성
+    - 그 외 키(모델·가중치 등)는 그룹별 객체 dict에 저장, 배열 기반 키는 변경 불가 (copy(prophet=...) 사용)
+    """
+    __slots__ = ()
+
+    @property
+    def objects(self) -> Dict[str, Any]:
+        return self.owner.objects[self.group]
+
+    def _count(self, key: str) -> int:
+        return int(self.owner.scalars[key][self.row])
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'prophet':
+            extras = self.objects.get('prophet', {})
+            return {
+                'yhat': np.array(self.array('yhat')),
+                'forecast_details': pd.DataFrame({
+                    'ds': self.index, 'yhat_lower': self.array('yhat_lower'), 'yhat_upper': self.array('yhat_upper')
+                }),
+                **extras
+            }
+        if key == 'arima_forecast':
+            n_train, n_arima = self._count('n_train'), self._count('n_arima')
+            if n_arima == 0:
+                return None
+            return pd.Series(self.array('arima')[-n_arima:], index=pd.RangeIndex(n_train, n_train + n_arima))
+        if key == 'train_data':
+            n_train = self._count('n_train')
+            return pd.DataFrame({
+                'date': self.index[:n_train],
+                'trend': self.array('trend')[:n_train],
+                'ratio': self.array('ratio')[:n_train]
+            })
+        return self.objects[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in FORECAST_ARRAY_KEYS:
+            raise TypeError(f"배열 기반 항목은 변경할 수 없습니다: {key}")
+        self.objects[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in FORECAST_ARRAY_KEYS:
+            raise TypeError(f"배열 기반 항목은 삭제할 수 없습니다: {key}")
+        del self.objects[key]
+
+    def __iter__(self) -> Iterator[str]:
+        if 'style' in self.objects:
+            yield 'style'
+        yield from FORECAST_ARRAY_KEYS
+        yield from (key for key in self.objects if key not in ('style', 'prophet'))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key: object) -> bool:
+        return key in FORECAST_ARRAY_KEYS or (key != 'prophet' and key in self.objects)
+
+    def copy(self, prophet: Optional[Dict[str, Any]] = None) -> 'ForecastView':
+        """
+        독립 사본 (배열 공유, 객체 dict만 복사 - 사본의 항목 추가가 원본에 반영되지 않음)
+        prophet: Prophet 부가 항목 추가·교체 (예: {'validation': ...})
+        """
+        if prophet and any(key in PROPHET_ARRAY_KEYS for key in prophet):
+            raise TypeError(f"배열 기반 Prophet 항목은 변경할 수 없습니다: {list(prophet)}")
+        objects = {**self.objects, 'prophet': {**self.objects.get('prophet', {}), **(prophet or {})}}
+        return self.owner._share(self.group, objects)[self.group]
+
+class ForecastSet(SeriesSet):
+    """그룹 예측 결과 컨테이너 ({그룹: ForecastView}, 모델 등 배열이 아닌 항목은 objects[그룹])"""
+    __slots__ = ('objects',)
+
+    def __init__(self, *args: Any, objects: Optional[Dict[str, Dict[str, Any]]] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.objects = objects or {}
+
+    @classmethod
+    def from_forecasts(cls, forecasts: Mapping) -> 'ForecastSet':
+        """
+        _process_group 반환 dict({'style', 'prophet', 'arima_model', 'arima_forecast', 'train_data', ...}) → 컨테이너
+        학습 데이터 날짜는 Prophet 날짜 축의 앞부분과 같아야 함
+        """
+        flat, objects = {}, {}
+        for group, data in forecasts.items():
+            if data is None:
+                flat[group] = None
+                continue
+            prophet = data['prophet']
+            details = prophet['forecast_details']
+            index = pd.DatetimeIndex(details['ds'])
+            train = data['train_data']
+            n_train = len(train)
+            if not index[:n_train].equals(pd.DatetimeIndex(train['date'])):
+                raise ValueError(f"[{group}] 학습 데이터 날짜가 Prophet 날짜 축과 다릅니다.")
+            arima = data.get('arima_forecast')
+            n_arima = 0 if arima is None else len(arima)
+
+            padded = np.full((2, len(index)), np.nan)
+            padded[0, :n_train] = np.asarray(train['trend'], dtype=float)
+            padded[1, :n_train] = np.asarray(train['ratio'], dtype=float)
+            arima_values = np.full(len(index), np.nan)
+            if n_arima:
+                arima_values[-n_arima:] = np.asarray(arima, dtype=float)
+            flat[group] = {
+                'trend': pd.Series(padded[0], index=index),
+                'ratio': pd.Series(padded[1], index=index),
+                'yhat': pd.Series(np.asarray(prophet['yhat'], dtype=float), index=index),
+                'yhat_lower': pd.Series(np.asarray(details['yhat_lower'], dtype=float), index=index),
+                'yhat_upper': pd.Series(np.asarray(details['yhat_upper'], dtype=float), index=index),
+                'arima': pd.Series(arima_values, index=index),
+                'n_train': n_train,
+                'n_arima': n_arima
+            }
+            objects[group] = {
+                **{key: value for key, value in data.items() if key not in FORECAST_ARRAY_KEYS},
+                'prophet': {key: value for key, value in prophet.items() if key not in PROPHET_ARRAY_KEYS}
+            }
+        result = cls.from_series(flat, FORECAST_COMPONENTS, ('n_train', 'n_arima'))
+        result.objects = objects
+        return result
+
+    @classmethod
+    def concat(cls, sets: Sequence['ForecastSet']) -> 'ForecastSet':
+        result = super().concat(sets)
+        for item in sets:
+            if item is not None:
+                result.objects.update(item.objects)
+        return result
+
+    def subset(self, groups: Sequence[str]) -> 'ForecastSet':
+        result = super().subset(groups)
+        result.objects = {group: self.objects[group] for group in groups if group in self.objects}
+        return result
+
+    def _share(self, group: str, objects: Dict[str, Any]) -> 'ForecastSet':
+        """그룹 1개 컨테이너 (배열 공유, 객체 dict 교체)"""
+        return type(self)(
+            self.axis, self.arrays, self.scalars, self.names, self.spans,
+            {group: self._rows[group]},
+            self.positions, objects={group: objects}
+        )
+
+    def to_pandas(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        return {group: dict(view) if view is not None else None for group, view in self.items()}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {**super().__getstate__(), 'objects': self.objects}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        super().__setstate__(state)
+        self.objects = state['objects']
+
+SeriesSet.view_class = GroupView
+DecompositionSet.view_class = DecompositionView
+ForecastSet.view_class = ForecastView
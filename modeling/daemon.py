@@ -0,0 +1,301 @@
+# modeling/daemon.py
+"""
+상주 갱신 데몬
+- 시작 시 예측 라이브러리 임포트, 최근 산출물(모델 포함)을 메모리에 적재
+- 주기마다 DataLab 신규 기간만 요청해 기존 데이터에 병합, 데이터가 바뀐 그룹만 재계산
+- 실행 사이 상태·진행률 HTTP 제공
+
+사용 예:
+    python -m modeling.daemon --interval 604800 --port 8765
+    curl localhost:8765/health
+    curl localhost:8765/progress
+    curl -X POST localhost:8765/refresh
+"""
+import os
+import sys
+import json
+import time
+import signal
+import argparse
+import threading
+import numpy as np
+import pandas as pd
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+from modeling.pipeline import PIPELINE_CACHE_DIR
+from modeling.scheduler import ForecastScheduler
+logger = logging.getLogger(__name__)
+
+RAW_DATA_PATH = 'processed/raw_data.csv'
+DATALAB_MAX_GROUPS = 5  # DataLab 요청당 키워드 그룹 수 한도 (그룹 비율은 요청 단위로 정규화)
+OVERLAP_PERIODS = 8  # 증분 요청 시 기존 데이터와 겹치게 받을 기간 수 (스케일 보정용)
+SCALE_TOLERANCE = 0.02  # 겹치는 구간 스케일 보정 후 허용 오차 (최대값 대비)
+PERIOD_DAYS = {'date': 1, 'week': 7, 'month': 31}
+WARM_MODULES = ('prophet', 'pmdarima', 'statsmodels.tsa.seasonal', 'statsmodels.tsa.arima.model')
+
+def warm_imports() -> List[str]:
+    """예측 라이브러리 사전 임포트 (첫 갱신 지연 방지)"""
+    import importlib
+    loaded = []
+    for module in WARM_MODULES:
+        try:
+            importlib.import_module(module)
+            loaded.append(module)
+        except ImportError as e:
+            logger.warning(f"사전 임포트 실패 ({module}): {str(e)}")
+    return loaded
+
+def fetch_datalab(body: Dict[str, Any]) -> pd.DataFrame:
+    """DataLab 검색 비율 요청 → (date, group_name, ratio)"""
+    from connector.config_loader import initialize_naver_api
+    naver = initialize_naver_api()
+    return naver.to_dataframe(naver.send_request(body))
+
+def merge_increment(
+    history: pd.DataFrame,
+    update: pd.DataFrame,
+    tolerance: float = SCALE_TOLERANCE
+) -> Optional[pd.DataFrame]:
+    """
+    증분 데이터를 기존 데이터 스케일로 병합
+    DataLab 비율은 요청 기간·그룹 내 최대값 기준(100)이므로 겹치는 구간에서 공통 배율을 추정해 맞춤
+    기존 마지막 기간은 집계 중일 수 있어 새 값으로 교체
+    Returns:
+        병합 결과 (겹치는 구간이 없거나 배율이 일관되지 않으면 None → 전체 기간 재요청)
+    """
+    if history.empty or update.empty:
+        return None
+    history = history.assign(date=pd.to_datetime(history['date']))
+    update = update.assign(date=pd.to_datetime(update['date']))
+    last_date = history['date'].max()
+
+    overlap = history[history['date'] < last_date].merge(
+        update, on=['date', 'group_name'], suffixes=('_old', '_new')
+    )
+    overlap = overlap[(overlap['ratio_new'] > 0) & (overlap['ratio_old'] > 0)]
+    if overlap.empty:
+        return None
+    scale = float(np.median(overlap['ratio_old'] / overlap['ratio_new']))
+    error = np.abs(overlap['ratio_new'] * scale - overlap['ratio_old']).max() / overlap['ratio_old'].max()
+    if error > tolerance:
+        logger.info(f"겹치는 구간 배율 불일치 (오차 {error:.3f}) - 전체 기간 재요청")
+        return None
+
+    fresh = update[update['date'] >= last_date].assign(ratio=lambda df: df['ratio'] * scale)
+    merged = pd.concat([history[history['date'] < last_date], fresh], ignore_index=True)
+    return merged.sort_values(['group_name', 'date']).reset_index(drop=True)
+
+class RefreshDaemon:
+    """
+    상주 갱신 데몬
+    파이프라인 산출물을 메모리에 유지(keep_in_memory)해 변경 없는 그룹은 디스크 로드 없이 재사용
+    """
+
+    def __init__(
+        self,
+        config_path: str = 'config.yaml',
+        raw_path: str = RAW_DATA_PATH,
+        interval: float = 7 * 86400,
+        arima_method: str = 'fourier',
+        cache_dir: Optional[str] = PIPELINE_CACHE_DIR,
+        scheduler: Optional[ForecastScheduler] = None,
+        fetch: Callable[[Dict[str, Any]], pd.DataFrame] = fetch_datalab
+    ):
+        from modeling.run_phase2 import build_pipeline
+        self.config_path = config_path
+        self.raw_path = raw_path
+        self.interval = interval
+        self.fetch = fetch
+        self.pipeline = build_pipeline(
+            arima_method, cache_dir, scheduler, keep_in_memory=True, progress=self._on_progress
+        )
+        self.outputs = {}  # 최근 실행 결과 (분해·앙상블 예측·평가, 모델 객체 포함)
+        self._lock = threading.Lock()
+        self._trigger = threading.Event()
+        self._stop = threading.Event()
+        self._state = {
+            'status': 'starting', 'started_at': time.time(), 'last_tick': None, 'next_tick': None,
+            'last_duration': None, 'last_error': None, 'ticks': 0, 'groups': 0,
+            'data_through': None, 'progress': {}
+        }
+
+    # 상태 ------------------------------------------------------------------
+    def _update(self, **fields: Any) -> None:
+        with self._lock:
+            self._state.update(fields)
+
+    def _on_progress(self, stage: str, done: int, total: int) -> None:
+        with self._lock:
+            self._state['progress'] = {'stage': stage, 'done': done, 'total': total}
+
+    @property
+    def state(self) -> Dict[str, Any]:
+        with self._lock:
+            return json.loads(json.dumps(self._state, default=str))
+
+    # 데이터 수집 -------------------------------------------------------------
+    def _request_body(self) -> Dict[str, Any]:
+        from connector.config_loader import create_request_body
+        body = create_request_body(self.config_path)
+        body['endDate'] = date.today().strftime('%Y-%m-%d')
+        return body
+
+    def _load_history(self) -> pd.DataFrame:
+        if not os.path.exists(self.raw_path):
+            return pd.DataFrame(columns=['date', 'group_name', 'ratio'])
+        return pd.read_csv(self.raw_path, parse_dates=['date'])
+
+    def _save_history(self, raw_df: pd.DataFrame) -> None:
+        os.makedirs(os.path.dirname(self.raw_path) or '.', exist_ok=True)
+        tmp_path = f'{self.raw_path}.tmp'
+        raw_df.to_csv(tmp_path, index=False, date_format='%Y-%m-%d')
+        os.replace(tmp_path, self.raw_path)
+
+    def pull(self) -> Tuple[pd.DataFrame, bool]:
+        """
+        신규 기간 수집 (요청 단위 그룹 묶음별 증분 요청, 스케일 보정 실패 시 전체 기간)
+        Returns:
+            (전체 원본 데이터, 변경 여부)
+        """
+        body = self._request_body()
+        history = self._load_history()
+        period = timedelta(days=PERIOD_DAYS.get(body['timeUnit'], 7))
+        groups = body['keywordGroups']
+
+        frames = []
+        for start in range(0, len(groups), DATALAB_MAX_GROUPS):
+            batch = groups[start:start + DATALAB_MAX_GROUPS]
+            names = [group['groupName'] for group in batch]
+            batch_history = history[history['group_name'].isin(names)]
+            merged = None
+            if set(batch_history['group_name']) == set(names):
+                since = pd.to_datetime(batch_history['date']).max() - period * OVERLAP_PERIODS
+                since = max(since, pd.Timestamp(body['startDate']))
+                update = self.fetch({**body, 'startDate': since.strftime('%Y-%m-%d'), 'keywordGroups': batch})
+                merged = merge_increment(batch_history, update)
+            if merged is None:
+                merged = self.fetch({**body, 'keywordGroups': batch})
+                merged['date'] = pd.to_datetime(merged['date'])
+            frames.append(merged)
+
+        raw_df = pd.concat(frames, ignore_index=True).sort_values(['group_name', 'date']).reset_index(drop=True)
+        changed = history.empty or not raw_df.reset_index(drop=True).equals(
+            history.sort_values(['group_name', 'date']).reset_index(drop=True)
+        )
+        if changed:
+            self._save_history(raw_df)
+        return raw_df, changed
+
+    # 갱신 --------------------------------------------------------------------
+    def tick(self) -> Dict[str, Any]:
+        """1회 갱신: 수집 → 변경 그룹만 재계산 → 메모리 산출물 교체"""
+        from modeling.run_phase2 import PIPELINE_TARGETS
+        started = time.time()
+        self._update(status='running', progress={})
+        try:
+            raw_df, changed = self.pull()
+            if changed or not self.outputs:
+                self.outputs = self.pipeline.run({'raw': raw_df}, targets=PIPELINE_TARGETS)
+            self._update(
+                status='idle', last_error=None, last_tick=started, last_duration=round(time.time() - started, 2),
+                groups=len(self.outputs.get('evaluate', {})), data_through=str(pd.to_datetime(raw_df['date']).max().date()),
+                ticks=self._state['ticks'] + 1
+            )
+            logger.info(f"갱신 완료 (데이터 변경: {changed}, {time.time() - started:.1f}초)")
+        except Exception as e:
+            logger.error(f"갱신 실패: {str(e)}", exc_info=True)
+            self._update(status='error', last_error=f"{type(e).__name__}: {str(e)}", last_tick=started)
+        return self.state
+
+    def refresh(self) -> None:
+        """다음 주기를 기다리지 않고 갱신 요청"""
+        self._trigger.set()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._trigger.set()
+
+    def run_forever(self, run_now: bool = True) -> None:
+        """주기 실행 (SIGTERM/SIGINT 시 현재 갱신 후 종료)"""
+        if threading.current_thread() is threading.main_thread():
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(sig, lambda signum, frame: self.stop())
+        next_tick = time.time() if run_now else time.time() + self.interval
+        while not self._stop.is_set():
+            self._update(next_tick=next_tick)
+            self._trigger.wait(max(0.0, next_tick - time.time()))
+            self._trigger.clear()
+            if self._stop.is_set():
+                break
+            self.tick()
+            next_tick = time.time() + self.interval
+        self._update(status='stopped', next_tick=None)
+
+    # HTTP ------------------------------------------------------------------
+    def serve(self, host: str = '127.0.0.1', port: int = 8765) -> ThreadingHTTPServer:
+        """상태 HTTP 서버 (백그라운드 스레드)"""
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send(self, code: int, payload: Dict[str, Any]) -> None:
+                body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                state = daemon.state
+                if self.path == '/health':
+                    self._send(503 if state['status'] in ('error', 'stopped') else 200, state)
+                elif self.path == '/progress':
+                    self._send(200, {'status': state['status'], **state['progress']})
+                else:
+                    self._send(404, {'error': 'not found'})
+
+            def do_POST(self) -> None:
+                if self.path == '/refresh':
+                    daemon.refresh()
+                    self._send(202, {'status': 'scheduled'})
+                else:
+                    self._send(404, {'error': 'not found'})
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug(format % args)
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        logger.info(f"상태 서버: http://{host}:{server.server_address[1]}/health")
+        return server
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='상주 갱신 데몬')
+    parser.add_argument('--config', default='config.yaml', help='키워드 그룹·API 설정')
+    parser.add_argument('--raw', default=RAW_DATA_PATH, help='누적 원본 데이터 CSV')
+    parser.add_argument('--interval', type=float, default=7 * 86400, help='갱신 주기(초)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--arima-method', default='fourier', choices=('fourier', 'sarima'))
+    parser.add_argument('--max-workers', type=int, help='예측 프로세스 수 (기본: 코어 수)')
+    parser.add_argument('--fit-timeout', type=float, help='그룹 예측 시간 제한(초)')
+    parser.add_argument('--no-run-now', action='store_true', help='시작 직후 갱신하지 않음')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    logger.info(f"사전 임포트: {warm_imports()}")
+    daemon = RefreshDaemon(
+        args.config, args.raw, args.interval, args.arima_method,
+        scheduler=ForecastScheduler('forecast', max_workers=args.max_workers, timeout=args.fit_timeout)
+    )
+    server = daemon.serve(args.host, args.port)
+    try:
+        daemon.run_forever(run_now=not args.no_run_now)
+    finally:
+        server.shutdown()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
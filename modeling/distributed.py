@@ -0,0 +1,237 @@
+# modeling/distributed.py
+"""
+샤드 단위 다중 호스트 실행 (작업 큐 + 공유 산출물 저장소)
+
+- submit: 그룹을 샤드로 나눠 큐에 등록 (입력 데이터는 공유 저장소에 기록)
+- worker: 샤드를 가져와 분해·예측·검증 단계를 실행하고 산출물을 공유 저장소에 기록 (호스트 수 제한 없음)
+- reduce: 모든 샤드 완료 후 앙상블·평가·리포트 실행 (샤드 산출물은 캐시로 재사용)
+
+사용 예:
+    python -m modeling.distributed submit --queue sqlite:///shared/jobs.db --store /shared/store --input processed/cleaned_data.csv
+    python -m modeling.distributed worker --queue sqlite:///shared/jobs.db --store /shared/store --exit-when-idle
+    python -m modeling.distributed reduce --queue sqlite:///shared/jobs.db --store /shared/store --run <run_id>
+    python -m modeling.distributed status --queue sqlite:///shared/jobs.db --run <run_id>
+"""
+import os
+import sys
+import time
+import socket
+import argparse
+import threading
+import pandas as pd
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+from modeling.cache_utils import DiskCache, fingerprint
+from modeling.job_queue import DEFAULT_LEASE, JobQueue, open_queue
+from modeling.scheduler import ForecastScheduler
+logger = logging.getLogger(__name__)
+
+SHARD_TARGETS = ('production', 'validate')  # 워커가 실행하는 그룹 단계 (마지막 단계 기준 완료 판정, 이후 단계는 reduce)
+SHARD_SIZE = 50
+
+def _balance_shards(groups: List[str], n_shards: int) -> List[List[str]]:
+    """과거 예측 소요 시간 기준 LPT 분배 (긴 그룹부터 가장 가벼운 샤드에 배정)"""
+    scheduler = ForecastScheduler('forecast', progress=False)
+    known = [scheduler.history[group] for group in groups if group in scheduler.history]
+    default = max(known) if known else 1.0
+    shards = [[] for _ in range(n_shards)]
+    loads = [0.0] * n_shards
+    for group in scheduler.order(groups):
+        target = loads.index(min(loads))
+        shards[target].append(group)
+        loads[target] += scheduler.history.get(group, default)
+    return [shard for shard in shards if shard]
+
+def submit(
+    cleaned_df: pd.DataFrame,
+    queue: JobQueue,
+    store: str,
+    shard_size: int = SHARD_SIZE,
+    arima_method: str = 'fourier'
+) -> str:
+    """
+    샤드 작업 등록
+    Returns:
+        실행 ID (reduce·status에서 사용)
+    """
+    from modeling.run_phase2 import build_pipeline
+    source_key = fingerprint('source', cleaned_df)  # 파이프라인 입력 키와 동일
+    run_id = fingerprint(source_key, arima_method)[:12]
+    DiskCache(store).set(source_key, cleaned_df)
+
+    # 그룹 분할 단계는 여기서 한 번 실행해 저장소에 기록 (워커는 재사용)
+    groups = list(build_pipeline(arima_method, cache_dir=store).run(
+        {'cleaned': cleaned_df}, targets=('series',)
+    )['series'])
+    n_shards = max(1, -(-len(groups) // shard_size))
+    shards = _balance_shards(groups, n_shards)
+    for i, shard in enumerate(shards):
+        queue.put(f'{run_id}-{i:04d}', run_id, {
+            'source': source_key, 'groups': shard, 'arima_method': arima_method
+        })
+    logger.info(f"[{run_id}] {len(groups)}개 그룹 → {len(shards)}개 샤드 등록")
+    return run_id
+
+def _heartbeat(queue: JobQueue, job_id: str, worker_id: str, lease: float, stop: threading.Event) -> None:
+    """작업 중 임대 갱신 (lease의 1/3 간격)"""
+    while not stop.wait(lease / 3):
+        if not queue.extend(job_id, worker_id, lease):
+            logger.warning(f"[{job_id}] 임대 갱신 실패 (다른 워커에 재배정됨)")
+            return
+
+def run_shard(job: Dict[str, Any], store: str, scheduler: Optional[ForecastScheduler] = None) -> Dict[str, Any]:
+    """샤드 1건 실행 → 결과 요약"""
+    from modeling.run_phase2 import build_pipeline
+    payload = job['payload']
+    cleaned_df = DiskCache(store).get(payload['source'])
+    if cleaned_df is None:
+        raise FileNotFoundError(f"저장소에 입력 데이터 없음: {payload['source'][:12]}")
+    started = time.perf_counter()
+    outputs = build_pipeline(payload['arima_method'], cache_dir=store, scheduler=scheduler).run(
+        {'cleaned': cleaned_df}, targets=SHARD_TARGETS, groups=payload['groups']
+    )
+    completed = set(outputs[SHARD_TARGETS[-1]])
+    return {
+        'host': socket.gethostname(),
+        'elapsed': round(time.perf_counter() - started, 2),
+        'completed': len(completed),
+        'missing': [group for group in payload['groups'] if group not in completed]
+    }
+
+def worker(
+    queue: JobQueue,
+    store: str,
+    worker_id: Optional[str] = None,
+    run_id: Optional[str] = None,
+    lease: float = DEFAULT_LEASE,
+    poll: float = 5.0,
+    exit_when_idle: bool = False,
+    scheduler: Optional[ForecastScheduler] = None
+) -> int:
+    """
+    샤드 처리 루프
+    exit_when_idle: 대기·실행 중인 작업이 없으면 종료 (False면 새 작업 대기)
+    Returns:
+        처리한 샤드 수
+    """
+    worker_id = worker_id or f'{socket.gethostname()}-{os.getpid()}'
+    processed = 0
+    while True:
+        job = queue.claim(worker_id, lease=lease, run_id=run_id)
+        if job is None:
+            counts = queue.stats(run_id)
+            if exit_when_idle and counts['pending'] == 0 and counts['running'] == 0:
+                return processed
+            time.sleep(poll)
+            continue
+
+        logger.info(f"[{worker_id}] 샤드 {job['id']} 시작 ({len(job['payload']['groups'])}개 그룹, 시도 {job['attempts']})")
+        stop = threading.Event()
+        beat = threading.Thread(target=_heartbeat, args=(queue, job['id'], worker_id, lease, stop), daemon=True)
+        beat.start()
+        try:
+            result = run_shard(job, store, scheduler)
+        except Exception as e:
+            logger.error(f"[{worker_id}] 샤드 {job['id']} 실패: {str(e)}", exc_info=True)
+            queue.fail(job['id'], worker_id, f"{type(e).__name__}: {str(e)}")
+        else:
+            queue.complete(job['id'], worker_id, result)
+            logger.info(f"[{worker_id}] 샤드 {job['id']} 완료: {result}")
+        finally:
+            stop.set()
+            beat.join()
+        processed += 1
+
+def wait_for_run(queue: JobQueue, run_id: str, poll: float = 10.0, timeout: Optional[float] = None) -> Dict[str, int]:
+    """모든 샤드가 완료·실패할 때까지 대기"""
+    deadline = time.monotonic() + timeout if timeout else None
+    while True:
+        counts = queue.stats(run_id)
+        if counts['pending'] == 0 and counts['running'] == 0:
+            return counts
+        if deadline and time.monotonic() > deadline:
+            raise TimeoutError(f"[{run_id}] 샤드 대기 시간 초과: {counts}")
+        time.sleep(poll)
+
+def reduce(
+    queue: JobQueue,
+    store: str,
+    run_id: str,
+    wait: bool = True,
+    poll: float = 10.0,
+    timeout: Optional[float] = None
+) -> Tuple[Dict, Dict, Dict]:
+    """
+    샤드 결과 취합 후 앙상블·평가·리포트 실행
+    실패한 샤드의 그룹은 이 프로세스에서 다시 계산
+    """
+    from modeling.run_phase2 import run_pipeline
+    jobs = queue.jobs(run_id)
+    if not jobs:
+        raise ValueError(f"등록된 샤드 없음: {run_id}")
+    if wait:
+        wait_for_run(queue, run_id, poll, timeout)
+        jobs = queue.jobs(run_id)
+
+    failed = [job for job in jobs if job['status'] == 'failed']
+    missing = [group for job in jobs if job['status'] == 'done' for group in (job['result'] or {}).get('missing', [])]
+    if failed:
+        logger.warning(f"[{run_id}] 실패 샤드 {len(failed)}개 - 해당 그룹은 reduce에서 재계산: {[job['id'] for job in failed]}")
+    if missing:
+        logger.warning(f"[{run_id}] 워커에서 산출물 없는 그룹: {missing}")
+
+    payload = jobs[0]['payload']
+    cleaned_df = DiskCache(store).get(payload['source'])
+    if cleaned_df is None:
+        raise FileNotFoundError(f"저장소에 입력 데이터 없음: {payload['source'][:12]}")
+    return run_pipeline({'cleaned': cleaned_df}, payload['arima_method'], cache_dir=store)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='샤드 단위 분산 실행')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    for name in ('submit', 'worker', 'reduce', 'status'):
+        cmd = sub.add_parser(name)
+        cmd.add_argument('--queue', required=True, help='sqlite:///경로.db, file:///디렉터리, redis://호스트')
+        if name != 'status':
+            cmd.add_argument('--store', required=True, help='공유 산출물 저장소 디렉터리')
+        if name in ('reduce', 'status'):
+            cmd.add_argument('--run', required=True, help='submit이 출력한 실행 ID')
+
+    sub.choices['submit'].add_argument('--input', default='processed/cleaned_data.csv', help='Phase 1 정제 데이터 CSV')
+    sub.choices['submit'].add_argument('--shard-size', type=int, default=SHARD_SIZE, help='샤드당 그룹 수')
+    sub.choices['submit'].add_argument('--arima-method', default='fourier', choices=('fourier', 'sarima'))
+    sub.choices['worker'].add_argument('--run', help='특정 실행의 샤드만 처리')
+    sub.choices['worker'].add_argument('--lease', type=float, default=DEFAULT_LEASE, help='작업 임대 시간(초)')
+    sub.choices['worker'].add_argument('--poll', type=float, default=5.0, help='대기 작업 확인 간격(초)')
+    sub.choices['worker'].add_argument('--exit-when-idle', action='store_true', help='남은 작업이 없으면 종료')
+    sub.choices['worker'].add_argument('--max-workers', type=int, help='호스트 내 예측 프로세스 수 (기본: 코어 수)')
+    sub.choices['worker'].add_argument('--fit-timeout', type=float, help='그룹 예측 시간 제한(초)')
+    sub.choices['reduce'].add_argument('--no-wait', action='store_true', help='남은 샤드를 기다리지 않음')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    queue = open_queue(args.queue)
+    if args.command == 'submit':
+        print(submit(pd.read_csv(args.input), queue, args.store, args.shard_size, args.arima_method))
+    elif args.command == 'worker':
+        scheduler = ForecastScheduler('forecast', max_workers=args.max_workers, timeout=args.fit_timeout)
+        count = worker(
+            queue, args.store, run_id=args.run, lease=args.lease, poll=args.poll,
+            exit_when_idle=args.exit_when_idle, scheduler=scheduler
+        )
+        print(f"처리한 샤드: {count}")
+    elif args.command == 'reduce':
+        _, _, results = reduce(queue, args.store, args.run, wait=not args.no_wait)
+        print(f"평가 완료: {len(results)}개 그룹")
+    else:
+        counts = queue.stats(args.run)
+        print(' '.join(f'{status}={count}' for status, count in counts.items()))
+        for job in queue.jobs(args.run):
+            if job['status'] == 'failed':
+                print(f"  {job['id']}: {job['error']}")
+        return 1 if counts['failed'] else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
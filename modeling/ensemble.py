@@ -0,0 +1,103 @@
+# modeling/ensemble.py
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional
+import logging
+from modeling.backtest import run_backtest, stack_backtests
+logger = logging.getLogger(__name__)
+
+def project_simplex(v: np.ndarray) -> np.ndarray:
+    """행 단위 확률 단체(simplex) 사영 (w ≥ 0, Σw = 1)"""
+    n = v.shape[-1]
+    u = -np.sort(-v, axis=-1)
+    css = np.cumsum(u, axis=-1) - 1
+    idx = np.arange(1, n + 1)
+    rho = (u - css / idx > 0).sum(axis=-1, keepdims=True)
+    theta = np.take_along_axis(css, rho - 1, axis=-1) / rho
+    return np.maximum(v - theta, 0)
+
+def optimize_weights(
+    preds: np.ndarray,
+    actual: np.ndarray,
+    pooled: bool = False,
+    n_iter: int = 2000,
+    tol: float = 1e-10
+) -> np.ndarray:
+    """
+    비음수·합 1 제약 앙상블 가중치 (전체 그룹 동시 사영 경사하강)
+    Args:
+        preds: (모델 × 그룹 × ...) 예측 배열
+        actual: (그룹 × ...) 실측 배열
+        pooled: True면 전체 그룹 공통 가중치
+    Returns:
+        (그룹 × 모델) 가중치
+    """
+    M, G = preds.shape[:2]
+    P = np.nan_to_num(preds.reshape(M, G, -1))
+    y = np.nan_to_num(actual.reshape(G, -1))
+    mask = ~np.isnan(actual.reshape(G, -1))
+    P = P * mask[None]
+
+    # 그룹별 정규방정식 행렬 (G × M × M), (G × M)
+    A = np.einsum('mgn,kgn->gmk', P, P)
+    b = np.einsum('mgn,gn->gm', P, y)
+    if pooled:
+        A = A.sum(axis=0, keepdims=True)
+        b = b.sum(axis=0, keepdims=True)
+
+    # 그룹별 스텝 크기 (최대 고유값 역수)
+    lipschitz = np.linalg.eigvalsh(A)[:, -1]
+    step = np.where(lipschitz > 0, 1.0 / np.maximum(lipschitz, 1e-12), 0.0)[:, None]
+
+    # FISTA (가속 사영 경사하강)
+    w = np.full(b.shape, 1.0 / M)
+    z, t = w.copy(), 1.0
+    for _ in range(n_iter):
+        grad = np.einsum('gmk,gk->gm', A, z) - b
+        w_new = project_simplex(z - step * grad)
+        t_new = (1 + np.sqrt(1 + 4 * t * t)) / 2
+        z = w_new + ((t - 1) / t_new) * (w_new - w)
+        converged = np.max(np.abs(w_new - w)) < tol
+        w, t = w_new, t_new
+        if converged:
+            break
+    return np.repeat(w, G, axis=0) if pooled else w
+
+def arima_backtest(
+    frames: Dict[str, pd.DataFrame],
+    reference_folds: Dict[str, pd.DataFrame],
+    order_meta: Dict[str, Dict[str, Any]],
+    max_workers: Optional[int] = None,
+    cache_dir: Optional[str] = None
+) -> Dict[str, pd.DataFrame]:
+    """
+    기준 fold(Prophet 교차 검증)와 같은 cutoff·평가일에서 ARIMA 예측 생성
+    저장된 차수로 cutoff별 1회만 재추정 (차수 탐색 없음)
+    cache_dir: fold 예측 캐시 경로 (None이면 캐시 미사용)
+    """
+    styles = [style for style in reference_folds if style in frames and style in order_meta]
+    if not styles:
+        return {}
+    horizon = max(int(reference_folds[style].groupby('cutoff').size().max()) for style in styles)
+    folds = run_backtest(
+        {style: frames[style] for style in styles},
+        forecasters=('arima',),
+        horizon=horizon,
+        cutoffs={style: reference_folds[style]['cutoff'].unique() for style in styles},
+        group_params={'arima': {style: order_meta[style] for style in styles}},
+        max_workers=max_workers,
+        cache_dir=cache_dir
+    )
+    return folds.get('arima', {})
+
+def fit_ensemble_weights(
+    member_folds: Dict[str, Dict[str, pd.DataFrame]],
+    pooled: bool = False
+) -> Dict[str, Dict[str, float]]:
+    """백테스트 예측 기반 그룹별 앙상블 가중치 {그룹명: {모델명: 가중치}}"""
+    groups, members, preds, actual = stack_backtests(member_folds)
+    weights = optimize_weights(preds['yhat'], actual, pooled=pooled)
+    return {
+        group: {member: float(weights[g, m]) for m, member in enumerate(members)}
+        for g, group in enumerate(groups)
+    }
@@ -1,14 +1,15 @@
 # modeling/evaluator.py
 
-from scipy.stats import linregress
-from sklearn.metrics import mean_squared_error, r2_score
 import numpy as np
 import pandas as pd
-from sklearn.model_selection import TimeSeriesSplit
+from typing import Dict, Optional, Sequence, Tuple, Union
 import logging
 logger = logging.getLogger(__name__)
 
+Axis = Union[int, Sequence[int]]
+
 def cross_validate(model, X, y):
+    from sklearn.model_selection import TimeSeriesSplit
     tscv = TimeSeriesSplit(n_splits=5)
     scores = []
     for train_idx, test_idx in tscv.split(X):
@@ -20,15 +21,107 @@ def cross_validate(model, X, y):
 
 
 
+def _nanmean(values: np.ndarray, axis: Axis) -> np.ndarray:
+    """경고 없는 NaN 평균 (유효값 없으면 NaN)"""
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=axis)
+    total = np.where(valid, values, 0.0).sum(axis=axis)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(count > 0, total / np.maximum(count, 1), np.nan)
+
+def compute_metrics(
+    actual: np.ndarray,
+    forecast: np.ndarray,
+    lower: Optional[np.ndarray] = None,
+    upper: Optional[np.ndarray] = None,
+    insample: Optional[np.ndarray] = None,
+    season: int = 1,
+    axis: Axis = -1
+) -> Dict[str, np.ndarray]:
+    """
+    배치 예측 지표 계산 (그룹 × cutoff × horizon 등 임의 차원, NaN 무시)
+    Args:
+        actual, forecast: 동일 형태 배열
+        lower, upper: 예측 구간 (coverage 계산)
+        insample: 학습 구간 배열 (그룹 × 시점, MASE 척도 계산)
+        season: MASE 기준 계절 차분 간격
+        axis: 축약 축 (예: -1 → horizon별 평균, (1, 2) → 그룹별 평균)
+    Returns:
+        {'rmse', 'mape', 'smape', 'mase', 'r2', 'bias', 'coverage'} - 축약된 배열
+    """
+    actual = np.asarray(actual, dtype=float)
+    forecast = np.asarray(forecast, dtype=float)
+    error = forecast - actual
+    actual = np.where(np.isnan(error), np.nan, actual)  # 예측·실측 모두 있는 칸만 평가
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ape = np.where(actual != 0, np.abs(error / actual), np.nan)
+        denom = np.abs(actual) + np.abs(forecast)
+        sape = np.where(denom != 0, 2 * np.abs(error) / denom, np.nan)
+        
+        mean_actual = _nanmean(actual, axis)
+        centered = actual - np.expand_dims(mean_actual, axis)
+        sse = np.nansum(error ** 2, axis=axis)
+        sst = np.nansum(centered ** 2, axis=axis)
+        n_valid = np.sum(~np.isnan(error), axis=axis)
+        metrics = {
+            'rmse': np.sqrt(_nanmean(error ** 2, axis)),
+            'mape': _nanmean(ape, axis) * 100,
+            'smape': _nanmean(sape, axis) * 100,
+            # 실측 분산 0: sklearn r2_score(force_finite=True)와 같이 완전 일치 1.0, 그 외 0.0
+            'r2': np.where(n_valid == 0, np.nan, np.where(sst > 0, 1 - sse / np.where(sst > 0, sst, 1), np.where(sse == 0, 1.0, 0.0))),
+            'bias': _nanmean(error, axis),
+            'mase': np.full(np.shape(sse), np.nan),
+            'coverage': np.full(np.shape(sse), np.nan)
+        }
+        
+        # MASE: 학습 구간 계절 나이브 오차로 정규화 (첫 축 = 그룹)
+        if insample is not None:
+            insample = np.asarray(insample, dtype=float)
+            scale = _nanmean(np.abs(insample[..., season:] - insample[..., :-season]), -1)
+            mae = _nanmean(np.abs(error), axis)
+            scale = scale.reshape(scale.shape + (1,) * (mae.ndim - scale.ndim))
+            metrics['mase'] = np.where(scale > 0, mae / np.where(scale > 0, scale, 1), np.nan)
+        
+        # 예측 구간 포함률
+        if lower is not None and upper is not None:
+            inside = ((actual >= lower) & (actual <= upper)).astype(float)
+            inside[np.isnan(actual)] = np.nan
+            metrics['coverage'] = _nanmean(inside, axis)
+    return metrics
+
+def batch_linregress(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    행 단위 단순 선형 회귀 (x = 0..T-1, NaN 무시, 폐형식)
+    Returns:
+        (기울기, 절편, 상관계수) - 각 행별 배열
+    """
+    values = np.asarray(values, dtype=float)
+    x = np.arange(values.shape[-1], dtype=float)
+    valid = ~np.isnan(values)
+    n = valid.sum(axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_mean = np.where(valid, x, 0).sum(axis=-1) / n
+        y_mean = np.where(valid, values, 0).sum(axis=-1) / n
+        dx = np.where(valid, x - x_mean[..., None], 0)
+        dy = np.where(valid, values - y_mean[..., None], 0)
+        sxx, syy, sxy = (dx * dx).sum(-1), (dy * dy).sum(-1), (dx * dy).sum(-1)
+        slope = sxy / sxx
+        r_value = np.where(syy > 0, sxy / np.sqrt(sxx * syy), 0.0)
+    return slope, y_mean - slope * x_mean, r_value
+
+def batch_trend_index(values: np.ndarray) -> np.ndarray:
+    """행 단위 트렌드 지수 (기울기 × 상관계수, 폐형식)"""
+    slope, _, r_value = batch_linregress(values)
+    return slope * r_value
+
 def calculate_r2(actual: pd.Series, predicted: pd.Series) -> float:
     """R² 계산"""
-    return r2_score(actual, predicted)
+    return float(compute_metrics(np.asarray(actual), np.asarray(predicted))['r2'])
 
 def calculate_trend_index(series: pd.Series) -> float:
     """선형 회귀를 사용한 트렌드 지수 계산"""
-    x = range(len(series))
-    slope, _, r_value, _, _ = linregress(x, series)
-    return slope * r_value
+    return float(batch_trend_index(np.asarray(series, dtype=float)))
 
 def determine_trend_direction(trend_index: float) -> str:
     """트렌드 방향 결정"""
@@ -41,7 +134,7 @@ def determine_trend_direction(trend_index: float) -> str:
 
 def calculate_rmse(actual: pd.Series, predicted: pd.Series) -> float:
     """RMSE 계산"""
-    return np.sqrt(mean_squared_error(actual, predicted))
+    return float(compute_metrics(np.asarray(actual), np.asarray(predicted))['rmse'])
 
 def calculate_mape(actual: pd.Series, predicted: pd.Series) -> float:
     """NaN 방지 MAPE 계산"""
@@ -92,44 +185,44 @@ def evaluate_forecasts(decomposed: dict, forecasts: dict) -> dict:
             f"예측 구조: {available['예측 구조']}"
         )
     
-    for style in common_styles:
-        actual = decomposed[style]['trend'][-26:]  # 마지막 26주 (테스트 데이터)
-        predicted = forecasts[style]['prophet']['yhat'][:26] # 예측 데이터
-        
-        # 데이터 길이 일치화 (최소 길이 기준)
-        min_len = min(len(actual), len(predicted))
-        actual = actual[-min_len:].reset_index(drop=True)  # 인덱스 재설정
-        predicted = pd.Series(predicted[:min_len], name='yhat').reset_index(drop=True)
-        
-        # 트렌드 지수 및 방향 계산
-        trend_index = calculate_trend_index(actual)
-        trend_direction = determine_trend_direction(trend_index)
-        
-        # 성능 평가 지표 계산
-        rmse = calculate_rmse(actual, predicted)
-        mape = calculate_mape(actual, predicted)
-        r2 = calculate_r2(actual, predicted)
-        
+    # 4. 그룹 × 26주 배열 정렬 (길이 부족분은 NaN)
+    styles = sorted(common_styles)
+    horizon = 26
+    actual = np.full((len(styles), horizon), np.nan)
+    predicted = np.full((len(styles), horizon), np.nan)
+    ensemble = np.full((len(styles), horizon), np.nan)
+    ensemble_actual = np.full((len(styles), horizon), np.nan)
+    for g, style in enumerate(styles):
+        trend = np.asarray(decomposed[style]['trend'][-horizon:], dtype=float)
+        # yhat은 학습 구간 적합값 + 예측 구간 → 마지막 horizon개가 검증(holdout) 주간과 일치
+        yhat = np.asarray(forecasts[style]['prophet']['yhat'][-horizon:], dtype=float)
+        min_len = min(len(trend), len(yhat))
+        actual[g, :min_len] = trend[-min_len:]
+        predicted[g, :min_len] = yhat[-min_len:]
+        if 'ensemble' in forecasts[style]:
+            ens = np.asarray(forecasts[style]['ensemble'], dtype=float)
+            ens_len = min(len(trend), len(ens))
+            ensemble[g, :ens_len] = ens[:ens_len]
+            ensemble_actual[g, :ens_len] = trend[-ens_len:]
+    
+    # 5. 배치 지표 계산
+    trend_index = batch_trend_index(actual)
+    metrics = compute_metrics(actual, predicted)
+    ensemble_valid = ~np.isnan(ensemble).all(axis=1)
+    ensemble_r2 = compute_metrics(ensemble_actual, ensemble)['r2']
+    
+    for g, style in enumerate(styles):
         results[style] = {
-            'trend_index': trend_index,
-            'trend_direction': trend_direction,
-            'rmse': rmse,
-            'mape': mape,
-            'r2': r2
+            'trend_index': float(trend_index[g]),
+            'trend_direction': determine_trend_direction(trend_index[g]),
+            'rmse': float(metrics['rmse'][g]),
+            'mape': float(metrics['mape'][g]),
+            'r2': float(metrics['r2'][g])
         }
         
         # 앙상블 평가 추가
-        if 'ensemble' in forecasts[style]:
-            ensemble_actual = decomposed[style]['trend'][-26:]
-            ensemble_pred = forecasts[style]['ensemble']
-            
-            # 데이터 길이 일치화
-            min_len = min(len(ensemble_actual), len(ensemble_pred))
-            ensemble_actual = ensemble_actual[-min_len:].reset_index(drop=True)
-            ensemble_pred = pd.Series(ensemble_pred[:min_len]).reset_index(drop=True)
-            
-            ensemble_r2 = calculate_r2(ensemble_actual, ensemble_pred)
-            results[style]['ensemble_r2'] = ensemble_r2  # 새로운 키 추가
+        if ensemble_valid[g]:
+            results[style]['ensemble_r2'] = float(ensemble_r2[g])  # 새로운 키 추가
     
     return results
 
@@ -1,16 +1,35 @@
 # modeling/forecast_visualizer.py
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import os
-from typing import Dict
-from matplotlib.dates import DateFormatter, MonthLocator
-from IPython.display import HTML
-from matplotlib.animation import FuncAnimation
-from mpl_toolkits.mplot3d import Axes3D
+import json
+import logging
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from modeling.scheduler import run_longest_first
+from modeling.cache_utils import fingerprint
+logger = logging.getLogger(__name__)
+
+# matplotlib·Pillow는 렌더링 함수에서만 임포트 (모듈 임포트 비용 최소화)
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+REPORT_DIR = 'modeling/reports'
+MANIFEST_FILE = 'render_manifest.json'
+RENDER_VERSION = 2  # 그림 구성 변경 시 증가 (전체 재생성)
+
+# 시각화 설정 (지문에 포함되어 변경 시 재생성)
+PLOT_SETTINGS = {
+    'style': 'seaborn-v0_8-darkgrid',
+    'dpi': 300,
+    'animation_dpi': 100,
+    'animation_interval': 100,
+    'animation_stride': 1
+}
 
 def _validate_inputs(decomposed: dict, forecasts: dict) -> None:
     """입력 데이터 검증"""
-    if not isinstance(decomposed, dict) or not isinstance(forecasts, dict):
+    if not isinstance(decomposed, Mapping) or not isinstance(forecasts, Mapping):
         raise TypeError("decomposed와 forecasts는 딕셔너리 형태여야 합니다.")
         
     common_styles = set(decomposed.keys()) & set(forecasts.keys())
@@ -25,22 +44,23 @@ def _prepare_forecast_dates(last_date: pd.Timestamp, periods: int) -> pd.Datetim
         freq='W'
     )
 
-def _create_standard_plots(style: str, decomposed: dict, forecast: pd.DataFrame) -> plt.Figure:
+def _create_standard_plots(style: str, decomposed: dict, forecast: pd.DataFrame) -> 'Figure':
     """4분할 기본 시각화"""
+    import matplotlib.pyplot as plt
     fig, axes = plt.subplots(4, 1, figsize=(16, 14))
     fig.suptitle(f'{style} 트렌드 분석 리포트', y=1.02, fontsize=16)
     
     # 1. 관측치 vs 트렌드
-    axes[0].plot(decomposed['date'], decomposed['observed'], label='Observed', color='royalblue')
+    axes[0].plot(decomposed['observed'], label='Observed', color='royalblue')
     axes[0].plot(decomposed['trend'], label='Trend', color='crimson')
     axes[0].set_title('원본 데이터 및 추세')
     axes[0].legend()
     
     # 2. 트렌드 + 예측
     axes[1].plot(decomposed['trend'], label='Historical Trend', color='crimson')
-    axes[1].plot(forecast['date'], forecast['yhat'], '--', label='Forecast', color='darkorange')
+    axes[1].plot(forecast['ds'], forecast['yhat'], '--', label='Forecast', color='darkorange')
     if 'yhat_lower' in forecast and 'yhat_upper' in forecast:
-        axes[1].fill_between(forecast['date'], forecast['yhat_lower'], forecast['yhat_upper'], 
+        axes[1].fill_between(forecast['ds'], forecast['yhat_lower'], forecast['yhat_upper'], 
                            color='orange', alpha=0.2, label='신뢰구간')
     axes[1].set_title('추세 및 예측')
     axes[1].legend()
@@ -56,35 +76,151 @@ def _create_standard_plots(style: str, decomposed: dict, forecast: pd.DataFrame)
     
     return fig
 
-def plot_forecasts(decomposed: dict, forecasts: dict, confidence: bool = True):
-    """고도화된 시계열 시각화"""
-    plt.style.use('seaborn-darkgrid')
+def _forecast_frame(observed: pd.Series, forecast: Any) -> pd.DataFrame:
+    """
+    예측 결과를 ds/yhat/[yhat_lower/yhat_upper] 예측 구간 DataFrame으로 정규화
+    파이프라인 예측은 마지막 26주를 제외하고 학습하므로 예측 구간 = 학습 종료 이후 (검증 구간),
+    학습 데이터가 없으면 관측 종료 이후
+    """
+    if isinstance(forecast, Mapping) and 'prophet' in forecast:
+        prophet = forecast['prophet']
+        frame = prophet['forecast_details'].copy()
+        frame['yhat'] = np.asarray(prophet['yhat'], dtype=float)
+        train = forecast.get('train_data')
+        start = train['date'].iloc[-1] if train is not None and len(train) else observed.index[-1]
+        frame = frame[frame['ds'] > start].reset_index(drop=True)
+        if frame.empty:
+            raise ValueError(f"예측 구간 없음 (예측 종료 {prophet['forecast_details']['ds'].max()}, 기준 {start})")
+        return frame
+    
+    frame = pd.DataFrame(forecast).copy()
+    if 'ds' not in frame:
+        frame['ds'] = _prepare_forecast_dates(observed.index[-1], len(frame))  # 날짜 정보 강제 적용
+    return frame.reset_index(drop=True)
+
+def _artifact_fingerprints(style: str, series: Dict[str, pd.Series], forecast: pd.DataFrame) -> Dict[str, str]:
+    """산출물별 입력 시리즈·설정 지문 (산출물이 사용하는 입력만 포함)"""
+    settings = {'version': RENDER_VERSION, **PLOT_SETTINGS}
+    return {
+        f'{style}_analysis.png': fingerprint('analysis', style, series, forecast, settings),
+        f'{style}_3d_trend.png': fingerprint('3d', style, series['trend'], series['seasonal'], settings),
+        f'{style}_animation.gif': fingerprint('animation', style, series['trend'], forecast, settings),
+        f'{style}_report.html': fingerprint('html', style, settings)
+    }
+
+def _load_manifest(report_dir: str) -> Dict[str, str]:
+    path = os.path.join(report_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_manifest(report_dir: str, manifest: Dict[str, str]) -> None:
+    tmp_path = os.path.join(report_dir, f'.{MANIFEST_FILE}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp_path, os.path.join(report_dir, MANIFEST_FILE))
+
+def _render_style(task: Dict[str, Any]) -> Dict[str, str]:
+    """그룹 단위 산출물 렌더링 (프로세스 풀 워커, Agg 백엔드), 생성된 파일의 지문 반환"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    if PLOT_SETTINGS['style'] in plt.style.available:
+        plt.style.use(PLOT_SETTINGS['style'])
+    
+    style, series, forecast = task['style'], task['series'], task['forecast']
+    report_dir = task['report_dir']
+    rendered = {}
+    for name in task['artifacts']:
+        path = os.path.join(report_dir, name)
+        try:
+            if name.endswith('_analysis.png'):
+                fig = _create_standard_plots(style, series, forecast)
+                fig.tight_layout()
+                fig.savefig(path, bbox_inches='tight', dpi=PLOT_SETTINGS['dpi'])
+                plt.close(fig)
+            elif name.endswith('_3d_trend.png'):
+                plot_3d_trend(style, series, report_dir)
+            elif name.endswith('_animation.gif'):
+                create_trend_animation(style, series, forecast, report_dir)
+            elif name.endswith('_report.html'):
+                generate_html_report(style, report_dir)
+            rendered[name] = task['fingerprints'][name]
+        except Exception as e:
+            logger.error(f"{style} {name} 생성 실패: {str(e)}")
+            plt.close('all')
+    return rendered
+
+def plot_forecasts(
+    decomposed: dict,
+    forecasts: dict,
+    confidence: bool = True,
+    report_dir: str = REPORT_DIR,
+    max_workers: Optional[int] = None,
+    force: bool = False,
+    report_mode: str = 'image'
+) -> Dict[str, List[str]]:
+    """
+    고도화된 시계열 시각화 (그룹별 프로세스 병렬 렌더링)
+    입력 시리즈·설정 지문이 기존 산출물과 같으면 해당 파일은 건너뜀 (force=True면 전체 재생성)
+    report_mode: 'image'(PNG/GIF 렌더링) / 'data'(데이터 파일 + 브라우저 렌더링 템플릿, report_data 참고)
+    Returns:
+        {그룹명: 새로 생성된 파일 목록}
+    """
     _validate_inputs(decomposed, forecasts)
+    if report_mode == 'data':
+        from modeling.report_data import write_report_data
+        report = write_report_data(decomposed, forecasts, report_dir=report_dir, force=force)
+        return {style: [os.path.basename(report['path'])] for style in report['written']}
+    if report_mode != 'image':
+        raise ValueError(f"지원하지 않는 리포트 방식: {report_mode}")
+    os.makedirs(report_dir, exist_ok=True)
+    manifest = {} if force else _load_manifest(report_dir)
     
-    for style in set(decomposed.keys()) & set(forecasts.keys()):
-        # 데이터 추출
-        observed = decomposed[style]['observed']
-        forecast = forecasts[style]
-        
-        # 날짜 생성
-        forecast_dates = _prepare_forecast_dates(observed.index[-1], len(forecast))
-        forecast['ds'] = forecast_dates  # 날짜 정보 강제 적용
+    # 1. 그룹별 렌더링 작업 구성 (변경된 산출물만)
+    tasks, costs = {}, {}
+    skipped = 0
+    for style in sorted(set(decomposed.keys()) & set(forecasts.keys())):
+        series = {key: decomposed[style][key] for key in ('observed', 'trend', 'seasonal', 'resid')}
+        forecast = _forecast_frame(series['observed'], forecasts[style])
+        if not confidence:
+            forecast = forecast.drop(columns=['yhat_lower', 'yhat_upper'], errors='ignore')
         
-        # 기본 플롯 생성
-        fig = _create_standard_plots(style, decomposed[style], forecast)
-        
-        # 리포트 저장
-        os.makedirs('modeling/reports', exist_ok=True)
-        plt.tight_layout()
-        plt.savefig(f'modeling/reports/{style}_analysis.png', bbox_inches='tight', dpi=300)
-        plt.close()
-        
-        # 추가 리포트 생성
-        generate_html_report(style)
-        create_trend_animation(style, decomposed[style], forecast)
-        plot_3d_trend(style, decomposed[style])
+        fingerprints = _artifact_fingerprints(style, series, forecast)
+        artifacts = [
+            name for name, fp in fingerprints.items()
+            if manifest.get(name) != fp or not os.path.exists(os.path.join(report_dir, name))
+        ]
+        skipped += len(fingerprints) - len(artifacts)
+        if not artifacts:
+            continue
+        tasks[style] = {
+            'style': style,
+            'series': series,
+            'forecast': forecast,
+            'artifacts': artifacts,
+            'fingerprints': fingerprints,
+            'report_dir': report_dir
+        }
+        costs[style] = len(series['trend']) * len(artifacts)
+    logger.info(f"리포트 렌더링: {len(tasks)}개 그룹 실행, 변경 없는 산출물 {skipped}개 생략")
+    
+    # 2. 병렬 렌더링 및 지문 기록
+    rendered = {}
+    for style, result, error in run_longest_first(_render_style, tasks, costs, max_workers):
+        if error is not None or not result:
+            continue
+        manifest.update(result)
+        rendered[style] = sorted(result)
+    if rendered:
+        _save_manifest(report_dir, manifest)
+    return rendered
 
-def generate_html_report(style: str):
+def generate_html_report(style: str, report_dir: str = REPORT_DIR):
     """대시보드용 HTML 리포트 생성"""
     html_content = f"""
     <!DOCTYPE html>
@@ -105,30 +241,115 @@ def generate_html_report(style: str):
     </body>
     </html>
     """
-    with open(f'modeling/reports/{style}_report.html', 'w') as f:
+    with open(os.path.join(report_dir, f'{style}_report.html'), 'w', encoding='utf-8') as f:
         f.write(html_content)
 
-def create_trend_animation(style: str, decomposed: dict, forecast: pd.DataFrame):
-    """시간 경과 애니메이션 생성"""
-    fig, ax = plt.subplots(figsize=(12, 6))
-    
-    def animate(i):
-        ax.clear()
-        ax.plot(decomposed['trend'].iloc[:i], label='Historical Trend')
-        if i > len(decomposed['trend']):
-            offset = i - len(decomposed['trend'])
-            ax.plot(forecast['ds'].iloc[:offset], forecast['yhat'].iloc[:offset], 
-                   '--', label='Forecast')
-        ax.set_title(f'{style} 트렌드 변화 ({i}주)')
-        ax.legend()
-    
-    ani = FuncAnimation(fig, animate, frames=range(len(decomposed['trend']) + len(forecast)), 
-                       interval=100)
-    ani.save(f'modeling/reports/{style}_animation.gif', writer='imagemagick', dpi=100)
-    plt.close()
-
-def plot_3d_trend(style: str, decomposed: dict):
+def _animation_frame_ends(n_total: int, stride: int) -> List[int]:
+    """프레임별 표시 데이터 개수 (마지막 프레임은 전체 포함)"""
+    ends = list(range(stride, n_total + 1, stride))
+    if not ends or ends[-1] != n_total:
+        ends.append(n_total)
+    return ends
+
+def create_trend_animation(
+    style: str,
+    decomposed: dict,
+    forecast: pd.DataFrame,
+    report_dir: str = REPORT_DIR,
+    frame_stride: Optional[int] = None
+):
+    """
+    시간 경과 애니메이션 생성
+    축·범례를 한 번만 그린 뒤 프레임마다 새로 추가된 선분만 blit으로 누적해
+    생성 시간이 시계열 길이에 선형으로 증가 (Pillow로 프로세스 내 GIF 저장)
+    frame_stride: 프레임당 추가할 시점 수 (기본 PLOT_SETTINGS['animation_stride'])
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.dates import date2num
+    from matplotlib.transforms import Bbox
+    from PIL import Image
+    stride = max(1, int(frame_stride or PLOT_SETTINGS['animation_stride']))
+    trend = decomposed['trend']
+    hist_x, hist_y = date2num(trend.index), trend.to_numpy(dtype=float)
+    fc_x = date2num(pd.DatetimeIndex(forecast['ds']))
+    fc_y = forecast['yhat'].to_numpy(dtype=float)
+    n_hist = len(hist_x)
+    
+    # 1. 고정 요소 (축 범위·범례) 1회 렌더링
+    fig, ax = plt.subplots(figsize=(12, 6), dpi=PLOT_SETTINGS['animation_dpi'])
+    all_x, all_y = np.concatenate([hist_x, fc_x]), np.concatenate([hist_y, fc_y])
+    y_min, y_max = np.nanmin(all_y), np.nanmax(all_y)
+    margin = (y_max - y_min) * 0.05 or 1.0
+    ax.set_xlim(all_x.min(), all_x.max())
+    ax.set_ylim(y_min - margin, y_max + margin)
+    ax.xaxis_date()
+    hist_line, = ax.plot([], [], label='Historical Trend', color='C0', animated=True)
+    fc_line, = ax.plot([], [], '--', label='Forecast', color='C1', animated=True)
+    legend = ax.legend(loc='upper left')
+    legend.set_animated(True)
+    title = ax.set_title(' ')
+    title.set_animated(True)
+    fig.canvas.draw()
+    
+    canvas = fig.canvas
+    title_region = Bbox.from_extents(fig.bbox.x0, ax.bbox.y1, fig.bbox.x1, fig.bbox.y1)
+    title_background = canvas.copy_from_bbox(title_region)
+    width, height = canvas.get_width_height()
+    
+    def _grab() -> Image.Image:
+        return Image.frombuffer('RGBA', (width, height), bytes(canvas.buffer_rgba()), 'raw', 'RGBA', 0, 1).convert('RGB')
+    
+    # 전체 데이터를 그린 화면으로 공통 팔레트 1회 계산 (프레임별 색상 양자화 생략)
+    background = canvas.copy_from_bbox(fig.bbox)
+    hist_line.set_data(hist_x, hist_y)
+    fc_line.set_data(fc_x, fc_y)
+    title.set_text(f'{style} 트렌드 변화 ({n_hist + len(fc_x)}주)')
+    for artist in (hist_line, fc_line, title, legend):
+        ax.draw_artist(artist)
+    palette = _grab().quantize(colors=256, method=Image.Quantize.MEDIANCUT)
+    canvas.restore_region(background)
+    
+    def _draw_segment(line, x, y, start: int, stop: int) -> None:
+        """start~stop 구간 선분만 그리기 (이전 끝점과 연결)"""
+        if stop - start < 1:
+            return
+        lo = max(start - 1, 0)
+        line.set_data(x[lo:stop], y[lo:stop])
+        ax.draw_artist(line)
+    
+    def _frames():
+        drawn = 0
+        for end in _animation_frame_ends(n_hist + len(fc_x), stride):
+            # 2. 새 구간만 누적 렌더링
+            _draw_segment(hist_line, hist_x, hist_y, min(drawn, n_hist), min(end, n_hist))
+            _draw_segment(fc_line, fc_x, fc_y, max(drawn - n_hist, 0), max(end - n_hist, 0))
+            drawn = end
+            
+            # 3. 제목·범례 갱신 (제목 영역만 복원)
+            canvas.restore_region(title_background)
+            title.set_text(f'{style} 트렌드 변화 ({end}주)')
+            ax.draw_artist(title)
+            ax.draw_artist(legend)
+            yield _grab().quantize(palette=palette, dither=Image.Dither.NONE)
+    
+    frames = _frames()
+    try:
+        first = next(frames)
+        first.save(
+            os.path.join(report_dir, f'{style}_animation.gif'),
+            save_all=True,
+            append_images=frames,
+            duration=PLOT_SETTINGS['animation_interval'],
+            optimize=False,
+            loop=0
+        )
+    finally:
+        plt.close(fig)
+
+def plot_3d_trend(style: str, decomposed: dict, report_dir: str = REPORT_DIR):
     """3D 트렌드 시각화"""
+    import matplotlib.pyplot as plt
+    from mpl_toolkits.mplot3d import Axes3D  # noqa: F401 (3d projection 등록)
     fig = plt.figure(figsize=(14, 10))
     ax = fig.add_subplot(111, projection='3d')
     
@@ -143,5 +364,5 @@ def plot_3d_trend(style: str, decomposed: dict):
     ax.set_zlabel('Trend Value')
     ax.set_title(f'{style} 3D Trend Analysis')
     
-    plt.savefig(f'modeling/reports/{style}_3d_trend.png', bbox_inches='tight')
-    plt.close()
+    fig.savefig(os.path.join(report_dir, f'{style}_3d_trend.png'), bbox_inches='tight')
+    plt.close(fig)
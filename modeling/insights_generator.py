@@ -1,61 +1,89 @@
 # modeling/insights_generator.py
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.dates import DateFormatter
-from scipy.stats import linregress
 import os
-from typing import Dict, Any
-import seaborn as sns
+from typing import Dict, Any, List, Tuple
+from modeling.evaluator import batch_linregress
 
-def _calculate_trend_metrics(series: pd.Series) -> Dict[str, Any]:
-    """트렌드 메트릭 계산"""
-    x = np.arange(len(series))
-    slope, intercept, r_value, _, _ = linregress(x, series.values)
+def _stack_series(series_list: List[pd.Series]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    그룹별 시리즈를 (그룹 × 시점) 행렬로 정렬 (앞쪽 정렬, 남는 칸 NaN)
+    Returns:
+        (값 행렬, 월 행렬 (1~12, 날짜 없는 칸 0))
+    """
+    n_max = max((len(series) for series in series_list), default=0)
+    values = np.full((len(series_list), n_max), np.nan)
+    months = np.zeros((len(series_list), n_max), dtype=np.int64)
+    for g, series in enumerate(series_list):
+        values[g, :len(series)] = series.to_numpy(dtype=float)
+        index = series.index if isinstance(series.index, pd.DatetimeIndex) else pd.to_datetime(series.index)
+        months[g, :len(series)] = index.month
+    return values, months
+
+def _batch_trend_metrics(trends: np.ndarray) -> Dict[str, np.ndarray]:
+    """트렌드 메트릭 일괄 계산 (그룹별 폐형식 선형 회귀)"""
+    slope, intercept, r_value = batch_linregress(trends)
+    valid = ~np.isnan(trends)
+    last_idx = trends.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1)
     return {
         'growth_rate': slope * 100,  # 주간 성장률(%)
-        'r_squared': max(r_value**2, 0),  # 결정계수(R²)
-        'current_value': series.iloc[-1],
+        'r_squared': np.maximum(r_value ** 2, 0),  # 결정계수(R²)
+        'current_value': trends[np.arange(len(trends)), last_idx],
         'baseline': intercept
     }
 
+def _batch_seasonal_peaks(seasonal: np.ndarray, months: np.ndarray, n_peaks: int = 3) -> List[Dict[str, float]]:
+    """
+    계절성 피크 일괄 감지
+    (그룹, 월) 단일 인덱스로 월평균을 한 번에 집계하고 argpartition으로 상위 n_peaks개 선택
+    """
+    G = len(seasonal)
+    valid = ~np.isnan(seasonal) & (months > 0)
+    flat = (np.arange(G)[:, None] * 12 + months - 1)[valid]
+    sums = np.bincount(flat, weights=seasonal[valid], minlength=G * 12).reshape(G, 12)
+    counts = np.bincount(flat, minlength=G * 12).reshape(G, 12)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        monthly_avg = np.where(counts > 0, sums / counts, -np.inf)
+    
+    k = min(n_peaks, 12)
+    top = np.argpartition(-monthly_avg, k - 1, axis=1)[:, :k]
+    top_values = np.take_along_axis(monthly_avg, top, axis=1)
+    order = np.argsort(-top_values, axis=1, kind='stable')
+    top, top_values = np.take_along_axis(top, order, axis=1), np.take_along_axis(top_values, order, axis=1)
+    return [
+        {f"{month + 1}월": round(float(value), 3) for month, value in zip(top[g], top_values[g]) if np.isfinite(value)}
+        for g in range(G)
+    ]
+
+def _calculate_trend_metrics(series: pd.Series) -> Dict[str, Any]:
+    """트렌드 메트릭 계산 (단일 그룹)"""
+    metrics = _batch_trend_metrics(series.to_numpy(dtype=float)[None, :])
+    return {key: float(values[0]) for key, values in metrics.items()}
+
 def _detect_seasonal_peaks(seasonal: pd.Series, n_peaks: int = 3) -> Dict[str, float]:
-    """계절성 피크 감지 (인덱스 강제 변환 추가)"""
+    """계절성 피크 감지 (단일 그룹, 인덱스 강제 변환 포함)"""
     try:
-        # 인덱스 변환 보강
-        if not isinstance(seasonal.index, pd.DatetimeIndex):
-            seasonal = seasonal.copy()
-            seasonal.index = pd.to_datetime(seasonal.index)
-        
-        # 월별 그룹화 및 피크 검출
-        monthly_avg = (
-            seasonal
-            .groupby(seasonal.index.month)
-            .mean()
-            .sort_values(ascending=False)
-        )
-        
-        return {
-            f"{int(month)}월": round(monthly_avg[month], 3) 
-            for month in monthly_avg.index[:n_peaks]
-        }
+        values, months = _stack_series([seasonal])
+        return _batch_seasonal_peaks(values, months, n_peaks)[0]
     except Exception as e:
         print(f"계절성 분석 오류: {str(e)}")
         return {}
 
-def _compare_groups(metrics: Dict[str, Dict]) -> pd.DataFrame:
-    """그룹 간 비교 분석"""
-    return pd.DataFrame({
-        group: {
-            'growth_rate': data.get('growth_rate', 0),
-            'r_squared': data.get('r_squared', 0),
-            'current_value': data.get('current_value', 0)
-        }
-        for group, data in metrics.items()
-    }).T
-
-def generate_insights(decomposed: dict, forecasts: dict, results: dict) -> None:
-    """종합 인사이트 리포트 생성 (구조 검증 강화)"""
+def generate_insights(
+    decomposed: dict,
+    forecasts: dict,
+    results: dict,
+    mode: str = 'image',
+    page_size: int = 50,
+    top_n: int = 10
+) -> None:
+    """
+    종합 인사이트 리포트 생성 (구조 검증 강화)
+    mode: 'image'(비교 차트 PNG + HTML) / 'data'(데이터 파일 + 브라우저 렌더링 템플릿)
+    page_size: 리포트 페이지당 그룹 수, top_n: 요약 차트·표의 상위/하위 그룹 수
+    """
+    if mode not in ('image', 'data'):
+        raise ValueError(f"지원하지 않는 리포트 방식: {mode}")
     # 입력 데이터 구조 검증
     required_keys = ['trend', 'seasonal', 'resid']
     for group, data in decomposed.items():
@@ -64,114 +92,36 @@ def generate_insights(decomposed: dict, forecasts: dict, results: dict) -> None:
         if not isinstance(data['trend'], pd.Series):
             raise TypeError(f"{group} 트렌드 데이터가 Series가 아닙니다.")
     
-    # 트렌드 메트릭 계산 로직 개선
+    # 1. 트렌드·계절성 메트릭 일괄 계산 (그룹 × 시점 행렬)
+    groups = list(decomposed)
+    trends, _ = _stack_series([decomposed[group]['trend'] for group in groups])
+    seasonal, months = _stack_series([decomposed[group]['seasonal'] for group in groups])
+    batch = _batch_trend_metrics(trends)
+    peaks = _batch_seasonal_peaks(seasonal, months)
+    
     trend_metrics = {}
-    for group, data in decomposed.items():
+    for g, group in enumerate(groups):
         try:
-            # 트렌드 분석
-            trend_metrics[group] = _calculate_trend_metrics(data['trend'])
-            
-            # 계절성 피크 분석 (인덱스 보존)
-            seasonal_peaks = _detect_seasonal_peaks(data['seasonal'].copy())
-            
             # 예측 성장률 계산 (인덱스 정렬)
-            last_trend = data['trend'].iloc[-1]
             forecast_value = forecasts[group]['prophet']['yhat'][-1]
-            
-            trend_metrics[group].update({
-                'seasonal_peaks': seasonal_peaks,
-                'forecast_growth': forecast_value - last_trend,
-                'reliability': '높음' if results[group]['ensemble_r2'] > 0.5 else '주의 요망'  # 신뢰도 레이블
-            })
+            reliability = '높음' if results[group]['ensemble_r2'] > 0.5 else '주의 요망'  # 신뢰도 레이블
         except KeyError as e:
             print(f"{group} 데이터 키 누락: {str(e)}")
             continue
+        trend_metrics[group] = {key: float(values[g]) for key, values in batch.items()}
+        trend_metrics[group].update({
+            'seasonal_peaks': peaks[g],
+            'forecast_growth': forecast_value - trend_metrics[group]['current_value'],
+            'reliability': reliability
+        })
     
-    # 2. 그룹별 비교 분석
-    comparison_df = _compare_groups(trend_metrics)
-    
-    # 3. 시각화 생성
-    plt.style.use('seaborn-v0_8-darkgrid') 
-    fig, axes = plt.subplots(2, 1, figsize=(14, 10))
-    
-    # 성장률 비교 차트
-    comparison_df['growth_rate'].plot.bar(ax=axes[0], color='royalblue')
-    axes[0].set_title('Comparison of weekly search volume growth rates by group')
-    axes[0].set_ylabel('Growth rate (%)')
-
-    # 예측 정확도 산점도
-    
-    colors = []
-    sizes = []
-    for group in trend_metrics:
-        r2 = trend_metrics[group]['r_squared']
-        colors.append('green' if r2 > 0.5 else 'orange' if r2 > 0 else 'red')
-        sizes.append(abs(trend_metrics[group]['growth_rate'])*10)
-
-    axes[1].scatter(
-        comparison_df['growth_rate'], 
-        comparison_df['r_squared'],
-        s=sizes,
-        c=colors,  # 신뢰도에 따른 색상
-        alpha=0.6
-    )
-    axes[1].set_xlabel('Search volume growth rate (%)')
-    axes[1].set_ylabel('Prediction accuracy (R²)')
-    
-    plt.tight_layout()
-    os.makedirs('modeling/reports', exist_ok=True)
-    plt.savefig('modeling/reports/group_comparison.png', bbox_inches='tight')
-    plt.close()
-    
-    # 4. 리포트 생성
-    html_report = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>2025 라이프스타일 트렌드 리포트</title>
-        <style>
-            .section { margin: 30px 0; padding: 20px; border: 1px solid #eee; }
-            img { max-width: 100%; height: auto; }
-            .highlight { color: #e74c3c; font-weight: bold; }
-            .alert { background-color: #fdf5e6; padding: 15px; border-left: 5px solid #e74c3c; }
-        </style>
-    </head>
-    <body>
-        <h1>2025 라이프스타일 트렌드 인사이트</h1>
-        <div class="section">
-            <h2>실시간 검색 트렌드</h2>
-            <img src="./real_time_search_trends.png">
-            <p>각 그룹별 정규화된 검색 비율 추이 (2022-04 ~ 2025-04)</p>
-        </div>
-        <div class="section">
-            <h2>그룹별 비교 분석</h2>
-            <img src="./group_comparison.png">
-    """
-    
-    # 그룹별 상세 분석 추가
-    for group, metrics in trend_metrics.items():
-        html_report += f"""
-        <div class="section">
-            <h3>{group} 트렌드 분석</h3>
-            <ul>
-                <li>주간 성장률: <span class="highlight">{metrics['growth_rate']:.2f}%</span></li>
-                <li>계절성 피크: {', '.join([f'{k} ({v}%)' for k,v in metrics['seasonal_peaks'].items()])}</li>
-                <li>6개월 예측 성장: <span class="highlight">{metrics['forecast_growth']:.2f}%</span></li>
-                <li>모델 정확도 (R²): {metrics['r_squared']:.2f}</li>
-            </ul>
-        </div>
-        """
-    html_report += """
-    <div class="alert alert-warning mt-4">
-        <h4>※ 결과 해석 주의사항</h4>
-        <ul>
-            <li>R² 값이 음수인 경우: 기본 예측 모델(평균)보다 성능 낮음</li>
-            <li>트렌드 지수: 실제 관측치 기반 계산 (예측 신뢰도와 무관)</li>
-            <li>붉은색 표시: R² < 0 (모델 개선 필요)</li>
-        </ul>
-    </div>
-    """
-    html_report += "</body></html>"
+    # 데이터 리포트: 래스터 이미지 없이 시계열·지표만 기록
+    if mode == 'data':
+        from modeling.report_data import write_report_data
+        write_report_data(decomposed, forecasts, results=results, insights=trend_metrics)
+        return
     
-    with open('modeling/reports/trend_insights.html', 'w', encoding='utf-8') as f:
-        f.write(html_report)
+    # 2. 비교 요약 차트 (상위/하위 그룹) + 페이지 단위 HTML 리포트
+    from modeling.insights_report import plot_group_summary, write_insights_report
+    plot_group_summary(trend_metrics, top_n=top_n)
+    write_insights_report(trend_metrics, page_size=page_size, top_n=top_n)
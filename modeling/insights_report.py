@@ -0,0 +1,244 @@
+# modeling/insights_report.py
+import os
+import glob
+import html
+import numpy as np
+from typing import Any, Dict, Iterator, List, TextIO, Tuple
+import logging
+logger = logging.getLogger(__name__)
+
+REPORT_DIR = 'modeling/reports'
+REPORT_FILE = 'trend_insights.html'
+PAGE_DIR = 'insights'
+PAGE_SIZE = 50
+TOP_N = 10
+SCATTER_MAX_POINTS = 500  # 초과 시 산점도 대신 hexbin (렌더링 시간 고정)
+
+# 정렬 기준: {키: (제목, 정렬값 함수)} — 모두 내림차순
+SORT_KEYS = {
+    'growth': ('주간 성장률순', lambda m: m['growth_rate']),
+    'forecast': ('6개월 예측 성장순', lambda m: m['forecast_growth']),
+    'reliability': ('신뢰도순', lambda m: (m['reliability'] == '높음', m['r_squared'])),
+}
+
+HEAD = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="utf-8">
+    <title>{title}</title>
+    <style>
+        .section {{ margin: 30px 0; padding: 20px; border: 1px solid #eee; }}
+        img {{ max-width: 100%; height: auto; }}
+        .highlight {{ color: #e74c3c; font-weight: bold; }}
+        .alert {{ background-color: #fdf5e6; padding: 15px; border-left: 5px solid #e74c3c; }}
+        table {{ border-collapse: collapse; }}
+        th, td {{ padding: 4px 12px; border-bottom: 1px solid #eee; text-align: right; }}
+        th:nth-child(2), td:nth-child(2) {{ text-align: left; }}
+        .pager a, .pager span {{ margin-right: 8px; }}
+    </style>
+</head>
+<body>
+    <h1>{title}</h1>
+"""
+
+CAUTION = """    <div class="alert">
+        <h4>※ 결과 해석 주의사항</h4>
+        <ul>
+            <li>R² 값이 음수인 경우: 기본 예측 모델(평균)보다 성능 낮음</li>
+            <li>트렌드 지수: 실제 관측치 기반 계산 (예측 신뢰도와 무관)</li>
+            <li>붉은색 표시: R² &lt; 0 (모델 개선 필요)</li>
+        </ul>
+    </div>
+"""
+
+def _sort_order(trend_metrics: Dict[str, Dict], key: str) -> List[str]:
+    """정렬 기준별 그룹 순서 (내림차순, 동률은 그룹명순)"""
+    value = SORT_KEYS[key][1]
+    return sorted(trend_metrics, key=lambda group: (_negate(value(trend_metrics[group])), group))
+
+def _negate(value: Any) -> Any:
+    """내림차순 정렬용 부호 반전 (튜플은 원소별, NaN은 맨 뒤)"""
+    if isinstance(value, tuple):
+        return tuple(_negate(v) for v in value)
+    value = float(value)
+    return np.inf if np.isnan(value) else -value
+
+def _pages(items: List[str], page_size: int) -> Iterator[Tuple[int, List[str]]]:
+    """(페이지 번호(1부터), 항목) 순회"""
+    for start in range(0, len(items), page_size):
+        yield start // page_size + 1, items[start:start + page_size]
+
+def _page_name(kind: str, page: int) -> str:
+    return f'{kind}_{page}.html'
+
+def _pager(f: TextIO, kind: str, page: int, n_pages: int) -> None:
+    """요약·이전/다음 페이지 링크"""
+    f.write(f'    <p class="pager"><a href="../{REPORT_FILE}">요약</a>')
+    if page > 1:
+        f.write(f'<a href="{_page_name(kind, page - 1)}">이전</a>')
+    f.write(f'<span>{page} / {n_pages}</span>')
+    if page < n_pages:
+        f.write(f'<a href="{_page_name(kind, page + 1)}">다음</a>')
+    f.write('</p>\n')
+
+def _fmt(value: float, suffix: str = '', highlight: bool = False) -> str:
+    text = f'{value:.2f}{suffix}'
+    return f'<span class="highlight">{text}</span>' if highlight else text
+
+def _write_row(f: TextIO, rank: int, group: str, metrics: Dict[str, Any], link: str) -> None:
+    f.write(
+        f'        <tr><td>{rank}</td><td><a href="{link}">{html.escape(group)}</a></td>'
+        f'<td>{_fmt(metrics["growth_rate"], "%")}</td>'
+        f'<td>{_fmt(metrics["forecast_growth"], "%")}</td>'
+        f'<td>{_fmt(metrics["r_squared"])}</td>'
+        f'<td>{html.escape(metrics["reliability"])}</td></tr>\n'
+    )
+
+def _write_table(f: TextIO, rows: Iterator[Tuple[int, str]], trend_metrics: Dict[str, Dict], links: Dict[str, str]) -> None:
+    f.write('    <table>\n        <tr><th>순위</th><th>그룹</th><th>주간 성장률</th>'
+            '<th>6개월 예측 성장</th><th>R²</th><th>신뢰도</th></tr>\n')
+    for rank, group in rows:
+        _write_row(f, rank, group, trend_metrics[group], links[group])
+    f.write('    </table>\n')
+
+def _write_section(f: TextIO, anchor: str, group: str, metrics: Dict[str, Any]) -> None:
+    """그룹별 상세 분석 섹션"""
+    peaks = ', '.join(f'{html.escape(k)} ({v}%)' for k, v in metrics['seasonal_peaks'].items())
+    f.write(f"""    <div class="section" id="{anchor}">
+        <h3>{html.escape(group)} 트렌드 분석</h3>
+        <ul>
+            <li>주간 성장률: {_fmt(metrics['growth_rate'], '%', True)}</li>
+            <li>계절성 피크: {peaks}</li>
+            <li>6개월 예측 성장: {_fmt(metrics['forecast_growth'], '%', True)}</li>
+            <li>모델 정확도 (R²): {_fmt(metrics['r_squared'], '', metrics['r_squared'] < 0)}</li>
+            <li>신뢰도: {html.escape(metrics['reliability'])}</li>
+        </ul>
+    </div>
+""")
+
+def _open_page(path: str, title: str) -> TextIO:
+    f = open(path, 'w', encoding='utf-8')
+    f.write(HEAD.format(title=html.escape(title)))
+    return f
+
+def _clear_pages(page_dir: str) -> None:
+    """이전 실행의 페이지 삭제 (그룹 수 감소 시 남는 페이지 방지)"""
+    for path in glob.glob(os.path.join(page_dir, '*.html')):
+        os.remove(path)
+
+def plot_group_summary(trend_metrics: Dict[str, Dict], report_dir: str = REPORT_DIR, top_n: int = TOP_N) -> str:
+    """
+    그룹 비교 요약 차트 (group_comparison.png)
+    - 성장률 상위/하위 top_n개 막대 차트 (그룹 수와 무관하게 최대 2 × top_n개)
+    - 성장률 대비 R² 분포 (그룹이 많으면 hexbin)
+    """
+    import matplotlib.pyplot as plt
+    order = _sort_order(trend_metrics, 'growth')
+    shown = order if len(order) <= 2 * top_n else order[:top_n] + order[-top_n:]
+    growth = np.array([trend_metrics[group]['growth_rate'] for group in trend_metrics])
+    r2 = np.array([trend_metrics[group]['r_squared'] for group in trend_metrics])
+
+    plt.style.use('seaborn-v0_8-darkgrid')
+    fig, axes = plt.subplots(2, 1, figsize=(14, 10))
+
+    values = [trend_metrics[group]['growth_rate'] for group in shown]
+    axes[0].barh(range(len(shown)), values, color=['royalblue' if v >= 0 else '#e74c3c' for v in values])
+    axes[0].set_yticks(range(len(shown)), shown)
+    axes[0].invert_yaxis()
+    if len(shown) < len(order):
+        axes[0].axhline(top_n - 0.5, color='gray', linestyle='--', linewidth=1)
+        axes[0].set_title(f'Weekly growth rate: top {top_n} / bottom {top_n} of {len(order)} groups')
+    else:
+        axes[0].set_title('Comparison of weekly search volume growth rates by group')
+    axes[0].set_xlabel('Growth rate (%)')
+
+    if len(growth) > SCATTER_MAX_POINTS:
+        hb = axes[1].hexbin(growth, r2, gridsize=40, mincnt=1, cmap='viridis')
+        fig.colorbar(hb, ax=axes[1], label='Groups')
+    else:
+        colors = ['green' if v > 0.5 else 'orange' if v > 0 else 'red' for v in r2]  # 신뢰도에 따른 색상
+        axes[1].scatter(growth, r2, s=np.abs(growth) * 10, c=colors, alpha=0.6)
+    axes[1].set_xlabel('Search volume growth rate (%)')
+    axes[1].set_ylabel('Prediction accuracy (R²)')
+
+    plt.tight_layout()
+    os.makedirs(report_dir, exist_ok=True)
+    path = os.path.join(report_dir, 'group_comparison.png')
+    plt.savefig(path, bbox_inches='tight')
+    plt.close(fig)
+    return path
+
+def write_insights_report(
+    trend_metrics: Dict[str, Dict],
+    report_dir: str = REPORT_DIR,
+    page_size: int = PAGE_SIZE,
+    top_n: int = TOP_N,
+    title: str = '2025 라이프스타일 트렌드 인사이트'
+) -> str:
+    """
+    인사이트 HTML 리포트 (페이지 단위로 파일에 바로 기록)
+    - trend_insights.html: 요약 차트, 상위/하위 top_n 표, 정렬별 색인 링크
+    - insights/groups_{n}.html: 그룹별 상세 분석 (성장률순, page_size개씩)
+    - insights/{정렬 기준}_{n}.html: 정렬 기준별 색인 표
+    Returns:
+        요약 페이지 경로
+    """
+    page_dir = os.path.join(report_dir, PAGE_DIR)
+    os.makedirs(page_dir, exist_ok=True)
+    _clear_pages(page_dir)
+
+    # 상세 섹션: 성장률순으로 페이지 분할, 그룹별 링크 기록
+    detail_order = _sort_order(trend_metrics, 'growth')
+    n_pages = max(1, -(-len(detail_order) // page_size))
+    links = {}
+    for page, groups in _pages(detail_order, page_size):
+        with _open_page(os.path.join(page_dir, _page_name('groups', page)), f'{title} - 그룹 상세 {page}') as f:
+            _pager(f, 'groups', page, n_pages)
+            for i, group in enumerate(groups):
+                anchor = f'g{(page - 1) * page_size + i + 1}'
+                links[group] = f'{_page_name("groups", page)}#{anchor}'
+                _write_section(f, anchor, group, trend_metrics[group])
+            _pager(f, 'groups', page, n_pages)
+            f.write(CAUTION + '</body></html>\n')
+
+    # 정렬 기준별 색인
+    for key, (label, _) in SORT_KEYS.items():
+        order = detail_order if key == 'growth' else _sort_order(trend_metrics, key)
+        for page, groups in _pages(order, page_size):
+            with _open_page(os.path.join(page_dir, _page_name(key, page)), f'{title} - {label}') as f:
+                _pager(f, key, page, n_pages)
+                start = (page - 1) * page_size
+                _write_table(f, enumerate(groups, start + 1), trend_metrics, links)
+                _pager(f, key, page, n_pages)
+                f.write('</body></html>\n')
+
+    # 요약 페이지
+    report_path = os.path.join(report_dir, REPORT_FILE)
+    summary_links = {group: f'{PAGE_DIR}/{link}' for group, link in links.items()}
+    with _open_page(report_path, title) as f:
+        f.write("""    <div class="section">
+        <h2>실시간 검색 트렌드</h2>
+        <img src="./real_time_search_trends.png">
+        <p>각 그룹별 정규화된 검색 비율 추이 (2022-04 ~ 2025-04)</p>
+    </div>
+    <div class="section">
+        <h2>그룹별 비교 분석</h2>
+        <img src="./group_comparison.png">
+""")
+        f.write(f'        <p>전체 {len(detail_order)}개 그룹 · 색인: ')
+        f.write(' · '.join(
+            f'<a href="{PAGE_DIR}/{_page_name(key, 1)}">{label}</a>' for key, (label, _) in SORT_KEYS.items()
+        ))
+        f.write('</p>\n    </div>\n')
+        if detail_order:
+            f.write(f'    <div class="section">\n        <h3>성장률 상위 {top_n}</h3>\n')
+            _write_table(f, enumerate(detail_order[:top_n], 1), trend_metrics, summary_links)
+            if len(detail_order) > top_n:
+                bottom_start = max(len(detail_order) - top_n, top_n)
+                f.write(f'        <h3>성장률 하위 {top_n}</h3>\n')
+                _write_table(f, enumerate(detail_order[bottom_start:], bottom_start + 1), trend_metrics, summary_links)
+            f.write('    </div>\n')
+        f.write(CAUTION + '</body></html>\n')
+
+    logger.info(f"인사이트 리포트: {len(detail_order)}개 그룹, 정렬별 {n_pages}페이지")
+    return report_path
@@ -0,0 +1,532 @@
+# modeling/job_queue.py
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+import logging
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ('pending', 'running', 'done', 'failed')
+DEFAULT_LEASE = 600.0  # 작업 임대 시간(초) - 갱신 없이 지나면 다른 워커가 다시 가져감
+MAX_ATTEMPTS = 3
+STALE_GRACE = 60.0  # 파일 큐: 중단된 이동(.stage)·선점(.hold) 파일을 복원하기까지의 시간(초)
+HOLD_WAIT = 5.0  # 파일 큐: 재배정 선점 중인 작업의 처리 완료 대기 시간(초)
+
+class JobQueue(ABC):
+    """
+    작업 큐 인터페이스
+    작업: {'id', 'run_id', 'payload', 'status', 'worker', 'attempts', 'lease_until', 'result', 'error'}
+    claim은 임대(lease) 방식: 워커가 extend로 갱신하지 않으면 만료 후 재배정 (호스트 장애 대비)
+    """
+
+    @abstractmethod
+    def put(self, job_id: str, run_id: str, payload: Dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    def claim(self, worker: str, lease: float = DEFAULT_LEASE, run_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """대기 작업 1건 획득 (없으면 None)"""
+        ...
+
+    @abstractmethod
+    def extend(self, job_id: str, worker: str, lease: float = DEFAULT_LEASE) -> bool:
+        """임대 갱신 (다른 워커에 재배정된 경우 False)"""
+        ...
+
+    @abstractmethod
+    def complete(self, job_id: str, worker: str, result: Optional[Dict[str, Any]] = None) -> None:
+        ...
+
+    @abstractmethod
+    def fail(self, job_id: str, worker: str, error: str) -> None:
+        """실패 기록 (시도 횟수가 남으면 대기 상태로 복귀)"""
+        ...
+
+    @abstractmethod
+    def jobs(self, run_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        ...
+
+    def stats(self, run_id: Optional[str] = None) -> Dict[str, int]:
+        """상태별 작업 수"""
+        counts = dict.fromkeys(JOB_STATUSES, 0)
+        for job in self.jobs(run_id):
+            counts[job['status']] += 1
+        return counts
+
+class SQLiteQueue(JobQueue):
+    """SQLite 작업 큐 (단일 호스트 또는 잠금을 지원하는 공유 파일 시스템)"""
+
+    def __init__(self, path: str, max_attempts: int = MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY, run_id TEXT, payload TEXT, status TEXT, worker TEXT,
+                    attempts INTEGER DEFAULT 0, lease_until REAL, result TEXT, error TEXT, updated REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (run_id, status)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # 호출마다 연결 (스레드·프로세스 간 공유 없음), 쓰기 잠금 대기 30초
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @staticmethod
+    def _row(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job['payload'] = json.loads(job['payload'])
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def put(self, job_id: str, run_id: str, payload: Dict[str, Any]) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO jobs (id, run_id, payload, status, attempts, updated) VALUES (?, ?, ?, 'pending', 0, ?)",
+                (job_id, run_id, json.dumps(payload, ensure_ascii=False), time.time())
+            )
+
+    def claim(self, worker: str, lease: float = DEFAULT_LEASE, run_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # 임대 만료 작업: 시도 횟수 초과 시 실패, 아니면 재배정 대상
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = '임대 만료 (워커 응답 없음)', updated = ? "
+                "WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                (now, now, self.max_attempts)
+            )
+            query = "SELECT * FROM jobs WHERE (status = 'pending' OR (status = 'running' AND lease_until < ?))"
+            params = [now]
+            if run_id:
+                query += " AND run_id = ?"
+                params.append(run_id)
+            row = conn.execute(query + " ORDER BY rowid LIMIT 1", params).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1, lease_until = ?, updated = ? WHERE id = ?",
+                (worker, now + lease, now, row['id'])
+            )
+            conn.execute("COMMIT")
+            job = self._row(row)
+            job.update(status='running', worker=worker, attempts=job['attempts'] + 1, lease_until=now + lease)
+            return job
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def extend(self, job_id: str, worker: str, lease: float = DEFAULT_LEASE) -> bool:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_until = ?, updated = ? WHERE id = ? AND worker = ? AND status = 'running'",
+                (time.time() + lease, time.time(), job_id, worker)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker: str, result: Optional[Dict[str, Any]] = None) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, error = NULL, updated = ? WHERE id = ? AND worker = ?",
+                (json.dumps(result or {}, ensure_ascii=False), time.time(), job_id, worker)
+            )
+
+    def fail(self, job_id: str, worker: str, error: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "error = ?, updated = ? WHERE id = ? AND worker = ?",
+                (self.max_attempts, error, time.time(), job_id, worker)
+            )
+
+    def jobs(self, run_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._connect() as conn:
+            if run_id:
+                rows = conn.execute("SELECT * FROM jobs WHERE run_id = ? ORDER BY rowid", (run_id,)).fetchall()
+            else:
+                rows = conn.execute("SELECT * FROM jobs ORDER BY rowid").fetchall()
+        return [self._row(row) for row in rows]
+
+class FileQueue(JobQueue):
+    """
+    파일 시스템 작업 큐 (공유 디렉터리, 상태별 하위 디렉터리)
+    - 상태 이동: 원본을 이동자 전용 .stage 파일로 이름 변경(경쟁 중 하나만 성공) → 내용 기록 → 대상 이름으로 공개
+      (대상 상태 디렉터리에는 항상 최종 내용만 보임)
+    - 임대 갱신: 워커별 임대 파일(running/{id}.{워커 해시}.lease)에만 기록 (작업 파일을 다시 쓰지 않아
+      재배정 중인 작업이 running에 되살아나지 않음)
+    - 만료 재배정: 작업 파일을 .hold로 선점한 뒤 내용·임대를 다시 확인하고, 그 사이 갱신됐으면 되돌림
+    """
+
+    def __init__(self, root: str, max_attempts: int = MAX_ATTEMPTS):
+        self.root = root
+        self.max_attempts = max_attempts
+        for status in JOB_STATUSES:
+            os.makedirs(os.path.join(root, status), exist_ok=True)
+
+    def _path(self, status: str, job_id: str) -> str:
+        return os.path.join(self.root, status, f'{job_id}.json')
+
+    def _hold_path(self, job_id: str) -> str:
+        return f"{self._path('running', job_id)}.hold"
+
+    def _lease_path(self, job_id: str, worker: Optional[str]) -> str:
+        digest = hashlib.sha1(str(worker).encode('utf-8')).hexdigest()[:12]
+        return os.path.join(self.root, 'running', f'{job_id}.{digest}.lease')
+
+    def _read(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None  # 다른 워커가 이동 중
+
+    def _write(self, path: str, job: Dict[str, Any]) -> None:
+        tmp_path = f'{path}.{os.getpid()}-{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(job, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _move(self, job: Dict[str, Any], source: str, target: str, source_path: Optional[str] = None) -> bool:
+        """상태 이동 (이미 다른 워커가 옮긴 경우 False)"""
+        target_path = self._path(target, job['id'])
+        stage = f'{target_path}.{os.getpid()}-{threading.get_ident()}.stage'
+        try:
+            os.rename(source_path or self._path(source, job['id']), stage)
+        except FileNotFoundError:
+            return False
+        if source == 'running':
+            self._remove(self._lease_path(job['id'], job.get('worker')))
+        job['status'] = target
+        job['updated'] = time.time()
+        if target == 'pending':
+            job.update(worker=None, lease_until=None)
+        self._write(stage, job)
+        os.rename(stage, target_path)
+        return True
+
+    def _list(self, status: str) -> List[str]:
+        names = [name[:-5] for name in os.listdir(os.path.join(self.root, status)) if name.endswith('.json')]
+        return sorted(names)
+
+    def put(self, job_id: str, run_id: str, payload: Dict[str, Any]) -> None:
+        for status in JOB_STATUSES:
+            if os.path.exists(self._path(status, job_id)):
+                os.remove(self._path(status, job_id))
+        self._write(self._path('pending', job_id), {
+            'id': job_id, 'run_id': run_id, 'payload': payload, 'status': 'pending', 'worker': None,
+            'attempts': 0, 'lease_until': None, 'result': None, 'error': None, 'updated': time.time()
+        })
+
+    def _renewed_until(self, job: Dict[str, Any]) -> float:
+        """현재 담당 워커의 임대 파일 만료 시각 (없으면 0)"""
+        lease = self._read(self._lease_path(job['id'], job.get('worker')))
+        return lease['lease_until'] if lease and lease.get('worker') == job.get('worker') else 0.0
+
+    def _wait_hold(self, job_id: str) -> None:
+        """다른 워커가 재배정 여부를 확인하는 중이면 처리(복원 또는 이동)가 끝날 때까지 대기"""
+        deadline = time.time() + HOLD_WAIT
+        while os.path.exists(self._hold_path(job_id)) and time.time() < deadline:
+            time.sleep(0.01)
+
+    def _recover_stale(self) -> None:
+        """중단된 이동·선점 파일 복원 (해당 워커 장애)"""
+        for status in JOB_STATUSES:
+            directory = os.path.join(self.root, status)
+            for name in os.listdir(directory):
+                if name.endswith('.json.hold'):
+                    original = name[:-len('.hold')]
+                elif name.endswith('.stage'):
+                    original = name[:name.index('.json.') + len('.json')]
+                else:
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    if os.stat(path).st_ctime + STALE_GRACE < time.time():
+                        os.rename(path, os.path.join(directory, original))
+                except FileNotFoundError:
+                    continue
+
+    def _expired(self, job: Dict[str, Any], now: float) -> bool:
+        return max(job.get('lease_until') or 0.0, self._renewed_until(job)) < now
+
+    def _requeue_expired(self) -> None:
+        self._recover_stale()
+        for job_id in self._list('running'):
+            path = self._path('running', job_id)
+            job = self._read(path)
+            if job is None or not self._expired(job, time.time()):
+                continue
+
+            # 선점 후 재확인: 목록 조회 뒤 다른 워커가 재배정·재획득했을 수 있으므로 선점한 내용으로 다시 판단
+            # (extend는 임대 파일 기록 후 작업 파일을 확인하므로 둘 중 하나는 상대를 관찰)
+            hold = self._hold_path(job_id)
+            try:
+                os.rename(path, hold)
+            except FileNotFoundError:
+                continue  # 다른 워커가 먼저 처리
+            job = self._read(hold)
+            if job is None or not self._expired(job, time.time()):
+                os.rename(hold, path)
+                continue
+            if job['attempts'] >= self.max_attempts:
+                job['error'] = '임대 만료 (워커 응답 없음)'
+                self._move(job, 'running', 'failed', source_path=hold)
+            else:
+                self._move(job, 'running', 'pending', source_path=hold)
+
+    def claim(self, worker: str, lease: float = DEFAULT_LEASE, run_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        self._requeue_expired()
+        for job_id in self._list('pending'):
+            job = self._read(self._path('pending', job_id))
+            if job is None or (run_id and job['run_id'] != run_id):
+                continue
+            job.update(worker=worker, attempts=job['attempts'] + 1, lease_until=time.time() + lease)
+            if self._move(job, 'pending', 'running'):
+                self._remove(self._lease_path(job_id, worker))  # 이전 배정의 임대 파일
+                return job
+        return None
+
+    def _owned(self, job_id: str, worker: str) -> Optional[Dict[str, Any]]:
+        """worker가 담당 중인 running 작업 (재배정 선점 중이면 처리 완료 후 확인)"""
+        self._wait_hold(job_id)
+        job = self._read(self._path('running', job_id))
+        return job if job is not None and job['worker'] == worker else None
+
+    def extend(self, job_id: str, worker: str, lease: float = DEFAULT_LEASE) -> bool:
+        if self._owned(job_id, worker) is None:
+            return False
+        lease_path = self._lease_path(job_id, worker)
+        self._write(lease_path, {'worker': worker, 'lease_until': time.time() + lease})
+        # 기록 후 재확인 (그 사이 재배정됐으면 임대 파일 제거)
+        if self._owned(job_id, worker) is None:
+            self._remove(lease_path)
+            return False
+        return True
+
+    def complete(self, job_id: str, worker: str, result: Optional[Dict[str, Any]] = None) -> None:
+        job = self._owned(job_id, worker)
+        if job is None:
+            logger.warning(f"[{job_id}] 다른 워커에 재배정된 작업 - 완료 기록 생략")
+            return
+        job.update(result=result or {}, error=None)
+        self._move(job, 'running', 'done')
+
+    def fail(self, job_id: str, worker: str, error: str) -> None:
+        job = self._owned(job_id, worker)
+        if job is None:
+            return
+        job['error'] = error
+        self._move(job, 'running', 'failed' if job['attempts'] >= self.max_attempts else 'pending')
+
+    def _in_transit(self) -> bool:
+        """상태 이동·재배정 선점 중인 작업 존재 여부 (목록에서 잠시 빠짐)"""
+        return any(
+            name.endswith(('.stage', '.hold'))
+            for status in JOB_STATUSES for name in os.listdir(os.path.join(self.root, status))
+        )
+
+    def jobs(self, run_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        # 이동 중인 작업이 빠진 목록으로 완료를 판단하지 않도록 이동이 끝날 때까지 대기
+        deadline = time.time() + HOLD_WAIT
+        while self._in_transit() and time.time() < deadline:
+            time.sleep(0.01)
+        jobs = []
+        for status in JOB_STATUSES:
+            for job_id in self._list(status):
+                job = self._read(self._path(status, job_id))
+                if job is not None and (not run_id or job['run_id'] == run_id):
+                    jobs.append(job)
+        return jobs
+
+# Redis 상태 전이 스크립트 (Lua, 서버에서 원자적 실행 - 조회·수정·목록 이동 사이에 다른 워커 개입 없음)
+# 작업은 해시 {prefix}:job:{id}, 빈 문자열은 None
+_REDIS_CLAIM = """
+local pending, running, prefix = KEYS[1], KEYS[2], ARGV[1]
+for _, job_id in ipairs(redis.call('LRANGE', pending, 0, -1)) do
+    local key = prefix .. ':job:' .. job_id
+    if redis.call('EXISTS', key) == 0 then
+        redis.call('LREM', pending, 1, job_id)
+    elseif ARGV[5] == '' or redis.call('HGET', key, 'run_id') == ARGV[5] then
+        redis.call('LREM', pending, 1, job_id)
+        redis.call('HINCRBY', key, 'attempts', 1)
+        redis.call('HSET', key, 'status', 'running', 'worker', ARGV[2], 'lease_until', ARGV[4], 'updated', ARGV[3])
+        redis.call('SADD', running, job_id)
+        return redis.call('HGETALL', key)
+    end
+end
+return false
+"""
+_REDIS_REQUEUE = """
+local pending, running, prefix = KEYS[1], KEYS[2], ARGV[1]
+local now, max_attempts = tonumber(ARGV[2]), tonumber(ARGV[3])
+for _, job_id in ipairs(redis.call('SMEMBERS', running)) do
+    local key = prefix .. ':job:' .. job_id
+    local lease = tonumber(redis.call('HGET', key, 'lease_until'))
+    if redis.call('HGET', key, 'status') ~= 'running' then
+        redis.call('SREM', running, job_id)
+    elseif lease == nil or lease < now then
+        redis.call('SREM', running, job_id)
+        if tonumber(redis.call('HGET', key, 'attempts')) >= max_attempts then
+            redis.call('HSET', key, 'status', 'failed', 'error', ARGV[4], 'updated', ARGV[2])
+        else
+            redis.call('HSET', key, 'status', 'pending', 'updated', ARGV[2])
+            redis.call('LPUSH', pending, job_id)
+        end
+    end
+end
+return 0
+"""
+_REDIS_EXTEND = """
+if redis.call('HGET', KEYS[1], 'status') ~= 'running' or redis.call('HGET', KEYS[1], 'worker') ~= ARGV[1] then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'lease_until', ARGV[2], 'updated', ARGV[3])
+return 1
+"""
+_REDIS_FINISH = """
+local key, running, pending = KEYS[1], KEYS[2], KEYS[3]
+local worker, job_id, now, status = ARGV[1], ARGV[2], ARGV[3], ARGV[4]
+if redis.call('HGET', key, 'status') ~= 'running' or redis.call('HGET', key, 'worker') ~= worker then
+    return 0
+end
+redis.call('SREM', running, job_id)
+if status == 'retry' then
+    if tonumber(redis.call('HGET', key, 'attempts')) >= tonumber(ARGV[7]) then
+        status = 'failed'
+    else
+        status = 'pending'
+        redis.call('RPUSH', pending, job_id)
+    end
+end
+redis.call('HSET', key, 'status', status, 'result', ARGV[5], 'error', ARGV[6], 'updated', now)
+return 1
+"""
+
+class RedisQueue(JobQueue):
+    """
+    Redis 작업 큐 (다중 호스트, redis 패키지 필요)
+    상태 전이(획득·만료 재배정·갱신·완료·실패)는 Lua 스크립트로 원자적 실행
+    → 획득 도중 워커가 중단돼도 작업이 대기·실행 목록 어디에도 없는 상태가 생기지 않음
+    """
+
+    def __init__(self, url: str, prefix: str = 'trend_jobs', max_attempts: int = MAX_ATTEMPTS):
+        import redis
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+        self.max_attempts = max_attempts
+        self._claim = self.client.register_script(_REDIS_CLAIM)
+        self._requeue = self.client.register_script(_REDIS_REQUEUE)
+        self._extend = self.client.register_script(_REDIS_EXTEND)
+        self._finish = self.client.register_script(_REDIS_FINISH)
+
+    def _key(self, *parts: str) -> str:
+        return ':'.join((self.prefix,) + parts)
+
+    @staticmethod
+    def _job(fields: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """해시 필드 → 작업 딕셔너리"""
+        if not fields:
+            return None
+        return {
+            'id': fields['id'],
+            'run_id': fields['run_id'],
+            'payload': json.loads(fields['payload']),
+            'status': fields['status'],
+            'worker': fields.get('worker') or None,
+            'attempts': int(fields.get('attempts') or 0),
+            'lease_until': float(fields['lease_until']) if fields.get('lease_until') else None,
+            'result': json.loads(fields['result']) if fields.get('result') else None,
+            'error': fields.get('error') or None,
+            'updated': float(fields['updated']) if fields.get('updated') else None
+        }
+
+    def _load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self._job(self.client.hgetall(self._key('job', job_id)))
+
+    def put(self, job_id: str, run_id: str, payload: Dict[str, Any]) -> None:
+        pipe = self.client.pipeline()  # MULTI/EXEC
+        pipe.lrem(self._key('pending'), 0, job_id)
+        pipe.srem(self._key('running'), job_id)
+        pipe.delete(self._key('job', job_id))
+        pipe.hset(self._key('job', job_id), mapping={
+            'id': job_id, 'run_id': run_id, 'payload': json.dumps(payload, ensure_ascii=False),
+            'status': 'pending', 'worker': '', 'attempts': 0, 'lease_until': '', 'result': '', 'error': '',
+            'updated': time.time()
+        })
+        pipe.sadd(self._key('all'), job_id)
+        pipe.rpush(self._key('pending'), job_id)
+        pipe.execute()
+
+    def _requeue_expired(self) -> None:
+        self._requeue(
+            keys=[self._key('pending'), self._key('running')],
+            args=[self.prefix, time.time(), self.max_attempts, '임대 만료 (워커 응답 없음)']
+        )
+
+    def claim(self, worker: str, lease: float = DEFAULT_LEASE, run_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        self._requeue_expired()
+        now = time.time()
+        fields = self._claim(
+            keys=[self._key('pending'), self._key('running')],
+            args=[self.prefix, worker, now, now + lease, run_id or '']
+        )
+        return self._job(dict(zip(fields[::2], fields[1::2]))) if fields else None
+
+    def extend(self, job_id: str, worker: str, lease: float = DEFAULT_LEASE) -> bool:
+        now = time.time()
+        return bool(self._extend(keys=[self._key('job', job_id)], args=[worker, now + lease, now]))
+
+    def _transition(self, job_id: str, worker: str, status: str, result: str = '', error: str = '') -> None:
+        self._finish(
+            keys=[self._key('job', job_id), self._key('running'), self._key('pending')],
+            args=[worker, job_id, time.time(), status, result, error, self.max_attempts]
+        )
+
+    def complete(self, job_id: str, worker: str, result: Optional[Dict[str, Any]] = None) -> None:
+        self._transition(job_id, worker, 'done', result=json.dumps(result or {}, ensure_ascii=False))
+
+    def fail(self, job_id: str, worker: str, error: str) -> None:
+        self._transition(job_id, worker, 'retry', error=error)
+
+    def jobs(self, run_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        pipe = self.client.pipeline(transaction=False)
+        for job_id in sorted(self.client.smembers(self._key('all'))):
+            pipe.hgetall(self._key('job', job_id))
+        jobs = [self._job(fields) for fields in pipe.execute()]
+        return [job for job in jobs if job is not None and (not run_id or job['run_id'] == run_id)]
+
+def open_queue(url: str) -> JobQueue:
+    """
+    URL로 큐 생성
+    - sqlite:///경로.db (또는 .db/.sqlite 경로)
+    - file:///디렉터리 (또는 디렉터리 경로)
+    - redis://호스트:포트/DB
+    """
+    if url.startswith('redis://') or url.startswith('rediss://'):
+        return RedisQueue(url)
+    if url.startswith('sqlite:///'):
+        return SQLiteQueue(url[len('sqlite:///'):])
+    if url.startswith('file://'):
+        return FileQueue(url[len('file://'):])
+    if url.endswith(('.db', '.sqlite', '.sqlite3')):
+        return SQLiteQueue(url)
+    return FileQueue(url)
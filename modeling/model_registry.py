@@ -0,0 +1,273 @@
+# modeling/model_registry.py
+import os
+import json
+import gzip
+import tempfile
+import threading
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import numpy as np
+import logging
+from modeling.cache_utils import fingerprint
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl  # 다중 프로세스 인덱스 잠금 (Unix)
+except ImportError:
+    fcntl = None
+
+INDEX_FILE = 'registry.json'
+# Prophet 하이퍼파라미터 (모델 지문 구성)
+PROPHET_SETTINGS = (
+    'growth', 'n_changepoints', 'changepoint_range', 'yearly_seasonality', 'weekly_seasonality',
+    'daily_seasonality', 'seasonality_mode', 'seasonality_prior_scale', 'changepoint_prior_scale',
+    'holidays_prior_scale', 'interval_width', 'uncertainty_samples'
+)
+
+def model_signature(model: Any) -> Dict[str, Any]:
+    """
+    모델 설정·계수 요약 (등록 지문용)
+    같은 학습 데이터라도 모델 유형·차수·Fourier 항·하이퍼파라미터·계수가 다르면 다른 값
+    """
+    signature: Dict[str, Any] = {'type': type(model).__name__}
+    for attr in ('order', 'seasonal_order', 'K', 'period') + PROPHET_SETTINGS:
+        value = getattr(model, attr, None)
+        if value is not None and not callable(value):
+            signature[attr] = value
+    estimator = getattr(model, 'model', model)  # FourierARIMA → pmdarima ARIMA
+    params = getattr(estimator, 'params', None)
+    if callable(params):
+        signature['params'] = np.asarray(params(), dtype=float)
+    elif isinstance(params, dict):
+        signature['params'] = {key: np.asarray(value, dtype=float) for key, value in params.items()}
+    return signature
+
+class LazyModel:
+    """첫 접근 시 로드되는 모델 프록시"""
+    __slots__ = ('_registry', '_style', '_kind', '_version', '_obj')
+
+    def __init__(self, registry: 'ModelRegistry', style: str, kind: str, version: int):
+        self._registry = registry
+        self._style = style
+        self._kind = kind
+        self._version = version
+        self._obj = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._obj is not None
+
+    def load(self) -> Any:
+        if self._obj is None:
+            self._obj = self._registry.load(self._style, self._kind, self._version)
+        return self._obj
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.load(), name)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.load()[key]
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self.loaded else 'lazy'
+        return f"LazyModel({self._style}/{self._kind} v{self._version}, {state})"
+
+class ModelRegistry:
+    """
+    그룹별 모델 버전 저장소
+    - arima: joblib 압축 pickle (compress=0이면 메모리 맵 로드)
+    - prophet: Prophet JSON 직렬화 (gzip)
+    - ensemble 등 딕셔너리: JSON
+    인덱스(registry.json)만 읽어 시작하고, 모델은 접근 시점에 로드
+    """
+
+    def __init__(self, root: str = 'modeling/models', compress: int = 3, keep_versions: Optional[int] = None):
+        self.root = root
+        self.compress = compress
+        self.keep_versions = keep_versions
+        self._index = None
+        self._index_mtime = None
+        self._lock = threading.Lock()
+        self._batch_index = None
+
+    # 인덱스 관리 ---------------------------------------------------------
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.root, INDEX_FILE)
+
+    def _read_index(self) -> Dict[str, Any]:
+        if not os.path.exists(self.index_path):
+            return {'models': {}}
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    @property
+    def index(self) -> Dict[str, Any]:
+        """인덱스 (파일 변경 시 재로드)"""
+        mtime = os.path.getmtime(self.index_path) if os.path.exists(self.index_path) else None
+        if self._index is None or mtime != self._index_mtime:
+            self._index = self._read_index()
+            self._index_mtime = mtime
+        return self._index
+
+    @contextmanager
+    def _locked_index(self):
+        """인덱스 읽기-수정-쓰기 (스레드·프로세스 잠금)"""
+        os.makedirs(self.root, exist_ok=True)
+        with self._lock, open(os.path.join(self.root, '.registry.lock'), 'w') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            index = self._read_index()
+            yield index
+            _atomic_write(self.index_path, json.dumps(index, ensure_ascii=False, indent=2).encode('utf-8'))
+            self._index = None
+
+    @contextmanager
+    def batch(self):
+        """다수 모델 등록 시 인덱스를 한 번만 기록 (단일 스레드에서 사용)"""
+        with self._locked_index() as index:
+            self._batch_index = index
+            try:
+                yield self
+            finally:
+                self._batch_index = None
+
+    # 조회 --------------------------------------------------------------
+    def styles(self) -> List[str]:
+        return sorted(self.index['models'])
+
+    def versions(self, style: str, kind: str) -> List[Dict[str, Any]]:
+        return self.index['models'].get(style, {}).get(kind, [])
+
+    def entry(self, style: str, kind: str, version: Optional[int] = None) -> Dict[str, Any]:
+        """버전 메타데이터 (version=None이면 최신)"""
+        versions = self.versions(style, kind)
+        if not versions:
+            raise KeyError(f"등록된 모델 없음: {style}/{kind}")
+        if version is None:
+            return versions[-1]
+        for item in versions:
+            if item['version'] == version:
+                return item
+        raise KeyError(f"등록된 버전 없음: {style}/{kind} v{version}")
+
+    def __contains__(self, key: tuple) -> bool:
+        style, kind = key
+        return bool(self.versions(style, kind))
+
+    def get(self, style: str, kind: str, version: Optional[int] = None) -> LazyModel:
+        """지연 로드 프록시 반환 (파일 읽기 없음)"""
+        return LazyModel(self, style, kind, self.entry(style, kind, version)['version'])
+
+    def load(self, style: str, kind: str, version: Optional[int] = None) -> Any:
+        """모델 즉시 로드"""
+        item = self.entry(style, kind, version)
+        path = os.path.join(self.root, item['path'])
+        if item['format'] == 'prophet_json':
+            from prophet.serialize import model_from_json
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                return model_from_json(f.read())
+        if item['format'] == 'json':
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        import joblib
+        return joblib.load(path, mmap_mode='r' if item.get('compress', 0) == 0 else None)
+
+    # 등록 --------------------------------------------------------------
+    def register(
+        self,
+        style: str,
+        kind: str,
+        obj: Any,
+        data_fingerprint: Optional[str] = None,
+        meta: Optional[Dict[str, Any]] = None,
+        skip_unchanged: bool = False
+    ) -> int:
+        """
+        모델 저장 및 인덱스 등록, 새 버전 번호 반환
+        skip_unchanged: 최신 버전과 학습 데이터 지문·내용이 같으면 저장 없이 최신 버전 번호 반환
+            (딕셔너리는 저장 내용, 모델은 model_signature 지문 비교)
+        """
+        if kind == 'prophet':
+            from prophet.serialize import model_to_json
+            fmt, ext, payload = 'prophet_json', 'json.gz', gzip.compress(model_to_json(obj).encode('utf-8'))
+        elif isinstance(obj, dict):
+            fmt, ext, payload = 'json', 'json', json.dumps(obj, ensure_ascii=False, default=float).encode('utf-8')
+        else:
+            fmt, ext, payload = 'joblib', 'pkl', None
+        model_fp = fingerprint(model_signature(obj)) if fmt != 'json' else None
+
+        in_batch = self._batch_index is not None
+        with (nullcontext(self._batch_index) if in_batch else self._locked_index()) as index:
+            versions = index['models'].setdefault(style, {}).setdefault(kind, [])
+            if skip_unchanged and versions and self._unchanged(versions[-1], data_fingerprint, fmt, payload, model_fp):
+                logger.debug(f"모델 등록 생략 (변경 없음): {style}/{kind} v{versions[-1]['version']}")
+                return versions[-1]['version']
+            version = versions[-1]['version'] + 1 if versions else 1
+            rel_path = os.path.join(style, f"{kind}-v{version}.{ext}")
+            path = os.path.join(self.root, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            if payload is None:
+                import joblib
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+                os.close(fd)
+                joblib.dump(obj, tmp_path, compress=self.compress)
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, path)
+            else:
+                _atomic_write(path, payload)
+
+            versions.append({
+                'version': version,
+                'path': rel_path,
+                'format': fmt,
+                'compress': self.compress if fmt == 'joblib' else None,
+                'data_fingerprint': data_fingerprint,
+                'model_fingerprint': model_fp,
+                'created_at': datetime.now().isoformat(),
+                'size_bytes': os.path.getsize(path),
+                'meta': meta or {}
+            })
+
+            # 오래된 버전 정리
+            if self.keep_versions and len(versions) > self.keep_versions:
+                for old in versions[:-self.keep_versions]:
+                    old_path = os.path.join(self.root, old['path'])
+                    if os.path.exists(old_path):
+                        os.remove(old_path)
+                del versions[:-self.keep_versions]
+        logger.debug(f"모델 등록: {style}/{kind} v{version}")
+        return version
+
+    def _unchanged(
+        self,
+        latest: Dict[str, Any],
+        data_fingerprint: Optional[str],
+        fmt: str,
+        payload: Optional[bytes],
+        model_fp: Optional[str]
+    ) -> bool:
+        """최신 버전과 같은 학습 데이터·같은 내용인지 (지문 없으면 항상 변경으로 간주)"""
+        if data_fingerprint is None or latest.get('data_fingerprint') != data_fingerprint or latest['format'] != fmt:
+            return False
+        if fmt != 'json':
+            return model_fp is not None and latest.get('model_fingerprint') == model_fp
+        path = os.path.join(self.root, latest['path'])
+        if not os.path.exists(path):
+            return False
+        with open(path, 'rb') as f:
+            return f.read() == payload
+
+def _atomic_write(path: str, payload: bytes) -> None:
+    """임시 파일 기록 후 교체"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
@@ -0,0 +1,288 @@
+# modeling/pipeline.py
+import time
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import logging
+from modeling import tracing
+from modeling.cache_utils import DiskCache, fingerprint
+logger = logging.getLogger(__name__)
+
+PIPELINE_CACHE_DIR = 'modeling/cache/pipeline'
+STAGE_KINDS = ('global', 'split', 'group')
+_MISSING = object()
+
+def _rows(value: Any) -> int:
+    """계측용 행 수 (DataFrame·Series 외에는 0)"""
+    return len(value) if hasattr(value, 'index') and hasattr(value, 'shape') else 0
+
+class Stage:
+    """
+    파이프라인 단계 (DAG 노드)
+    kind:
+        'global' - 선행 산출물 전체 → 단일 산출물: func(*deps, **params)
+        'split'  - 선행 산출물 전체 → {그룹: 산출물}: func(*deps, **params)
+                   그룹별 산출물은 내용 지문으로 식별 (바뀐 그룹만 하위 단계 재계산)
+        'group'  - 그룹별 산출물 → 그룹별 산출물: func({그룹: (deps...)}, **params)
+                   입력이 바뀐 그룹만 전달, 매핑 또는 (그룹, 산출물) 반복자 반환
+                   반복자는 항목마다 즉시 저장 (중단 후 완료된 그룹부터 재개), None은 실패로 제외
+    version: 단계 코드 변경 시 증가 (기존 산출물 무효화)
+    cache: False면 매번 실행 (리포트·모델 저장 등 부수 효과 단계)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        deps: Sequence[str] = (),
+        kind: str = 'global',
+        params: Optional[Dict[str, Any]] = None,
+        version: int = 1,
+        cache: bool = True
+    ):
+        if kind not in STAGE_KINDS:
+            raise ValueError(f"지원하지 않는 단계 유형: {kind}")
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.kind = kind
+        self.params = params or {}
+        self.version = version
+        self.cache = cache
+
+    def __repr__(self) -> str:
+        return f"Stage({self.name}, {self.kind}, deps={list(self.deps)})"
+
+class Pipeline:
+    """
+    내용 주소 기반 단계 캐시 파이프라인
+    산출물 키 = 지문(단계명, 버전, 파라미터, 선행 산출물 키) → DiskCache에 단계·그룹 단위 저장
+    같은 입력으로 재실행하면 저장된 산출물을 재사용하고, 캐시된 산출물은 하위 단계가 필요로 할 때만 로드
+    keep_in_memory: 최근 실행 산출물을 메모리에 유지 (상주 프로세스에서 반복 실행 시 디스크 로드 생략)
+    progress: 진행 콜백 (단계명, 완료 수, 전체 수)
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[Stage],
+        cache_dir: Optional[str] = PIPELINE_CACHE_DIR,
+        keep_in_memory: bool = False,
+        progress: Optional[Callable[[str, int, int], None]] = None
+    ):
+        self.stages = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"중복 단계: {stage.name}")
+            self.stages[stage.name] = stage
+        self.cache = DiskCache(cache_dir) if cache_dir else None
+        self.memory = {} if keep_in_memory else None
+        self.progress = progress
+
+    # DAG ---------------------------------------------------------------
+    def _order(self, sources: Iterable[str], targets: Optional[Sequence[str]]) -> List[str]:
+        """대상 단계까지 필요한 단계 (위상 정렬)"""
+        sources = set(sources)
+        order, visiting = [], set()
+
+        def visit(name: str) -> None:
+            if name in sources or name in order:
+                return
+            if name not in self.stages:
+                raise KeyError(f"정의되지 않은 단계 또는 입력: {name}")
+            if name in visiting:
+                raise ValueError(f"순환 의존성: {name}")
+            visiting.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in targets or self.stages:
+            visit(name)
+        return order
+
+    def _downstream(self, names: Iterable[str]) -> set:
+        """지정 단계와 모든 하위 단계"""
+        result = set(names)
+        changed = True
+        while changed:
+            changed = False
+            for stage in self.stages.values():
+                if stage.name not in result and result & set(stage.deps):
+                    result.add(stage.name)
+                    changed = True
+        return result
+
+    # 산출물 저장소 -------------------------------------------------------
+    def _has(self, key: str) -> bool:
+        return (self.memory is not None and key in self.memory) or (self.cache is not None and key in self.cache)
+
+    def _get(self, key: str) -> Any:
+        if self.memory is not None and key in self.memory:
+            return self.memory[key]
+        value = self.cache.get(key, _MISSING) if self.cache else _MISSING
+        if self.memory is not None and value is not _MISSING:
+            self.memory[key] = value
+        return value
+
+    def _set(self, key: str, value: Any) -> None:
+        if self.memory is not None:
+            self.memory[key] = value
+        if self.cache:
+            self.cache.set(key, value)
+
+    def _prune_memory(self) -> None:
+        """이번 실행에서 참조한 산출물만 메모리에 유지"""
+        live = set()
+        for key in self._keys.values():
+            live.update(key.values() if isinstance(key, dict) else [key])
+        for key in list(self.memory):
+            if key not in live:
+                del self.memory[key]
+
+    def _notify(self, name: str, done: int, total: int) -> None:
+        if self.progress is not None:
+            self.progress(name, done, total)
+
+    def run(
+        self,
+        sources: Dict[str, Any],
+        targets: Optional[Sequence[str]] = None,
+        force: Sequence[str] = (),
+        groups: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        파이프라인 실행
+        Args:
+            sources: 입력 산출물 {이름: 값}
+            targets: 반환할 단계 (기본: 전체)
+            force: 캐시를 무시하고 재계산할 단계 (하위 단계 포함)
+            groups: 그룹 단계를 실행할 그룹 (기본: 전체, 샤드 실행용 - 산출물 키는 전체 실행과 동일)
+        Returns:
+            {단계명: 산출물} - 그룹 단계는 {그룹: 산출물}
+        """
+        order = self._order(sources, targets)
+        forced = self._downstream(force)
+        keys = {name: fingerprint('source', value) for name, value in sources.items()}
+        values = {name: value for name, value in sources.items()}  # 메모리에 있는 산출물
+        self._keys, self._values = keys, values
+        self._groups = set(groups) if groups is not None else None
+
+        for name in order:
+            stage = self.stages[name]
+            started = time.perf_counter()
+            use_cache = stage.cache and name not in forced
+            with tracing.span(name, cat='stage', kind=stage.kind):
+                if stage.kind == 'group':
+                    hits, computed = self._run_group(stage, use_cache)
+                else:
+                    hits, computed = self._run_global(stage, use_cache)
+                tracing.count('reused', hits)
+                tracing.count('computed', computed)
+            logger.info(
+                f"[{name}] 재사용 {hits} / 계산 {computed} ({time.perf_counter() - started:.2f}초)"
+            )
+
+        outputs = {name: self._load(name) for name in (targets or order)}
+        if self.memory is not None:
+            self._prune_memory()
+        return outputs
+
+    def _dep_key(self, name: str, group: Optional[str] = None) -> str:
+        key = self._keys[name]
+        if isinstance(key, dict):
+            return key[group] if group is not None else fingerprint(key)
+        return key
+
+    def _load(self, name: str, group: Any = _MISSING) -> Any:
+        """산출물 조회 (캐시된 산출물은 처음 필요할 때 로드)"""
+        key = self._keys[name]
+        if isinstance(key, dict) and group is _MISSING:
+            return {g: self._load(name, g) for g in key}
+        store = self._values.setdefault(name, {}) if isinstance(key, dict) else self._values
+        slot = group if isinstance(key, dict) else name
+        if slot not in store:
+            value = self._get(key[group] if isinstance(key, dict) else key)
+            if value is _MISSING:
+                raise KeyError(f"[{name}] 산출물 없음 (캐시 삭제됨): {slot}")
+            store[slot] = value
+        return store[slot]
+
+    def _run_global(self, stage: Stage, use_cache: bool) -> Tuple[int, int]:
+        key = fingerprint(stage.name, stage.version, stage.params, [self._dep_key(dep) for dep in stage.deps])
+
+        if stage.kind == 'split':
+            index = self._get(key) if use_cache else _MISSING
+            if index is not _MISSING:
+                self._keys[stage.name] = index
+                return len(index), 0
+            output = stage.func(*[self._load(dep) for dep in stage.deps], **stage.params)
+            index = {}
+            for group, value in output.items():
+                tracing.count('rows', _rows(value))
+                index[group] = fingerprint(stage.name, stage.version, group, value)  # 내용 기반 키
+                if stage.cache:
+                    self._set(index[group], value)
+            if stage.cache:
+                self._set(key, index)
+            self._keys[stage.name] = index
+            self._values[stage.name] = dict(output)
+            return 0, len(index)
+
+        self._keys[stage.name] = key
+        if use_cache and self._has(key):
+            return 1, 0
+        self._notify(stage.name, 0, 1)
+        value = stage.func(*[self._load(dep) for dep in stage.deps], **stage.params)
+        tracing.count('rows', _rows(value))
+        if stage.cache:
+            self._set(key, value)
+        self._values[stage.name] = value
+        self._notify(stage.name, 1, 1)
+        return 0, 1
+
+    def _run_group(self, stage: Stage, use_cache: bool) -> Tuple[int, int]:
+        group_deps = [dep for dep in stage.deps if isinstance(self._keys[dep], dict)]
+        if not group_deps:
+            raise ValueError(f"[{stage.name}] 그룹 단계에는 그룹 단위 선행 산출물이 필요합니다.")
+        groups = [
+            g for g in self._keys[group_deps[0]]
+            if all(g in self._keys[dep] for dep in group_deps) and (self._groups is None or g in self._groups)
+        ]
+
+        keys, stale = {}, {}
+        for group in groups:
+            key = fingerprint(
+                stage.name, stage.version, stage.params, group,
+                [self._dep_key(dep, group if dep in group_deps else None) for dep in stage.deps]
+            )
+            if use_cache and self._has(key):
+                keys[group] = key
+            else:
+                stale[group] = key
+
+        self._keys[stage.name] = keys
+        store = self._values.setdefault(stage.name, {})
+        if stale:
+            inputs = {
+                group: tuple(self._load(dep, group) if dep in group_deps else self._load(dep) for dep in stage.deps)
+                for group in stale
+            }
+            if tracing.is_enabled():
+                tracing.count('input_rows', sum(_rows(value) for values in inputs.values() for value in values))
+            self._notify(stage.name, 0, len(stale))
+            output = stage.func(inputs, **stage.params)
+            for group, value in (output.items() if isinstance(output, Mapping) else output):
+                if value is None or group not in stale:
+                    continue
+                if stage.cache:
+                    self._set(stale[group], value)
+                keys[group] = stale[group]
+                store[group] = value
+                self._notify(stage.name, len(keys) - (len(groups) - len(stale)), len(stale))
+
+        failed = [group for group in stale if group not in keys]
+        if failed:
+            logger.warning(f"[{stage.name}] 산출물 없는 그룹 (다음 실행 시 재시도): {failed}")
+        # 입력 그룹 순서 유지
+        self._keys[stage.name] = {group: keys[group] for group in groups if group in keys}
+        return len(groups) - len(stale), len(stale) - len(failed)
@@ -0,0 +1,216 @@
+# modeling/prophet_fast.py
+import numpy as np
+import pandas as pd
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Union
+import logging
+logger = logging.getLogger(__name__)
+
+DAY_NS = 24 * 60 * 60 * 10**9
+
+def _to_days(dates: Union[pd.Series, pd.DatetimeIndex, np.ndarray]) -> np.ndarray:
+    """날짜 → 1970-01-01 기준 일수 (Prophet fourier_series와 동일 기준)"""
+    values = pd.DatetimeIndex(dates).as_unit('ns').asi8
+    return values / DAY_NS
+
+def export_prophet_params(model, holiday_years: int = 5) -> Dict[str, Any]:
+    """
+    학습된 Prophet 모델 파라미터 추출 (1회)
+    추세 변화점·delta, 계절성 계수, 공휴일 효과를 NumPy 배열로 변환
+    Args:
+        holiday_years: 학습 종료 후 공휴일 날짜를 미리 계산할 연수
+    """
+    if model.params is None or model.history is None:
+        raise ValueError("학습되지 않은 Prophet 모델입니다.")
+    if model.growth != 'linear':
+        raise ValueError(f"지원하지 않는 추세 유형: {model.growth}")
+    if model.extra_regressors:
+        raise ValueError("외부 회귀변수는 지원하지 않습니다.")
+    if any(props['condition_name'] for props in model.seasonalities.values()):
+        raise ValueError("조건부 계절성은 지원하지 않습니다.")
+
+    # 1. 학습 시점 특성 구성 (컬럼 순서·모드 확인용)
+    features, _, component_cols, _ = model.make_all_seasonality_features(model.history)
+    columns = features.columns.tolist()
+
+    # 2. 특성 키 정의 (Fourier: 주기·차수·sin/cos, 공휴일: 컬럼명)
+    keys = []
+    fourier_cols = {}
+    for name, props in model.seasonalities.items():
+        for i in range(2 * props['fourier_order']):
+            fourier_cols[f"{name}_delim_{i + 1}"] = (
+                'fourier', float(props['period']), i // 2 + 1, 'sin' if i % 2 == 0 else 'cos'
+            )
+    holiday_cols = [col for col in columns if col not in fourier_cols]
+    for col in columns:
+        keys.append(fourier_cols.get(col, ('holiday', col)))
+
+    # 3. 공휴일 발생일 사전 계산 (일 단위, 윈도우 포함)
+    holiday_days = {}
+    if holiday_cols:
+        start = model.history['ds'].min()
+        end = model.history['ds'].max() + pd.DateOffset(years=holiday_years)
+        calendar = model.construct_holiday_dataframe(pd.Series(pd.date_range(start, end, freq='D')))
+        occurrences = {col: [] for col in holiday_cols}
+        for row in calendar.dropna(subset=['ds']).itertuples():
+            lw, uw = getattr(row, 'lower_window', 0), getattr(row, 'upper_window', 0)
+            lw, uw = (0 if pd.isna(lw) else int(lw)), (0 if pd.isna(uw) else int(uw))
+            day = int(_to_days([row.ds])[0] // 1)
+            for offset in range(lw, uw + 1):
+                col = f"{row.holiday}_delim_{'+' if offset >= 0 else '-'}{abs(offset)}"
+                if col in occurrences:
+                    occurrences[col].append(day + offset)
+        holiday_days = {col: np.unique(np.array(days, dtype=np.int64)) for col, days in occurrences.items()}
+
+    scaling = getattr(model, 'scaling', 'absmax')
+    return {
+        'start_day': float(_to_days([model.start])[0]),
+        't_scale_days': model.t_scale / pd.Timedelta(days=1),
+        'y_scale': float(model.y_scale),
+        'floor': float(model.y_min) if scaling == 'minmax' else 0.0,
+        'k': float(np.nanmean(model.params['k'])),
+        'm': float(np.nanmean(model.params['m'])),
+        'deltas': np.nanmean(model.params['delta'], axis=0).astype(float),
+        'changepoints_t': np.asarray(model.changepoints_t, dtype=float),
+        'sigma_obs': float(np.nanmean(model.params['sigma_obs'])),
+        'beta': np.nanmean(model.params['beta'], axis=0).astype(float),
+        'feature_keys': keys,
+        'additive': component_cols['additive_terms'].values.astype(float),
+        'multiplicative': component_cols['multiplicative_terms'].values.astype(float),
+        'holiday_days': holiday_days,
+        'holiday_end_day': float(_to_days([model.history['ds'].max() + pd.DateOffset(years=holiday_years)])[0]),
+        'interval_width': float(model.interval_width)
+    }
+
+def _feature_matrix(days: np.ndarray, keys: List[tuple], holiday_days: Dict[str, np.ndarray]) -> np.ndarray:
+    """날짜별 계절성·공휴일 특성 행렬 (그룹 공통, 1회 계산)"""
+    X = np.zeros((len(days), len(keys)))
+    day_index = np.floor(days).astype(np.int64)
+    for j, key in enumerate(keys):
+        if key[0] == 'fourier':
+            _, period, order, fn = key
+            angle = 2.0 * np.pi * order * days / period
+            X[:, j] = np.sin(angle) if fn == 'sin' else np.cos(angle)
+        else:
+            X[:, j] = np.isin(day_index, holiday_days.get(key[1], []))
+    return X
+
+def fast_predict_batch(
+    params: Dict[str, Dict[str, Any]],
+    dates: Union[pd.Series, pd.DatetimeIndex],
+    uncertainty: Union[str, int, None] = 'analytic',
+    interval_width: Optional[float] = None,
+    seed: Optional[int] = None
+) -> Dict[str, np.ndarray]:
+    """
+    다중 그룹 벡터화 예측 (공통 날짜 축)
+    Args:
+        params: {그룹명: export_prophet_params 결과}
+        uncertainty: 'analytic'(정규 근사) / 정수(몬테카를로 샘플 수) / None(구간 생략)
+    Returns:
+        {'groups', 'ds', 'yhat', 'yhat_lower', 'yhat_upper', 'trend'} - 값 배열은 (그룹 수, 날짜 수)
+    """
+    groups = list(params)
+    if not groups:
+        raise ValueError("예측할 그룹이 없습니다.")
+    ds = pd.DatetimeIndex(dates)
+    days = _to_days(ds)
+    if (days > min(p['holiday_end_day'] for p in params.values())).any():
+        logger.warning("공휴일 사전 계산 범위를 벗어난 예측 구간이 포함되어 있습니다.")
+
+    # 1. 특성 합집합 구성 및 특성 행렬 1회 계산
+    keys = list(dict.fromkeys(key for p in params.values() for key in p['feature_keys']))
+    key_index = {key: j for j, key in enumerate(keys)}
+    holiday_days = {}
+    for p in params.values():
+        for col, hdays in p['holiday_days'].items():
+            holiday_days[col] = np.union1d(holiday_days.get(col, np.array([], dtype=np.int64)), hdays)
+    X = _feature_matrix(days, keys, holiday_days)
+
+    # 2. 그룹별 계수 행렬 (G × F) 및 추세 파라미터 정렬
+    G = len(groups)
+    beta_add = np.zeros((G, len(keys)))
+    beta_mult = np.zeros((G, len(keys)))
+    n_cp = max(len(p['changepoints_t']) for p in params.values())
+    deltas = np.zeros((G, n_cp))
+    changepoints = np.full((G, n_cp), np.inf)
+    for g, p in enumerate(params.values()):
+        cols = [key_index[key] for key in p['feature_keys']]
+        beta_add[g, cols] = p['beta'] * p['additive']
+        beta_mult[g, cols] = p['beta'] * p['multiplicative']
+        deltas[g, :len(p['deltas'])] = p['deltas']
+        changepoints[g, :len(p['changepoints_t'])] = p['changepoints_t']
+    def vec(name: str) -> np.ndarray:
+        return np.array([p[name] for p in params.values()])
+    y_scale, floor = vec('y_scale')[:, None], vec('floor')[:, None]
+
+    # 3. 구간별 선형 추세 (G × T)
+    t = (days[None, :] - vec('start_day')[:, None]) / vec('t_scale_days')[:, None]
+    active = changepoints[:, None, :] <= t[:, :, None]
+    k_t = vec('k')[:, None] + (active * deltas[:, None, :]).sum(axis=2)
+    gammas = np.where(np.isfinite(changepoints), -changepoints * deltas, 0.0)
+    m_t = vec('m')[:, None] + (active * gammas[:, None, :]).sum(axis=2)
+    trend = (k_t * t + m_t) * y_scale + floor
+
+    # 4. 계절성·공휴일 결합
+    Xb_mult = X @ beta_mult.T
+    Xb_add = X @ beta_add.T * y_scale.T
+    yhat = trend * (1 + Xb_mult.T) + Xb_add.T
+    result = {'groups': groups, 'ds': ds, 'yhat': yhat, 'trend': trend}
+    if not uncertainty:
+        return result
+
+    # 5. 예측 구간 (미래 변화점 불확실성 + 관측 잡음)
+    width = interval_width or params[groups[0]]['interval_width']
+    S = np.array([len(p['changepoints_t']) for p in params.values()])[:, None]
+    lam = np.array([np.mean(np.abs(p['deltas'])) + 1e-8 for p in params.values()])[:, None]
+    sigma = vec('sigma_obs')[:, None]
+    excess = np.clip(t - 1, 0, None)
+
+    if uncertainty == 'analytic':
+        # 복합 포아송 변화점 과정의 추세 분산: 2·S·λ²·(t-1)³/3
+        trend_var = 2 * S * lam**2 * excess**3 / 3
+        std = y_scale * np.sqrt(trend_var * (1 + Xb_mult.T)**2 + sigma**2)
+        z = NormalDist().inv_cdf((1 + width) / 2)
+        result['yhat_lower'] = yhat - z * std
+        result['yhat_upper'] = yhat + z * std
+        return result
+
+    # 몬테카를로 샘플링 (그룹 × 샘플 × 날짜)
+    if not np.all(np.diff(days) >= 0):
+        raise ValueError("샘플링 예측은 정렬된 날짜가 필요합니다.")
+    rng = np.random.default_rng(seed)
+    n = int(uncertainty)
+    dt = np.diff(excess, axis=1, prepend=0)[:, None, :]
+    counts = rng.poisson(S[:, :, None] * dt, size=(G, n, len(days)))
+    scale = lam[:, :, None] * np.ones_like(counts, dtype=float)
+    jump = rng.gamma(counts, scale) - rng.gamma(counts, scale)  # 라플라스 합
+    slope = np.cumsum(jump, axis=2)
+    trend_shift = np.cumsum((slope - jump / 2) * dt, axis=2)  # 구간 중앙 변화점 근사
+    noise = rng.normal(0, 1, size=(G, n, len(days))) * sigma[:, :, None]
+    samples = (
+        yhat[:, None, :]
+        + y_scale[:, :, None] * (trend_shift * (1 + Xb_mult.T)[:, None, :] + noise)
+    )
+    result['yhat_lower'] = np.percentile(samples, 100 * (1 - width) / 2, axis=1)
+    result['yhat_upper'] = np.percentile(samples, 100 * (1 + width) / 2, axis=1)
+    return result
+
+def fast_predict(
+    params: Dict[str, Any],
+    dates: Union[pd.Series, pd.DatetimeIndex],
+    uncertainty: Union[str, int, None] = 'analytic',
+    interval_width: Optional[float] = None,
+    seed: Optional[int] = None
+) -> pd.DataFrame:
+    """단일 그룹 예측 (model.predict 출력 형식)"""
+    result = fast_predict_batch({'group': params}, dates, uncertainty, interval_width, seed)
+    forecast = pd.DataFrame({
+        'ds': result['ds'],
+        'trend': result['trend'][0],
+        'yhat': result['yhat'][0]
+    })
+    if uncertainty:
+        forecast['yhat_lower'] = result['yhat_lower'][0]
+        forecast['yhat_upper'] = result['yhat_upper'][0]
+    return forecast
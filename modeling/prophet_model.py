@@ -1,47 +1,258 @@
 # modeling.prophet_model.py
-from prophet import Prophet
-from prophet.diagnostics import cross_validation, performance_metrics
 import pandas as pd
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple, Union
 import logging
+from modeling.scheduler import run_longest_first
+from modeling.cache_utils import DiskCache, fingerprint
+from modeling.prophet_fast import export_prophet_params, fast_predict
 logger = logging.getLogger(__name__)
 
+if TYPE_CHECKING:
+    from prophet import Prophet
+
 # 로깅 설정
 logging.getLogger('prophet').setLevel(logging.WARNING)
 
-def validate_prophet(model: Prophet, df: pd.DataFrame) -> Dict[str, float]:
-    """시간 순서 교차 검증"""
-    try:
-        # 1. 데이터 길이 검증
-        if len(df) < 52:
-            raise ValueError(f"교차 검증을 위한 충분한 데이터 없음 (필요: 52주, 현재: {len(df)}주)")
-        
-        # 2. 시간 단위 유효성 검증
-        time_units = ['day']  # '364 days'에서 추출한 단위
-        valid_units = ['day', 'hour', 'minute', 'second']
-        if any(unit not in valid_units for unit in time_units):
-            raise ValueError(f"잘못된 시간 단위: {time_units}")
-            
-        # 3. 교차 검증 실행
-        df_cv = cross_validation(
-            model,
-            initial='728 days',
-            period='91 days',
-            horizon='182 days',
-            parallel="processes"
-        )
-        
-        metrics = performance_metrics(df_cv)
-        return {
-            'mape': metrics['mape'].mean(),
-            'rmse': metrics['rmse'].mean(),
-            'coverage': metrics['coverage'].mean()
-        }
-    except Exception as e:
-        logging.error(f"검증 실패: {str(e)}")
-        return {}
+# 모델 하이퍼파라미터 (교차 검증 워커에서 동일 모델 재구성)
+PROPHET_PARAMS = {
+    'changepoint_prior_scale': 0.8,
+    'seasonality_prior_scale': 8.0,
+    'changepoint_range': 0.95,
+    'holidays_prior_scale': 8.0,
+    'seasonality_mode': 'multiplicative',
+    'yearly_seasonality': 6,
+    'weekly_seasonality': False,
+    'daily_seasonality': False,
+    'mcmc_samples': 0
+}
+
+# 교차 검증 윈도우 기본값
+CV_WINDOW = {
+    'initial': '728 days',
+    'period': '91 days',
+    'horizon': '182 days'
+}
+MIN_CV_INITIAL = '364 days'
+CV_CACHE_VERSION = 1  # fold 계산 방식 변경 시 증가
+
+def _build_prophet_model(params: Optional[Dict[str, Any]] = None) -> 'Prophet':
+    """설정 기반 Prophet 모델 생성 (한국 특화 설정 포함)"""
+    from prophet import Prophet
+    model = Prophet(**(params or PROPHET_PARAMS))
+    model.add_seasonality(name='monthly', period=30.5, fourier_order=8)
+    model.add_country_holidays(country_name='KR')
+    return model
+
+def _resolve_cv_window(
+    df: pd.DataFrame,
+    initial: str,
+    period: str,
+    horizon: str
+) -> Dict[str, pd.Timedelta]:
+    """데이터 길이에 맞춘 교차 검증 윈도우 계산"""
+    window = {
+        'initial': pd.Timedelta(initial),
+        'period': pd.Timedelta(period),
+        'horizon': pd.Timedelta(horizon)
+    }
+    span = df['ds'].max() - df['ds'].min()
+    
+    # 초기 학습 구간 축소 (최소 1년 보장)
+    if window['initial'] + window['horizon'] > span:
+        window['initial'] = span - window['horizon']
+    if window['initial'] < pd.Timedelta(MIN_CV_INITIAL):
+        raise ValueError(f"교차 검증 기간 부족 (데이터: {span.days}일, 예측 구간: {window['horizon'].days}일)")
+    return window
+
+def _generate_cutoffs(
+    df: pd.DataFrame,
+    window: Dict[str, pd.Timedelta],
+    anchor: str = 'end'
+) -> List[pd.Timestamp]:
+    """
+    cutoff 생성
+    anchor='end': Prophet 기본 방식 (마지막 날짜 기준 역산)
+    anchor='start': 시작일 기준 고정 격자 (데이터 추가 시 과거 cutoff 유지 → 캐시 재사용)
+    """
+    if anchor == 'end':
+        from prophet.diagnostics import generate_cutoffs
+        return generate_cutoffs(df, window['horizon'], window['initial'], window['period'])
+    if anchor != 'start':
+        raise ValueError(f"지원하지 않는 anchor: {anchor}")
+    
+    start, end = df['ds'].min(), df['ds'].max()
+    grid = []
+    cutoff = start + window['period']
+    while cutoff + window['horizon'] <= end:
+        grid.append(cutoff)
+        cutoff += window['period']
+    
+    # 초기 구간 이후 격자점 선택 (없으면 최소 학습 기간을 만족하는 마지막 격자점)
+    cutoffs = [c for c in grid if c - start >= window['initial']]
+    if not cutoffs and grid and grid[-1] - start >= pd.Timedelta(MIN_CV_INITIAL):
+        cutoffs = grid[-1:]
+    if not cutoffs:
+        raise ValueError("초기 구간 이후 예측 구간보다 데이터가 부족합니다.")
+    return cutoffs
+
+def build_cv_tasks(
+    style: str,
+    df: pd.DataFrame,
+    params: Optional[Dict[str, Any]] = None,
+    initial: str = CV_WINDOW['initial'],
+    period: str = CV_WINDOW['period'],
+    horizon: str = CV_WINDOW['horizon'],
+    anchor: str = 'end'
+) -> List[Dict[str, Any]]:
+    """그룹별 교차 검증 fold 작업 생성 (cutoff 단위)"""
+    # 1. 데이터 길이 검증
+    if len(df) < 52:
+        raise ValueError(f"교차 검증을 위한 충분한 데이터 없음 (필요: 52주, 현재: {len(df)}주)")
+    
+    # 2. cutoff 생성
+    window = _resolve_cv_window(df, initial, period, horizon)
+    cutoffs = _generate_cutoffs(df, window, anchor)
+    
+    # 3. fold 작업 구성 (학습 구간 / 평가 구간 분리)
+    tasks = []
+    for cutoff in cutoffs:
+        target_mask = (df['ds'] > cutoff) & (df['ds'] <= cutoff + window['horizon'])
+        tasks.append({
+            'style': style,
+            'cutoff': cutoff,
+            'history': df.loc[df['ds'] <= cutoff, ['ds', 'y']].reset_index(drop=True),
+            'target': df.loc[target_mask, ['ds', 'y']].reset_index(drop=True),
+            'params': params or PROPHET_PARAMS
+        })
+    return tasks
+
+def _cv_fold_key(task: Dict[str, Any]) -> str:
+    """fold 캐시 키 (학습·평가 구간, cutoff, 모델 설정 지문)"""
+    return fingerprint(
+        'prophet_cv', CV_CACHE_VERSION,
+        task['history'], task['target'], task['cutoff'], task['params']
+    )
+
+def _fit_cv_fold(task: Dict[str, Any]) -> Dict[str, Any]:
+    """단일 cutoff 학습 및 예측 (프로세스 풀 워커)"""
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+    if len(task['history']) < 2:
+        raise ValueError("cutoff 이전 데이터가 2개 미만입니다.")
+    
+    model = _build_prophet_model(task['params'])
+    model.fit(task['history'])
+    forecast = model.predict(task['target'][['ds']])
+    
+    fold = {
+        'forecast': pd.DataFrame({
+            'ds': forecast['ds'].values,
+            'yhat': forecast['yhat'].values,
+            'yhat_lower': forecast['yhat_lower'].values,
+            'yhat_upper': forecast['yhat_upper'].values,
+            'y': task['target']['y'].values,
+            'cutoff': task['cutoff']
+        }),
+        'model': None
+    }
+    if task.get('store_model'):
+        from prophet.serialize import model_to_json
+        fold['model'] = model_to_json(model)
+    return fold
 
-def analyze_changepoints(model: Prophet) -> pd.DataFrame:
+def _summarize_cv(df_cv: pd.DataFrame) -> Dict[str, float]:
+    """교차 검증 결과 요약"""
+    from prophet.diagnostics import performance_metrics
+    metrics = performance_metrics(df_cv)
+    return {
+        'mape': metrics['mape'].mean(),
+        'rmse': metrics['rmse'].mean(),
+        'coverage': metrics['coverage'].mean()
+    }
+
+def validate_prophet_groups(
+    frames: Dict[str, pd.DataFrame],
+    params: Optional[Dict[str, Any]] = None,
+    initial: str = CV_WINDOW['initial'],
+    period: str = CV_WINDOW['period'],
+    horizon: str = CV_WINDOW['horizon'],
+    max_workers: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    store_models: bool = False,
+    anchor: str = 'end',
+    return_folds: bool = False
+) -> Dict[str, Dict[str, float]]:
+    """
+    전체 그룹 교차 검증 (모든 그룹·cutoff fold를 하나의 프로세스 풀에서 실행)
+    Args:
+        frames: {그룹명: ds/y 컬럼 DataFrame}
+        cache_dir: fold 결과 캐시 경로 (입력 지문이 같은 fold는 재학습 생략)
+        store_models: fold 모델(JSON)도 캐시에 저장
+        anchor: cutoff 기준 ('start' 사용 시 데이터 추가 후에도 과거 fold 캐시 재사용)
+        return_folds: True면 (지표, {그룹명: fold 예측 DataFrame}) 반환
+    Returns:
+        {그룹명: {'mape', 'rmse', 'coverage'}} - 검증 실패 그룹은 빈 딕셔너리
+    """
+    results = {style: {} for style in frames}
+    cache = DiskCache(cache_dir) if cache_dir else None
+    folds = {style: [] for style in frames}
+    tasks, costs, cache_keys = {}, {}, {}
+    
+    # 1. 그룹별 fold 작업 수집 (캐시 적중 fold 제외)
+    for style, df in frames.items():
+        try:
+            for task in build_cv_tasks(style, df, params, initial, period, horizon, anchor):
+                key = (style, task['cutoff'])
+                if cache is not None:
+                    cache_keys[key] = _cv_fold_key(task)
+                    cached = cache.get(cache_keys[key])
+                    if cached is not None and (cached['model'] is not None or not store_models):
+                        folds[style].append(cached['forecast'])
+                        continue
+                task['store_model'] = store_models
+                tasks[key] = task
+                costs[key] = len(task['history'])  # 학습 길이 기준 비용 추정
+        except Exception as e:
+            logging.error(f"[{style}] 검증 실패: {str(e)}")
+    
+    if cache is not None:
+        logger.info(f"교차 검증 fold: 캐시 {sum(map(len, folds.values()))}개, 재계산 {len(tasks)}개")
+    
+    # 2. 긴 작업 우선 실행 및 완료 순 수집
+    failed = set()
+    for key, fold, error in run_longest_first(_fit_cv_fold, tasks, costs, max_workers):
+        style = key[0]
+        if error is not None:
+            failed.add(style)
+            continue
+        if cache is not None:
+            cache.set(cache_keys[key], fold)
+        folds[style].append(fold['forecast'])
+    
+    # 3. 그룹별 지표 집계
+    cv_frames = {}
+    for style, fold_list in folds.items():
+        if not fold_list or style in failed:
+            continue
+        try:
+            cv_frames[style] = pd.concat(fold_list).sort_values(['cutoff', 'ds']).reset_index(drop=True)
+            results[style] = _summarize_cv(cv_frames[style])
+        except Exception as e:
+            logging.error(f"[{style}] 검증 실패: {str(e)}")
+    return (results, cv_frames) if return_folds else results
+
+def validate_prophet(
+    df: pd.DataFrame,
+    params: Optional[Dict[str, Any]] = None,
+    initial: str = CV_WINDOW['initial'],
+    period: str = CV_WINDOW['period'],
+    horizon: str = CV_WINDOW['horizon']
+) -> Dict[str, float]:
+    """시간 순서 교차 검증 (단일 그룹)"""
+    return validate_prophet_groups(
+        {'prophet': df}, params, initial, period, horizon
+    )['prophet']
+
+def analyze_changepoints(model: 'Prophet') -> pd.DataFrame:
     """트렌드 변화점 분석 (인덱스 변환 오류 해결)"""
     changepoints = pd.to_datetime(model.changepoints)
     
@@ -59,12 +270,8 @@ def analyze_changepoints(model: Prophet) -> pd.DataFrame:
         'trend_change': model.params['delta'][:, 0]
     }).sort_values('trend_change', ascending=False)
 
-def prophet_forecast(
-    trend_series: pd.Series, 
-    date_series: pd.Series, 
-    periods: int = 26  # 기본값 설정
-) -> Dict:
-    
+def fit_prophet(trend_series: pd.Series, date_series: pd.Series) -> Tuple['Prophet', pd.DataFrame]:
+    """Prophet 학습 (데이터 검증 포함, 예측 없음) → (모델, 학습 DataFrame)"""
     # 날짜 컬럼 명시적 전달
     df = pd.DataFrame({
         'ds': date_series,
@@ -82,22 +289,8 @@ def prophet_forecast(
     if len(df) < 52:
         raise ValueError(f"데이터 부족 (필요: 52주, 현재: {len(df)}주)")
     
-    # 모델 구성
-    model = Prophet(
-        changepoint_prior_scale=0.8,
-        seasonality_prior_scale=8.0,
-        changepoint_range=0.95,
-        holidays_prior_scale=8.0,
-        seasonality_mode='multiplicative',
-        yearly_seasonality=6,
-        weekly_seasonality=False,
-        daily_seasonality=False,
-        mcmc_samples=0
-    )
-    
-    # 한국 특화 설정
-    model.add_seasonality(name='monthly', period=30.5, fourier_order=8)
-    model.add_country_holidays(country_name='KR')
+    # 모델 구성 (한국 특화 설정 포함)
+    model = _build_prophet_model()
     
     # 모델 훈련
     try:
@@ -105,15 +298,40 @@ def prophet_forecast(
     except Exception as e:
         logging.error(f"모델 훈련 실패: {str(e)}")
         raise
+    return model, df
+
+def prophet_forecast(
+    trend_series: pd.Series, 
+    date_series: pd.Series, 
+    periods: int = 26,  # 기본값 설정
+    validate: bool = True,
+    fast: bool = False,
+    uncertainty: Union[str, int, None] = 'analytic'
+) -> Dict:
+    """
+    Prophet 학습 및 예측
+    validate=False인 경우 교차 검증을 생략 (validate_prophet_groups로 일괄 실행)
+    fast=True인 경우 파라미터 추출 후 NumPy 예측 (uncertainty: 'analytic' / 샘플 수 / None)
+    """
+    model, df = fit_prophet(trend_series, date_series)
     
     # 예측 생성
     future = model.make_future_dataframe(periods=periods, freq='W')
-    forecast = model.predict(future)
+    fast_params = None
+    if fast:
+        fast_params = export_prophet_params(model)
+        forecast = fast_predict(fast_params, future['ds'], uncertainty=uncertainty)
+        if not uncertainty:
+            forecast['yhat_lower'] = forecast['yhat_upper'] = forecast['yhat']
+    else:
+        forecast = model.predict(future)
     
     # 결과 포맷팅
     return {
         'yhat': forecast['yhat'].values,  
         'forecast_details': forecast[['ds', 'yhat_lower', 'yhat_upper']],
-        'validation': validate_prophet(model, df),
-        'changepoints': analyze_changepoints(model)
+        'validation': validate_prophet(df) if validate else {},
+        'changepoints': analyze_changepoints(model),
+        'fast_params': fast_params,
+        'model': model
     }
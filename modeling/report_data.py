@@ -0,0 +1,140 @@
+# modeling/report_data.py
+import os
+import json
+import math
+import shutil
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional
+import logging
+from modeling.cache_utils import fingerprint
+logger = logging.getLogger(__name__)
+
+REPORT_DIR = 'modeling/reports'
+TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), 'templates', 'trend_report.html')
+DATA_DIR = 'data'
+INDEX_FILE = 'index.js'
+DATA_VERSION = 2  # 데이터 파일 형식 변경 시 증가
+DECIMALS = 4
+SERIES_KEYS = ('observed', 'trend', 'seasonal', 'resid')
+
+def _round(values: np.ndarray, decimals: int = DECIMALS) -> List[Optional[float]]:
+    """소수점 반올림 배열 (NaN → null)"""
+    rounded = np.round(np.asarray(values, dtype=float), decimals)
+    return [None if math.isnan(v) else v for v in rounded.tolist()]
+
+def _encode_dates(index: pd.DatetimeIndex) -> Dict[str, Any]:
+    """날짜 축 압축 (등간격이면 시작일·간격만 기록)"""
+    index = pd.DatetimeIndex(index)
+    if len(index) == 0:
+        return {'start': None, 'step_days': None, 'n': 0}
+    steps = np.diff(index.as_unit('ns').asi8)  # 입력 해상도(us 등)와 무관하게 ns 기준
+    if len(steps) == 0 or (steps == steps[0]).all():
+        step_days = float(steps[0] / 86400e9) if len(steps) else 0.0
+        return {'start': index[0].strftime('%Y-%m-%d'), 'step_days': step_days, 'n': len(index)}
+    return {'dates': index.strftime('%Y-%m-%d').tolist()}
+
+def _group_payload(
+    style: str,
+    series: Dict[str, pd.Series],
+    forecast: pd.DataFrame,
+    summary: Dict[str, Any]
+) -> Dict[str, Any]:
+    """그룹 데이터 (공통 날짜 축 + 컬럼별 값 배열)"""
+    payload = {
+        'name': style,
+        'history': {'axis': _encode_dates(series['trend'].index)},
+        'forecast': {'axis': _encode_dates(forecast['ds'])},
+        'summary': summary
+    }
+    for key in SERIES_KEYS:
+        payload['history'][key] = _round(series[key].reindex(series['trend'].index).values)
+    for col in ('yhat', 'yhat_lower', 'yhat_upper'):
+        if col in forecast:
+            payload['forecast'][col] = _round(forecast[col].values)
+    return payload
+
+def _summary(style: str, results: Optional[dict], insights: Optional[dict]) -> Dict[str, Any]:
+    """그룹 요약 지표 (평가 결과·인사이트 중 스칼라 값)"""
+    summary = {}
+    for source in (results or {}, insights or {}):
+        for key, value in source.get(style, {}).items():
+            if isinstance(value, (int, float, np.floating, np.integer)) and not isinstance(value, bool):
+                summary[key] = None if math.isnan(float(value)) else round(float(value), DECIMALS)
+            elif isinstance(value, (str, dict)):
+                summary[key] = value
+    return summary
+
+def _write_jsonp(path: str, payload: Any, callback: str) -> None:
+    """로컬 파일(file://)에서도 지연 로드 가능한 스크립트 형식으로 저장"""
+    body = json.dumps(payload, ensure_ascii=False, separators=(',', ':'), default=float)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(f'{callback}({body});\n')
+    os.replace(tmp_path, path)
+
+def _read_index(report_dir: str) -> Dict[str, Any]:
+    """기존 인덱스의 그룹별 지문 (변경 없는 그룹 데이터 재기록 생략용)"""
+    path = os.path.join(report_dir, DATA_DIR, INDEX_FILE)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read().strip()
+        payload = json.loads(text[text.index('(') + 1:text.rindex(')')])
+        return {group['name']: group for group in payload.get('groups', [])}
+    except (OSError, ValueError):
+        return {}
+
+def write_report_data(
+    decomposed: dict,
+    forecasts: dict,
+    results: Optional[dict] = None,
+    insights: Optional[dict] = None,
+    report_dir: str = REPORT_DIR,
+    title: str = '2025 라이프스타일 트렌드 리포트',
+    force: bool = False
+) -> Dict[str, Any]:
+    """
+    데이터 기반 HTML 리포트 생성
+    - data/{그룹}.js: 그룹별 시계열·예측 (압축 JSON, 화면에 보일 때 로드)
+    - data/index.js: 그룹 목록·요약 지표
+    - trend_report.html: 단일 정적 템플릿 (브라우저에서 차트 렌더링)
+    입력 지문이 기존과 같은 그룹 파일은 다시 쓰지 않음
+    Returns:
+        {'written': 새로 기록한 그룹 목록, 'skipped': 생략한 그룹 수, 'path': 리포트 경로}
+    """
+    from modeling.forecast_visualizer import _forecast_frame
+    data_dir = os.path.join(report_dir, DATA_DIR)
+    os.makedirs(data_dir, exist_ok=True)
+    previous = {} if force else _read_index(report_dir)
+
+    groups, written = [], []
+    for style in sorted(set(decomposed.keys()) & set(forecasts.keys())):
+        series = {key: decomposed[style][key] for key in SERIES_KEYS}
+        forecast = _forecast_frame(series['observed'], forecasts[style])
+        summary = _summary(style, results, insights)
+        file_name = f'{fingerprint(style)[:12]}.js'  # 그룹명 문자와 무관한 파일명
+        fp = fingerprint('report_data', DATA_VERSION, style, series, forecast, summary)
+
+        path = os.path.join(data_dir, file_name)
+        if previous.get(style, {}).get('fingerprint') != fp or not os.path.exists(path):
+            _write_jsonp(path, _group_payload(style, series, forecast, summary), 'trendReport.loadGroup')
+            written.append(style)
+        groups.append({
+            'name': style,
+            'file': f'{DATA_DIR}/{file_name}',
+            'fingerprint': fp,
+            'n_obs': len(series['trend']),
+            'summary': summary
+        })
+
+    _write_jsonp(
+        os.path.join(data_dir, INDEX_FILE),
+        {'title': title, 'version': DATA_VERSION, 'groups': groups},
+        'trendReport.loadIndex'
+    )
+    report_path = os.path.join(report_dir, 'trend_report.html')
+    shutil.copyfile(TEMPLATE_PATH, report_path)
+    logger.info(f"데이터 리포트: {len(written)}개 그룹 기록, {len(groups) - len(written)}개 생략")
+    return {'written': written, 'skipped': len(groups) - len(written), 'path': report_path}
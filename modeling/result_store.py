@@ -0,0 +1,311 @@
+# modeling/result_store.py
+"""
+실행 결과 열 지향 저장소 (SQLite, 긴 형식)
+- runs: 실행 메타데이터
+- series: (run_id, group_name, date, series, value, lower, upper)
+    series = 분해 성분(observed/trend/seasonal/resid), 예측 모델(prophet/arima/ensemble)
+             또는 학습 구간 적합값(prophet_fit)
+- metrics: (run_id, group_name, source, metric, value, label)
+    source = evaluate / decompose / weights / backtest:<모델>
+그룹·실행 기준 인덱스 조회, Arrow IPC·Parquet 내보내기 (pyarrow 필요)
+
+사용 예:
+    python -m modeling.result_store runs
+    python -m modeling.result_store export --table series --run <run_id> --output results.parquet
+    python -m modeling.result_store export --table metrics --group Lifestyle1 --output metrics.arrow
+"""
+import os
+import sys
+import json
+import uuid
+import sqlite3
+import argparse
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+import logging
+logger = logging.getLogger(__name__)
+
+RESULT_STORE_PATH = 'modeling/results/results.db'
+COMPONENTS = ('observed', 'trend', 'seasonal', 'resid')
+ARIMA_INTERVAL = 0.8  # ARIMA 예측 구간 (Prophet 기본 interval_width와 동일)
+TABLES = ('runs', 'series', 'metrics')
+ARROW_EXTENSIONS = {'.arrow': 'arrow', '.ipc': 'arrow', '.feather': 'arrow', '.parquet': 'parquet'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    n_groups INTEGER,
+    meta TEXT
+);
+CREATE TABLE IF NOT EXISTS series (
+    run_id TEXT NOT NULL,
+    group_name TEXT NOT NULL,
+    date TEXT NOT NULL,
+    series TEXT NOT NULL,
+    value REAL,
+    lower REAL,
+    upper REAL
+);
+CREATE INDEX IF NOT EXISTS series_group_run ON series (group_name, run_id, series, date);
+CREATE INDEX IF NOT EXISTS series_run_group ON series (run_id, group_name);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id TEXT NOT NULL,
+    group_name TEXT NOT NULL,
+    source TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL,
+    label TEXT
+);
+CREATE INDEX IF NOT EXISTS metrics_group_run ON metrics (group_name, run_id);
+CREATE INDEX IF NOT EXISTS metrics_run_group ON metrics (run_id, group_name);
+"""
+
+def _dates(index: Any) -> np.ndarray:
+    return pd.DatetimeIndex(index).strftime('%Y-%m-%d').to_numpy()
+
+def _floats(values: Any) -> np.ndarray:
+    return np.asarray(values, dtype=float)
+
+def _series_rows(group: str, decomposed: Dict[str, Any], forecast: Optional[Dict[str, Any]]) -> pd.DataFrame:
+    """그룹 1개의 분해 성분·예측을 긴 형식으로 변환"""
+    frames = []
+    dates = _dates(decomposed['trend'].index)
+    for component in COMPONENTS:
+        if component in decomposed:
+            values = _floats(decomposed[component].reindex(decomposed['trend'].index))
+            frames.append(pd.DataFrame({'date': dates, 'series': component, 'value': values}))
+
+    if forecast:
+        prophet = forecast.get('prophet') or {}
+        details = prophet.get('forecast_details')
+        future_dates = None
+        if details is not None and 'yhat' in prophet:
+            frame = pd.DataFrame({
+                'date': _dates(details['ds']), 'series': 'prophet', 'value': _floats(prophet['yhat']),
+                'lower': _floats(details['yhat_lower']), 'upper': _floats(details['yhat_upper'])
+            })
+            train = forecast.get('train_data')
+            if train is not None and len(train):
+                in_sample = pd.to_datetime(details['ds']).to_numpy() <= pd.to_datetime(train['date']).max().to_datetime64()
+                frame.loc[in_sample, 'series'] = 'prophet_fit'
+            frames.append(frame)
+        arima = forecast.get('arima_forecast')
+        if arima is not None and details is not None:
+            future_dates = _dates(details['ds'])[-len(arima):]
+            arima_frame = pd.DataFrame({'date': future_dates, 'series': 'arima', 'value': _floats(arima)})
+            model = forecast.get('arima_model')
+            if model is not None:
+                try:
+                    _, conf_int = model.predict(n_periods=len(arima), return_conf_int=True, alpha=1 - ARIMA_INTERVAL)
+                    arima_frame['lower'], arima_frame['upper'] = _floats(conf_int)[:, 0], _floats(conf_int)[:, 1]
+                except Exception as e:
+                    logger.warning(f"[{group}] ARIMA 예측 구간 계산 실패: {str(e)}")
+            frames.append(arima_frame)
+        ensemble = forecast.get('ensemble')
+        if ensemble is not None and future_dates is not None and len(ensemble) == len(future_dates):
+            frames.append(pd.DataFrame({'date': future_dates, 'series': 'ensemble', 'value': _floats(ensemble)}))
+
+    rows = pd.concat(frames, ignore_index=True)
+    rows.insert(0, 'group_name', group)
+    for col in ('lower', 'upper'):
+        if col not in rows:
+            rows[col] = np.nan
+    return rows[['group_name', 'date', 'series', 'value', 'lower', 'upper']]
+
+def _metric_rows(
+    group: str,
+    decomposed: Optional[Dict[str, Any]],
+    forecast: Optional[Dict[str, Any]],
+    result: Optional[Dict[str, Any]]
+) -> List[tuple]:
+    """그룹 1개의 지표 → (group_name, source, metric, value, label)"""
+    sources = {'evaluate': result or {}}
+    if decomposed:
+        sources['decompose'] = {**decomposed.get('metrics', {}), 'acf_score': decomposed.get('acf_score')}
+    if forecast:
+        sources['weights'] = forecast.get('weights') or {}
+        for model, values in (forecast.get('backtest') or {}).items():
+            sources[f'backtest:{model}'] = values
+    rows = []
+    for source, values in sources.items():
+        for metric, value in values.items():
+            if isinstance(value, (bool, int, float, np.bool_, np.integer, np.floating)):
+                rows.append((group, source, metric, float(value), None))
+            elif isinstance(value, str):
+                rows.append((group, source, metric, None, value))
+    return rows
+
+class ResultStore:
+    """
+    실행 결과 저장소
+    write_run으로 run_phase2 결과(분해·예측·평가)를 실행 단위로 기록, 조회는 DataFrame 반환
+    """
+
+    def __init__(self, path: str = RESULT_STORE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # 기록 --------------------------------------------------------------------
+    def write_run(
+        self,
+        decomposed: Dict[str, Dict],
+        forecasts: Dict[str, Dict],
+        results: Optional[Dict[str, Dict]] = None,
+        run_id: Optional[str] = None,
+        meta: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        실행 결과 기록 (같은 run_id가 있으면 교체)
+        Returns:
+            run_id (기본: 시각 + 임의 접미사)
+        """
+        run_id = run_id or f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        results = results or {}
+        groups = sorted(set(decomposed) | set(forecasts))
+
+        series = [
+            _series_rows(group, decomposed[group], forecasts.get(group))
+            for group in groups if decomposed.get(group) is not None
+        ]
+        series = pd.concat(series, ignore_index=True) if series else pd.DataFrame()
+        metrics = [
+            row for group in groups
+            for row in _metric_rows(group, decomposed.get(group), forecasts.get(group), results.get(group))
+        ]
+
+        with self._lock, self._connect() as conn:
+            conn.execute('DELETE FROM series WHERE run_id = ?', (run_id,))
+            conn.execute('DELETE FROM metrics WHERE run_id = ?', (run_id,))
+            conn.execute(
+                'INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?)',
+                (run_id, datetime.now().isoformat(), len(groups), json.dumps(meta or {}, ensure_ascii=False, default=str))
+            )
+            if not series.empty:
+                series = series.astype(object).where(series.notna(), None)
+                conn.executemany(
+                    'INSERT INTO series VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    ((run_id, *row) for row in series.itertuples(index=False, name=None))
+                )
+            conn.executemany('INSERT INTO metrics VALUES (?, ?, ?, ?, ?, ?)', ((run_id, *row) for row in metrics))
+        logger.info(f"결과 저장소 기록: {run_id} ({len(groups)}개 그룹, {len(series)}행)")
+        return run_id
+
+    def delete_run(self, run_id: str) -> None:
+        with self._lock, self._connect() as conn:
+            for table in TABLES:
+                conn.execute(f'DELETE FROM {table} WHERE run_id = ?', (run_id,))
+
+    # 조회 --------------------------------------------------------------------
+    def runs(self) -> pd.DataFrame:
+        """실행 목록 (최근 순)"""
+        with self._connect() as conn:
+            return pd.read_sql_query('SELECT * FROM runs ORDER BY created_at DESC', conn)
+
+    def latest_run(self) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute('SELECT run_id FROM runs ORDER BY created_at DESC LIMIT 1').fetchone()
+        return row[0] if row else None
+
+    def query(
+        self,
+        table: str,
+        run_id: Optional[str] = None,
+        groups: Optional[Sequence[str]] = None,
+        series: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        """
+        인덱스 조회
+        Args:
+            table: 'series' / 'metrics' / 'runs'
+            run_id: 실행 (None이면 전체 실행 이력)
+            groups: 그룹 목록 (None이면 전체)
+            series: series 테이블의 성분·모델 (None이면 전체)
+        """
+        if table not in TABLES:
+            raise ValueError(f"지원하지 않는 테이블: {table}")
+        clauses, params = [], []
+        if run_id is not None:
+            clauses.append('run_id = ?')
+            params.append(run_id)
+        if groups is not None and table != 'runs':
+            clauses.append(f"group_name IN ({','.join('?' * len(groups))})")
+            params += list(groups)
+        if series is not None and table == 'series':
+            clauses.append(f"series IN ({','.join('?' * len(series))})")
+            params += list(series)
+        sql = f'SELECT * FROM {table}' + (f" WHERE {' AND '.join(clauses)}" if clauses else '')
+        with self._connect() as conn:
+            df = pd.read_sql_query(sql, conn, params=params)
+        if 'date' in df:
+            df['date'] = pd.to_datetime(df['date'])
+        return df
+
+    def history(self, group: str, series: str = 'ensemble') -> pd.DataFrame:
+        """그룹 1개의 실행별 예측 이력 (date × run_id)"""
+        df = self.query('series', groups=[group], series=[series])
+        return df.pivot_table(index='date', columns='run_id', values='value')
+
+    # 내보내기 ----------------------------------------------------------------
+    def export(self, path: str, table: str = 'series', **filters: Any) -> str:
+        """
+        Arrow IPC(.arrow/.ipc/.feather) 또는 Parquet(.parquet)으로 내보내기
+        filters: query 인자 (run_id, groups, series)
+        """
+        fmt = ARROW_EXTENSIONS.get(os.path.splitext(path)[1].lower())
+        if fmt is None:
+            raise ValueError(f"지원하지 않는 확장자 (지원: {list(ARROW_EXTENSIONS)}): {path}")
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError("Arrow/Parquet 내보내기에는 pyarrow가 필요합니다: pip install pyarrow") from e
+        arrow_table = pa.Table.from_pandas(self.query(table, **filters), preserve_index=False)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        if fmt == 'parquet':
+            import pyarrow.parquet as pq
+            pq.write_table(arrow_table, path)
+        else:
+            import pyarrow.feather as feather
+            feather.write_feather(arrow_table, path, compression='uncompressed')  # Arrow IPC 파일
+        return path
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='실행 결과 저장소')
+    parser.add_argument('--db', default=RESULT_STORE_PATH, help='저장소 경로')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('runs')
+    export = sub.add_parser('export')
+    export.add_argument('--table', default='series', choices=TABLES)
+    export.add_argument('--run', help='실행 ID (기본: 전체 이력, latest는 최근 실행)')
+    export.add_argument('--group', action='append', help='그룹 (반복 지정)')
+    export.add_argument('--series', action='append', help='성분·모델 (반복 지정)')
+    export.add_argument('--output', required=True, help='.arrow/.ipc/.feather/.parquet')
+    args = parser.parse_args()
+
+    store = ResultStore(args.db)
+    if args.command == 'runs':
+        print(store.runs().to_string(index=False))
+        return 0
+    run_id = store.latest_run() if args.run == 'latest' else args.run
+    print(store.export(args.output, args.table, run_id=run_id, groups=args.group, series=args.series))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,18 +1,26 @@
 # modeling.run_phase2.py
+import os
 import logging
-from typing import Dict
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+import numpy as np
 import pandas as pd
-from tqdm import tqdm
-from concurrent.futures import ThreadPoolExecutor
-import joblib
+from functools import partial
 # 모듈 임포트
 from modeling.data_preprocessor import add_features, prepare_time_series, clean_data
 from modeling.stl_decomposer import decompose_trend
-from modeling.prophet_model import prophet_forecast
-from modeling.arima_model import ARIMAModel, train_arima, evaluate_arima
-from modeling.forecast_visualizer import plot_forecasts
+from modeling.prophet_model import fit_prophet, prophet_forecast, validate_prophet_groups
+from modeling.arima_model import train_arima_cached, evaluate_arima, ensemble_forecast, model_order
 from modeling.evaluator import evaluate_forecasts
 from modeling.insights_generator import generate_insights
+from modeling.scheduler import ForecastScheduler, TaskTimeout, default_workers
+from modeling.model_registry import ModelRegistry, model_signature
+from modeling.cache_utils import fingerprint
+from modeling.ensemble import arima_backtest, fit_ensemble_weights
+from modeling.backtest import summarize_backtest
+from modeling.pipeline import PIPELINE_CACHE_DIR, Pipeline, Stage
+from modeling.result_store import ResultStore
+from modeling.containers import ForecastSet
+from modeling import tracing
 
 # 로깅 설정
 logging.basicConfig(
@@ -21,178 +29,442 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def run_phase2(cleaned_df: pd.DataFrame) -> Dict:
-    """고도화된 트렌드 분석 파이프라인"""
-    
-    # 1. 데이터 전처리 --------------------------------------------------------
+PIPELINE_TARGETS = ('decompose', 'ensemble', 'evaluate', 'publish')  # run_pipeline 반환·실행 대상 단계
+MODEL_KEEP_VERSIONS = 5  # 그룹·모델별 레지스트리 보관 버전 수
+
+# 0. Phase 1 정제 (원본 수집 데이터 입력 시) ----------------------------------
+def _clean_raw(raw_df: pd.DataFrame) -> pd.DataFrame:
+    """수집 데이터 정제·검증"""
+    from processed.cleaner import clean_data as clean_raw_data
+    from processed.validator import validate_data
+    cleaned_df = clean_raw_data(raw_df)
+    validate_data(cleaned_df)
+    return cleaned_df
+
+# 1. 데이터 전처리 ------------------------------------------------------------
+def _preprocess(cleaned_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """전처리 후 그룹별 주간 시계열로 분할"""
     logger.info("=== Phase 2: 데이터 전처리 시작 ===")
     try:
-        processed_df = add_features(cleaned_df)
+        processed_df = add_features(cleaned_df.copy())
         ts_df = prepare_time_series(processed_df)
         ts_df = clean_data(ts_df)
-        
+
         # 데이터 검증
         if ts_df.empty:
             raise ValueError("전처리된 데이터가 없습니다.")
-            
+
         logger.info("\n=== 전처리 데이터 통계 ===")
         logger.info(f"그룹 수: {ts_df['group_name'].nunique()}")
         logger.info(f"시간 범위: {ts_df['date'].min()} ~ {ts_df['date'].max()}")
-        
+
     except Exception as e:
         logger.error(f"전처리 실패: {str(e)}", exc_info=True)
         raise
 
     logger.info("전처리 후 데이터 컬럼: %s", processed_df.columns.tolist())
-    logger.info("date 컬럼 샘플 값: %s", processed_df['date'].head())
-    
-    # 2. STL 분해 -----------------------------------------------------------
+    return {
+        style: group_df.reset_index(drop=True)
+        for style, group_df in ts_df.groupby('group_name', sort=False)
+    }
+
+# 2. STL 분해 -----------------------------------------------------------------
+def _decompose_groups(inputs: Dict[str, Tuple[pd.DataFrame]]) -> Dict[str, Dict]:
+    """변경된 그룹만 STL 분해"""
     logger.info("\n=== Phase 2: STL 분해 실행 ===")
-    decomposition_result = decompose_trend(ts_df)
-    decomposed_groups = decomposition_result['decompositions']  
-    
+    decomposition_result = decompose_trend(pd.concat([frame for frame, in inputs.values()], ignore_index=True))
+    decomposed_groups = decomposition_result['decompositions']
+
     # 그룹별 분해 결과 로깅
     logger.info("STL 분해 그룹 목록: %s", list(decomposed_groups.keys()))
-    
-    # 분해 결과 상세 로깅
-    logger.info("분해 품질 보고서:\n%s", 
-        decomposition_result['quality_report'].to_markdown())
-    
-    
-    
-    
-    # 3. 병렬 예측 처리 ------------------------------------------------------
+
+    # 분해 결과 상세 로깅 (표 변환은 로그 레벨이 켜진 경우에만)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("분해 품질 보고서:\n%s",
+            decomposition_result['quality_report'].to_markdown())
+    return decomposed_groups
+
+# 3. 그룹별 예측 --------------------------------------------------------------
+def _process_group(style: str, data: pd.DataFrame, arima_method: str, arima_workers: int) -> Dict:
+    """입력 데이터 검증 추가"""
+    required_cols = ['date', 'trend', 'ratio']
+    if not all(col in data.columns for col in required_cols):
+        raise ValueError(f"{style} 데이터에 {required_cols} 누락")
+    """그룹별 예측 처리"""
+    try:
+        # 데이터 분할 (컬럼 기반)
+        data = data.sort_values('date')
+        cutoff = data['date'].iloc[-26]
+        train = data[data['date'] < cutoff]
+
+        # Prophet 예측 (교차 검증은 전체 그룹 일괄 실행)
+        prophet_fcst = prophet_forecast(train['ratio'], train['date'], periods = 26, validate=False, fast=True)
+
+        # ARIMA 예측 (저장된 차수 재사용, 주기적으로만 전체 탐색)
+        arima_kwargs = {'max_workers': arima_workers} if arima_method == 'fourier' else {}
+        arima_model, arima_fcst = train_arima_cached(
+            style, train['ratio'], n_periods=26, method=arima_method, **arima_kwargs
+        )
+
+        # 시계열(학습 데이터·Prophet·ARIMA 예측)은 공통 날짜 축 배열로 묶어 반환 (프로세스 간 전달·캐시 크기 축소)
+        return ForecastSet.from_forecasts({style: {
+            'style': style,
+            'prophet': prophet_fcst,
+            'arima_model': arima_model,  # 모델 객체 반환
+            'arima_forecast': arima_fcst,
+            'train_data': train
+        }})[style]
+    except TaskTimeout:
+        raise
+    except Exception as e:
+        logger.error(f"{style} 예측 실패 상세: {str(e)}", exc_info=True)
+        return None
+
+def _fit_group(task: Dict) -> Dict:
+    """그룹 예측 (프로세스 풀 워커)"""
+    return _process_group(**task)
+
+def _forecast_groups(
+    inputs: Dict[str, Tuple[Dict]],
+    arima_method: str = 'fourier',
+    scheduler: Optional[ForecastScheduler] = None
+) -> Iterator[Tuple[str, Dict]]:
+    """그룹별 예측 (과거 소요 시간이 긴 그룹부터, 완료 순서대로 반환)"""
     logger.info("\n=== Phase 2: 병렬 예측 시작 ===")
+    scheduler = scheduler or ForecastScheduler('forecast')
+    tasks = {}
+    for style, (data,) in inputs.items():
+        # 1. 키 존재 여부
+        if 'trend' not in data or 'observed' not in data:
+            logger.error(f"{style} - 필수 데이터 누락")
+            continue
+
+        # 2. 데이터 길이 검증
+        if len(data['trend']) < 104:
+            logger.error(f"{style} - 데이터 부족 ({len(data['trend'])}주)")
+            continue
+
+        input_df = pd.DataFrame({
+            'date': pd.to_datetime(data['trend'].index),
+            'trend': data['trend'].values,
+            'ratio': data['observed'].values  # 실제 사용될 값 추가
+        })
+        tasks[style] = {'style': style, 'data': input_df, 'arima_method': arima_method}
+
+    # 그룹 프로세스 수와 ARIMA 후보 탐색 워커 수로 코어 분할
+    arima_workers = max(1, default_workers() // max(1, min(scheduler.max_workers, len(tasks))))
+    for task in tasks.values():
+        task['arima_workers'] = arima_workers
+
+    # 결과 수집 (완료 즉시 반환 → 파이프라인 캐시에 저장)
+    costs = {style: len(task['data']) for style, task in tasks.items()}
+    for style, result, error in scheduler.run(_fit_group, tasks, costs):
+        if result and result['style']:
+            tracing.count('models', 2)  # Prophet + ARIMA
+            yield result['style'], result
+
+# 4. 교차 검증·백테스트 -------------------------------------------------------
+def _train_frame(forecast: Dict) -> pd.DataFrame:
+    return pd.DataFrame({'ds': forecast['train_data']['date'], 'y': forecast['train_data']['ratio']})
+
+def _validate_groups(inputs: Dict[str, Tuple[Dict]], cache_dir: Optional[str] = None) -> Dict[str, Dict]:
+    """
+    Prophet 교차 검증 및 같은 cutoff의 ARIMA 백테스트
+    cache_dir: fold 예측 캐시 상위 경로 (파이프라인 캐시 경로, None이면 캐시 미사용)
+    """
+    # Prophet 교차 검증 (전체 그룹·cutoff 단일 프로세스 풀)
+    logger.info("\n=== Phase 2: Prophet 교차 검증 ===")
+    train_frames = {style: _train_frame(forecast) for style, (forecast,) in inputs.items()}
+    validations, cv_folds = validate_prophet_groups(
+        train_frames, cache_dir=os.path.join(cache_dir, 'prophet_cv') if cache_dir else None,
+        anchor='start', return_folds=True
+    )
+
+    # Rolling-origin 백테스트 (Prophet fold와 같은 cutoff에서 ARIMA 재추정)
+    # 차수는 forecast 단계 산출물의 모델에서 가져옴 (호스트별 차수 캐시 파일과 무관 → 샤드 재시도 호스트와 같은 결과)
+    try:
+        arima_folds = arima_backtest(
+            train_frames, cv_folds,
+            {
+                style: model_order(forecast['arima_model']) for style, (forecast,) in inputs.items()
+                if forecast.get('arima_model') is not None
+            },
+            cache_dir=os.path.join(cache_dir, 'backtest') if cache_dir else None
+        )
+    except ValueError as e:
+        logger.warning(f"ARIMA 백테스트 실패: {str(e)}")
+        arima_folds = {}
+    return {
+        style: {
+            'validation': validations.get(style),
+            'folds': {'prophet': cv_folds.get(style), 'arima': arima_folds.get(style)}
+        }
+        for style in inputs
+    }
+
+# 5. 앙상블 -------------------------------------------------------------------
+def _ensemble_groups(inputs: Dict[str, Tuple[Dict, Dict, Dict]]) -> Dict[str, Dict]:
+    """백테스트 가중치(없으면 R² 기반)로 앙상블 예측 생성"""
+    decomposed_groups = {style: decomposed for style, (decomposed, _, _) in inputs.items()}
     forecasts = {}
-    
-    def _process_group(style: str, data: pd.DataFrame) -> Dict:
-        """입력 데이터 검증 추가"""
-        required_cols = ['date', 'trend', 'ratio']
-        if not all(col in data.columns for col in required_cols):
-            raise ValueError(f"{style} 데이터에 {required_cols} 누락")
-        """그룹별 예측 처리"""
-        try:
-            # 데이터 분할 (컬럼 기반)
-            data = data.sort_values('date')
-            cutoff = data['date'].iloc[-26]
-            train = data[data['date'] < cutoff]
-            
-            # Prophet 예측
-            prophet_fcst = prophet_forecast(train['ratio'], train['date'], periods = 26)
-            
-            # ARIMA 예측
-            arima_model, arima_fcst = train_arima(train['ratio'], n_periods=26)
-            
-            return {
-                'style': style,
-                'prophet': prophet_fcst,
-                'arima_model': arima_model,  # 모델 객체 반환
-                'arima_forecast': arima_fcst,
-                'train_data': train
+    for style, (_, forecast, validation) in inputs.items():
+        forecasts[style] = forecast.copy(prophet={'validation': validation['validation']})
+
+    # Rolling-origin 앙상블 가중치
+    backtest_weights = {}
+    try:
+        member_folds = {
+            model_name: {
+                style: validation['folds'][model_name] for style, (_, _, validation) in inputs.items()
+                if validation['folds'][model_name] is not None
             }
-        except Exception as e:
-            logger.error(f"{style} 예측 실패 상세: {str(e)}", exc_info=True)
-            return None
-
-
-    # 병렬 실행
-    with ThreadPoolExecutor(max_workers=4) as executor:
-        futures = []
-        for style, data in decomposed_groups.items():
-            # 1. None 체크
-            if data is None:
-                logger.error(f"{style} - 분해 실패 데이터")
-                continue
-                
-            # 2. 키 존재 여부
-            if 'trend' not in data or 'observed' not in data:
-                logger.error(f"{style} - 필수 데이터 누락")
-                continue
-                
-            # 3. 데이터 길이 검증
-            if len(data['trend']) < 104:
-                logger.error(f"{style} - 데이터 부족 ({len(data['trend'])}주)")
-                continue
-            
-                
-            input_df = pd.DataFrame({
-                'date': pd.to_datetime(data['trend'].index),
-                'trend': data['trend'].values,
-                'ratio': data['observed'].values  # 실제 사용될 값 추가
-            })
-            futures.append(executor.submit(_process_group, style, input_df))
-            
-        # ▼▼▼ 결과 수집 추가 ▼▼▼
-        for future in tqdm(futures, desc="예측 진행률"):
-            result = future.result()
-            if result and result['style']:
-                forecasts[result['style']] = result
-
-    # 예측 전 데이터 샘플 출력
-    logger.debug("예측 입력 데이터 샘플:\n%s", input_df.head(10).to_markdown())
-    
-    # 검증
-    logger.info("분해 그룹: %s", list(decomposed_groups.keys()))
-    logger.info("예측 그룹: %s", list(forecasts.keys()))
+            for model_name in ('prophet', 'arima')
+        }
+        backtest_weights = fit_ensemble_weights(member_folds)
+        logger.info("백테스트 앙상블 가중치: %s", backtest_weights)
 
-    # 4. 성능 평가 및 리포트 생성 ---------------------------------------------
-    logger.info("\n=== Phase 2: 최종 평가 ===")
-    logger.info("분해 그룹 구조: %s", 
-    {k: list(v.keys()) for k,v in decomposed_groups.items()})
-    logger.info("예측 그룹 구조 상세: %s", 
-    {k: list(v['prophet'].keys()) for k,v in forecasts.items()})
-    
-    results = evaluate_forecasts(decomposed_groups, forecasts)
-    if results:
-        sample_style = next(iter(results.keys()))
-        print("평가 결과 샘플:", results[sample_style].keys())
-    else:
-        print("평가 결과 없음")
-    
-    # 앙상블 가중치 계산 (zero division 방지)
+        # 표본 외 정확도 (rolling-origin fold 기준)
+        backtest_summary = summarize_backtest(
+            member_folds, {style: _train_frame(forecast) for style, forecast in forecasts.items()}
+        )
+        for (model_name, style), row in backtest_summary.set_index(['model', 'group']).iterrows():
+            forecasts[style].setdefault('backtest', {})[model_name] = row.to_dict()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("백테스트 지표:\n%s", backtest_summary.round(3).to_string(index=False))
+    except ValueError as e:
+        logger.warning(f"백테스트 앙상블 가중치 계산 불가, R² 기반 가중치 사용: {str(e)}")
+
+    # 앙상블 가중치 계산 (백테스트 가중치 우선, 없으면 R² 기반 / zero division 방지)
+    # R² 기반 대체가 필요한 경우에만 사전 평가 수행
+    results = None
+    if any(style not in backtest_weights for style in forecasts):
+        results = evaluate_forecasts(decomposed_groups, forecasts)
     for style in forecasts:
-        # 가중치 계산 로직
-        prophet_score = max(results[style].get('r2', 0), 0)
-        arima_score = max(evaluate_arima(
-            forecasts[style]['arima_model'], 
-            decomposed_groups[style]['trend'][-26:]
-        ).get('r2', 0), 0)
-        
-        total = prophet_score + arima_score
-        weights = (prophet_score/total, arima_score/total) if total != 0 else (0.5, 0.5)
-        
+        if style in backtest_weights:
+            weights = (backtest_weights[style]['prophet'], backtest_weights[style]['arima'])
+        else:
+            # 평가 불가(NaN) R²는 0으로 처리 (max(nan, 0)은 nan)
+            prophet_score = max(np.nan_to_num(results[style].get('r2', 0)), 0)
+            arima_score = max(np.nan_to_num(evaluate_arima(
+                forecasts[style]['arima_model'],
+                decomposed_groups[style]['trend'][-26:]
+            ).get('r2', 0)), 0)
+
+            total = prophet_score + arima_score
+            weights = (prophet_score/total, arima_score/total) if total != 0 else (0.5, 0.5)
+
         # 데이터 길이 검증
-        prophet_len = len(forecasts[style]['prophet']['yhat']) 
-        arima_len = len(forecasts[style]['arima_forecast']) 
+        prophet_len = len(forecasts[style]['prophet']['yhat'])
+        arima_len = len(forecasts[style]['arima_forecast'])
         assert prophet_len >= 26, f"Prophet 예측 부족: {prophet_len}"
         assert arima_len == 26, f"ARIMA 예측 길이 오류: {arima_len}"
 
         # 앙상블 생성
-        forecasts[style]['ensemble'] = (
-            forecasts[style]['prophet']['yhat'][-26:] * weights[0] + 
-            forecasts[style]['arima_forecast'] * weights[1]
+        forecasts[style]['weights'] = {'prophet': weights[0], 'arima': weights[1]}
+        forecasts[style]['ensemble'] = ensemble_forecast(
+            forecasts[style]['prophet']['yhat'][-26:],
+            forecasts[style]['arima_forecast'],
+            weights
         )
-    
-    # 앙상블 후 검증
-    ensemble = forecasts[style]['ensemble']
-    if len(ensemble) != 26:
-        raise ValueError(f"{style} 앙상블 길이 오류: {len(ensemble)}")
-    if ensemble.isnull().any():
-        raise ValueError(f"{style} 앙상블에 NaN 값 존재")
-
-    # 예측 시각화 ---------------------------------------------------
-    # 앙상블 생성 후 재평가
-    updated_results = evaluate_forecasts(decomposed_groups, forecasts)  # 앙상블 포함 평가
+
+        # 앙상블 후 검증
+        ensemble = forecasts[style]['ensemble']
+        if len(ensemble) != 26:
+            raise ValueError(f"{style} 앙상블 길이 오류: {len(ensemble)}")
+        if ensemble.isnull().any():
+            raise ValueError(f"{style} 앙상블에 NaN 값 존재")
+    return forecasts
+
+# 6. 성능 평가 ----------------------------------------------------------------
+def _evaluate_groups(inputs: Dict[str, Tuple[Dict, Dict]]) -> Dict[str, Dict]:
+    """앙상블 포함 평가"""
+    logger.info("\n=== Phase 2: 최종 평가 ===")
+    return evaluate_forecasts(
+        {style: decomposed for style, (decomposed, _) in inputs.items()},
+        {style: forecast for style, (_, forecast) in inputs.items()}
+    )
+
+# 7. 서빙용 모델 (전체 관측) ---------------------------------------------------
+def _fit_production(task: Dict) -> Dict:
+    """
+    서빙용 전체 관측 모델 (프로세스 풀 워커)
+    - ARIMA: 학습 구간 모델에 검증 구간 관측 반영 (update - 최적화 반복으로 계수도 재추정)
+    - Prophet: 전체 관측으로 재학습 (예측 생략)
+    """
+    style, observed, n_train = task['style'], task['observed'], task['n_train']
+    models = {'arima': None, 'prophet': None}
+    if task['arima_model'] is not None:
+        holdout = observed.values[n_train:]
+        try:
+            models['arima'] = task['arima_model'].update(holdout) if len(holdout) else task['arima_model']
+        except Exception as e:
+            logger.warning(f"{style} 서빙용 ARIMA 갱신 실패: {str(e)}")
+    if task['prophet']:
+        try:
+            models['prophet'], _ = fit_prophet(pd.Series(observed.values), pd.Series(observed.index))
+        except Exception as e:
+            logger.warning(f"{style} 서빙용 Prophet 재학습 실패: {str(e)}")
+    return models
+
+def _production_groups(
+    inputs: Dict[str, Tuple[Dict, Dict]],
+    scheduler: Optional[ForecastScheduler] = None
+) -> Iterator[Tuple[str, Dict]]:
+    """
+    서빙용 모델 학습 (그룹 프로세스 풀, 완료 순서대로 반환)
+    Returns:
+        (그룹, {'arima', 'prophet', 'fingerprints': {종류: 등록 지문}, 'meta'})
+        지문 = 전체 관측 + 학습 구간 모델 설정 (같은 데이터라도 방법·차수·계수가 바뀌면 새 버전)
+    """
+    base = scheduler or ForecastScheduler('forecast')
+    scheduler = ForecastScheduler(
+        'production', base.max_workers, base.timeout, base.memory_limit_mb, base.history_path, base.progress
+    )
+    tasks, outputs = {}, {}
+    for style, (decomposed, forecast) in inputs.items():
+        observed = decomposed['observed']
+        full_fp = fingerprint(np.asarray(observed, dtype=float), observed.index)
+        arima_model, prophet_model = forecast.get('arima_model'), forecast['prophet'].get('model')
+        outputs[style] = {
+            'fingerprints': {
+                'arima': fingerprint(full_fp, model_signature(arima_model)) if arima_model is not None else None,
+                'prophet': fingerprint(full_fp, model_signature(prophet_model)) if prophet_model is not None else None
+            },
+            'meta': {'trained_on': 'full', 'n_obs': len(observed), 'last_date': observed.index[-1].strftime('%Y-%m-%d')}
+        }
+        tasks[style] = {
+            'style': style, 'observed': observed, 'n_train': len(forecast['train_data']),
+            'arima_model': arima_model, 'prophet': prophet_model is not None
+        }
+
+    costs = {style: len(task['observed']) for style, task in tasks.items()}
+    for style, models, error in scheduler.run(_fit_production, tasks, costs):
+        if models is not None:
+            yield style, {**outputs[style], **models}
+
+# 8. 리포트·모델 저장 (매 실행) -----------------------------------------------
+def _publish(
+    decomposed_groups: Dict,
+    forecasts: Dict,
+    updated_results: Dict,
+    production: Dict,
+    result_store: Optional[str] = None,
+    run_id: Optional[str] = None
+) -> None:
+    """인사이트 리포트 생성, 모델 레지스트리 등록, 결과 저장소 기록 (result_store 지정 시)"""
+    # 검증
+    logger.info("분해 그룹: %s", list(decomposed_groups.keys()))
+    logger.info("예측 그룹: %s", list(forecasts.keys()))
+    logger.info("예측 그룹 구조 상세: %s",
+    {k: list(v['prophet'].keys()) for k,v in forecasts.items()})
+    if updated_results:
+        sample_style = next(iter(updated_results.keys()))
+        print("평가 결과 샘플:", updated_results[sample_style].keys())
+    else:
+        print("평가 결과 없음")
     generate_insights(decomposed_groups, forecasts, updated_results)    # 최신 결과 사용
-    
-    # 모델 저장 (안전한 버전)
-    for style in forecasts:
-        if 'arima_model' in forecasts[style]:
-            joblib.dump(
-                forecasts[style]['arima_model'], 
-                f'modeling/models/{style}_arima.pkl'
+
+    # 모델 저장 (버전 레지스트리, 지문이 최신 버전과 같으면 등록 생략)
+    # 'arima'·'prophet'은 서빙용 전체 관측 모델(production 단계), 'arima_holdout'은 검증 구간을 뺀 학습 구간 모델 (다음 실행 warm start용)
+    holdout_fps = {
+        style: fingerprint(forecasts[style]['train_data'], model_signature(forecasts[style]['arima_model']))
+        for style in forecasts if forecasts[style].get('arima_model') is not None
+    }
+    registry = ModelRegistry('modeling/models', keep_versions=MODEL_KEEP_VERSIONS)
+    with registry.batch():  # 잠금 구간에서는 등록만 수행 (학습은 앞 단계에서 완료)
+        for style in forecasts:
+            models = production.get(style) or {}
+            if style in holdout_fps:
+                registry.register(
+                    style, 'arima_holdout', forecasts[style]['arima_model'], holdout_fps[style],
+                    meta={'trained_on': 'train', 'n_obs': len(forecasts[style]['train_data'])}, skip_unchanged=True
+                )
+            else:
+                logger.warning(f"{style} ARIMA 모델 저장 실패: 모델 객체 없음")
+            for kind in ('arima', 'prophet'):
+                if models.get(kind) is not None:
+                    registry.register(
+                        style, kind, models[kind], models['fingerprints'][kind], meta=models['meta'], skip_unchanged=True
+                    )
+            observed = decomposed_groups[style]['observed']
+            registry.register(
+                style, 'ensemble', forecasts[style]['weights'],
+                fingerprint(np.asarray(observed, dtype=float), observed.index), skip_unchanged=True
             )
-        else:
-            logger.warning(f"{style} ARIMA 모델 저장 실패: 모델 객체 없음")
-    
-    return decomposed_groups, forecasts, updated_results
+            tracing.count('models', 1 + (style in holdout_fps) + sum(models.get(kind) is not None for kind in ('arima', 'prophet')))
+
+    # 결과 저장소 기록 (실행별 분해·예측·지표 긴 형식, 같은 입력의 재실행은 같은 run_id로 교체)
+    if result_store:
+        ResultStore(result_store).write_run(decomposed_groups, forecasts, updated_results, run_id=run_id)
+
+def build_pipeline(
+    arima_method: str = 'fourier',
+    cache_dir: Optional[str] = PIPELINE_CACHE_DIR,
+    scheduler: Optional[ForecastScheduler] = None,
+    result_store: Optional[str] = None,
+    run_id: Optional[str] = None,
+    **pipeline_options
+) -> Pipeline:
+    """
+    Phase 1 → Phase 2 단계 DAG
+    raw → cleaned → series(그룹 분할) → decompose → forecast → validate → ensemble → evaluate → publish
+    forecast → production(서빙용 전체 관측 모델) → publish
+    scheduler: 그룹 예측 프로세스 풀 설정 (워커 수·시간 제한·메모리 한도, 캐시 키와 무관)
+    result_store: 결과 저장소 경로 (None이면 기록하지 않음), run_id: 저장소 실행 ID
+    pipeline_options: Pipeline 옵션 (keep_in_memory, progress)
+    """
+    return Pipeline([
+        Stage('cleaned', _clean_raw, deps=('raw',)),
+        Stage('series', _preprocess, deps=('cleaned',), kind='split'),
+        Stage('decompose', _decompose_groups, deps=('series',), kind='group'),
+        Stage('forecast', partial(_forecast_groups, scheduler=scheduler), deps=('decompose',), kind='group', params={'arima_method': arima_method}, version=2),
+        Stage('validate', partial(_validate_groups, cache_dir=cache_dir), deps=('forecast',), kind='group', version=2),
+        Stage('ensemble', _ensemble_groups, deps=('decompose', 'forecast', 'validate'), kind='group', version=2),
+        Stage('evaluate', _evaluate_groups, deps=('decompose', 'ensemble'), kind='group'),
+        Stage('production', partial(_production_groups, scheduler=scheduler), deps=('decompose', 'forecast'), kind='group'),
+        Stage('publish', partial(_publish, result_store=result_store, run_id=run_id), deps=('decompose', 'ensemble', 'evaluate', 'production'), cache=False),
+    ], cache_dir=cache_dir, **pipeline_options)
+
+def run_pipeline(
+    sources: Dict[str, pd.DataFrame],
+    arima_method: str = 'fourier',
+    cache_dir: Optional[str] = PIPELINE_CACHE_DIR,
+    force: Sequence[str] = (),
+    scheduler: Optional[ForecastScheduler] = None,
+    trace_dir: Optional[str] = None,
+    result_store: Optional[str] = None
+) -> Tuple[Dict, Dict, Dict]:
+    """
+    단계 캐시 파이프라인 실행 (입력·파라미터가 바뀐 그룹·단계만 재계산, 중단 시 완료된 산출물부터 재개)
+    sources: {'raw': 수집 데이터} 또는 {'cleaned': Phase 1 정제 데이터}
+    force: 캐시를 무시할 단계 (하위 단계 포함)
+    trace_dir: 지정 시 단계·그룹별 계측 결과 저장 (Chrome trace + 요약 표)
+    result_store: 지정 시 결과 저장소 기록 (실행 ID = 입력·설정 지문 → 같은 입력 재실행은 교체)
+    """
+    run_id = fingerprint('source', sources, arima_method)[:16] if result_store else None
+    pipeline = build_pipeline(arima_method, cache_dir, scheduler, result_store=result_store, run_id=run_id)
+    if trace_dir:
+        with tracing.trace(trace_dir):
+            outputs = pipeline.run(sources, targets=PIPELINE_TARGETS, force=force)
+    else:
+        outputs = pipeline.run(sources, targets=PIPELINE_TARGETS, force=force)
+    return outputs['decompose'], outputs['ensemble'], outputs['evaluate']
+
+def run_phase2(
+    cleaned_df: pd.DataFrame,
+    arima_method: str = 'fourier',
+    cache_dir: Optional[str] = PIPELINE_CACHE_DIR,
+    force: Sequence[str] = (),
+    scheduler: Optional[ForecastScheduler] = None,
+    trace_dir: Optional[str] = None,
+    result_store: Optional[str] = None
+) -> Dict:
+    """
+    고도화된 트렌드 분석 파이프라인
+    arima_method: 'fourier'(Fourier 항 + 비계절 ARIMA) / 'sarima'(52주 계절 ARIMA)
+    cache_dir: 단계 산출물 캐시 경로 (None이면 캐시 없이 전체 실행)
+    scheduler: 그룹 예측 스케줄러 (기본: 코어 수만큼 프로세스, 시간·메모리 제한 없음)
+    trace_dir: 계측 결과 저장 경로 (None이면 계측하지 않음)
+    result_store: 결과 저장소 경로 (예: 'modeling/results/results.db', None이면 기록하지 않음)
+    """
+    return run_pipeline({'cleaned': cleaned_df}, arima_method, cache_dir, force, scheduler, trace_dir, result_store)
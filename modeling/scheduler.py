@@ -0,0 +1,306 @@
+# modeling/scheduler.py
+import os
+import json
+import time
+import signal
+import statistics
+import threading
+import multiprocessing
+import logging
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+from modeling import tracing
+logger = logging.getLogger(__name__)
+
+try:
+    import resource  # 워커 메모리 한도 (Unix)
+except ImportError:
+    resource = None
+
+FIT_HISTORY_PATH = 'modeling/cache/fit_times.json'
+HISTORY_SMOOTHING = 0.5  # 과거 소요 시간 지수 평활 계수
+
+def default_workers() -> int:
+    """머신 코어 수 기준 워커 수 (CPU affinity 제한 반영)"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+def run_longest_first(
+    func: Callable[[Any], Any],
+    tasks: Dict[Hashable, Any],
+    costs: Optional[Dict[Hashable, float]] = None,
+    max_workers: Optional[int] = None
+) -> Iterator[Tuple[Hashable, Any, Optional[BaseException]]]:
+    """
+    공유 프로세스 풀에서 작업 실행 (예상 비용이 큰 작업 우선 제출)
+    Yields:
+        (작업 키, 결과, 예외) - 완료 순서대로 반환, 실패 시 결과는 None
+    """
+    if not tasks:
+        return
+    costs = costs or {}
+    order = sorted(tasks, key=lambda key: costs.get(key, 0), reverse=True)
+    workers = min(max_workers or default_workers(), len(order))
+    traced = tracing.is_enabled()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        if traced:
+            futures = {executor.submit(_run_traced, (key, func, tasks[key])): key for key in order}
+        else:
+            futures = {executor.submit(func, tasks[key]): key for key in order}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                result = future.result()
+                if traced:
+                    result, events = result
+                    tracing.merge(events)
+                yield key, result, None
+            except Exception as e:
+                logger.error(f"[{key}] 작업 실패: {str(e)}")
+                yield key, None, e
+
+class TaskTimeout(Exception):
+    """작업 시간 제한 초과"""
+
+@contextmanager
+def time_budget(seconds: Optional[float], error: type = TaskTimeout):
+    """SIGALRM 기반 시간 제한 (Unix 메인 스레드에서만 적용)"""
+    if (
+        not seconds
+        or not hasattr(signal, 'setitimer')
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        yield
+        return
+
+    def _raise_timeout(signum, frame):
+        raise error(f"시간 예산 {seconds}초 초과")
+
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+# 워커 프로세스 ---------------------------------------------------------
+def _run_traced(payload: Tuple[Hashable, Callable[[Any], Any], Any]) -> Tuple[Any, List[Dict[str, Any]]]:
+    """계측 구간 포함 작업 실행 → (결과, 워커 구간)"""
+    key, func, arg = payload
+    with tracing.capture(True) as events:
+        with tracing.span(getattr(func, '__name__', 'task'), cat='task', key=str(key)):
+            result = func(arg)
+    return result, events
+
+_started = None  # 작업 시작 알림 큐 (풀 중단 시 실행 중이던 작업 식별)
+
+def _init_worker(started: Any, memory_limit_mb: Optional[float]) -> None:
+    """워커 초기화: 시작 알림 큐 연결, 주소 공간 한도 설정"""
+    global _started
+    _started = started
+    if memory_limit_mb and resource is not None:
+        limit = int(memory_limit_mb * 1024 * 1024)
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+def _run_task(
+    payload: Tuple[Hashable, Callable[[Any], Any], Any, Optional[float], Optional[str]]
+) -> Tuple[Any, float, List[Dict[str, Any]]]:
+    """작업 1건 실행 (시간 제한 포함) → (결과, 소요 시간, 워커 계측 구간)"""
+    key, func, arg, timeout, trace_name = payload
+    if _started is not None:
+        _started.put(key)
+    started = time.perf_counter()
+    with tracing.capture(trace_name is not None) as events:
+        with tracing.span(trace_name or '', cat='group', group=str(key)), time_budget(timeout):
+            result = func(arg)
+    return result, time.perf_counter() - started, events
+
+class ForecastScheduler:
+    """
+    비용 기반 프로세스 풀 스케줄러
+    - 워커 수: 머신 코어 수 (작업 수 이하)
+    - 순서: 기록된 과거 소요 시간이 긴 작업부터 (기록 없는 작업은 가장 긴 작업으로 간주)
+    - 작업별 시간 제한(timeout), 워커 메모리 한도(memory_limit_mb, RLIMIT_AS)
+    - 워커 비정상 종료 시 실행 중이던 작업만 단일 워커로 재시도해 원인 작업 격리
+    - 완료 순서대로 결과 반환, 진행률 표시
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        memory_limit_mb: Optional[float] = None,
+        history_path: Optional[str] = FIT_HISTORY_PATH,
+        progress: bool = True
+    ):
+        self.name = name
+        self.max_workers = max_workers or default_workers()
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.history_path = history_path
+        self.progress = progress
+        self._history = None
+
+    # 소요 시간 기록 -------------------------------------------------------
+    @property
+    def history(self) -> Dict[str, float]:
+        """작업 키별 과거 소요 시간(초)"""
+        if self._history is None:
+            self._history = self._read_history().get(self.name, {})
+        return self._history
+
+    def _read_history(self) -> Dict[str, Dict[str, float]]:
+        if not self.history_path or not os.path.exists(self.history_path):
+            return {}
+        try:
+            with open(self.history_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_history(self) -> None:
+        if not self.history_path:
+            return
+        payload = self._read_history()
+        payload[self.name] = self.history
+        os.makedirs(os.path.dirname(self.history_path) or '.', exist_ok=True)
+        tmp_path = f'{self.history_path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.history_path)
+
+    def _record(self, key: Hashable, elapsed: float) -> None:
+        previous = self.history.get(str(key))
+        self.history[str(key)] = round(
+            elapsed if previous is None else HISTORY_SMOOTHING * elapsed + (1 - HISTORY_SMOOTHING) * previous, 3
+        )
+
+    def order(self, keys: List[Hashable], costs: Optional[Dict[Hashable, float]] = None) -> List[Hashable]:
+        """예상 소요 시간 내림차순 (기록 없는 작업 우선, 동률은 costs 순)"""
+        costs = costs or {}
+        known = [self.history[str(key)] for key in keys if str(key) in self.history]
+        default = max(known) if known else 0.0
+        return sorted(
+            keys,
+            key=lambda key: (str(key) not in self.history, self.history.get(str(key), default), costs.get(key, 0)),
+            reverse=True
+        )
+
+    # 실행 -----------------------------------------------------------------
+    def _run_pool(
+        self,
+        func: Callable[[Any], Any],
+        tasks: Dict[Hashable, Any],
+        keys: List[Hashable],
+        workers: int,
+        in_flight: set
+    ) -> Iterator[Tuple[Hashable, Any, Optional[BaseException]]]:
+        """
+        프로세스 풀 1회 실행
+        풀이 중단되면 그 시점에 실행 중이던 작업을 in_flight에 남기고 종료 (나머지는 호출자가 재제출)
+        """
+        ctx = multiprocessing.get_context()
+        started = ctx.SimpleQueue()
+        done = set()
+        trace_name = self.name if tracing.is_enabled() else None
+
+        def drain() -> None:
+            while not started.empty():
+                in_flight.add(started.get())
+
+        executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=ctx,
+            initializer=_init_worker, initargs=(started, self.memory_limit_mb)
+        )
+        try:
+            futures = {
+                executor.submit(_run_task, (key, func, tasks[key], self.timeout, trace_name)): key for key in keys
+            }
+            for future in as_completed(futures):
+                key = futures[future]
+                drain()
+                try:
+                    result, elapsed, events = future.result()
+                except BrokenProcessPool:
+                    in_flight.difference_update(done)
+                    return
+                except Exception as e:
+                    in_flight.discard(key)
+                    done.add(key)
+                    logger.error(f"[{self.name}:{key}] 작업 실패: {type(e).__name__}: {str(e)}")
+                    yield key, None, e
+                else:
+                    in_flight.discard(key)
+                    done.add(key)
+                    self._record(key, elapsed)
+                    tracing.merge(events)
+                    yield key, result, None
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            started.close()
+
+    def run(
+        self,
+        func: Callable[[Any], Any],
+        tasks: Dict[Hashable, Any],
+        costs: Optional[Dict[Hashable, float]] = None
+    ) -> Iterator[Tuple[Hashable, Any, Optional[BaseException]]]:
+        """
+        작업 실행
+        Args:
+            func: 모듈 수준 함수 (프로세스 간 전달 가능)
+            tasks: {작업 키: 인자}
+            costs: 기록이 없을 때 참고할 상대 비용
+        Yields:
+            (작업 키, 결과, 예외) - 완료 순서대로 반환, 실패 시 결과는 None
+        """
+        if not tasks:
+            return
+        pending = self.order(list(tasks), costs)
+        workers = min(self.max_workers, len(pending))
+        suspects = []
+
+        bar = None
+        if self.progress:
+            from tqdm import tqdm
+            bar = tqdm(total=len(pending), desc=f"{self.name} 진행률")
+        try:
+            # 1. 전체 풀 실행 (워커 비정상 종료 시 실행 중이던 작업을 보류하고 나머지 재제출)
+            while pending:
+                in_flight = set()
+                for key, result, error in self._run_pool(func, tasks, pending, workers, in_flight):
+                    pending.remove(key)
+                    if bar is not None:
+                        bar.update(1)
+                    yield key, result, error
+                if not pending:
+                    break
+                broken = [key for key in pending if key in in_flight] or pending[:workers]
+                logger.warning(f"[{self.name}] 워커 비정상 종료, 격리 재시도 대상: {broken}")
+                suspects += broken
+                pending = [key for key in pending if key not in broken]
+
+            # 2. 보류 작업 단일 워커 재시도 (다시 중단되면 해당 작업만 실패 처리)
+            for key in suspects:
+                outcome = None
+                for outcome in self._run_pool(func, tasks, [key], 1, set()):
+                    yield outcome
+                if outcome is None:
+                    error = BrokenProcessPool(f"[{key}] 워커 비정상 종료 (메모리 한도 초과 또는 강제 종료)")
+                    logger.error(str(error))
+                    yield key, None, error
+                if bar is not None:
+                    bar.update(1)
+        finally:
+            if bar is not None:
+                bar.close()
+            self._save_history()
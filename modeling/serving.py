@@ -0,0 +1,332 @@
+# modeling/serving.py
+"""
+로컬 예측 서비스 (모델 레지스트리 기반)
+- 그룹별 최신 모델(Prophet·ARIMA·앙상블 가중치)을 로드해 최대 horizon까지 평균·표준편차를 미리 계산
+  서빙 모델은 전체 관측 기준 (Prophet: 전체 관측 재학습, ARIMA: 학습 구간 모델을 검증 구간 관측으로 갱신)
+  → 예측은 마지막 관측 다음 주부터, 학습 구간 모델('arima_holdout')은 서빙에 사용하지 않음
+  Prophet은 같은 날짜 축의 그룹을 fast_predict_batch로 일괄 계산
+- 조회는 미리 계산한 배열 슬라이스 + 정규 분위수 (그룹 × 기간 × 분위수)
+- 자주 조회되는 그룹은 LRU 캐시에 유지, 레지스트리에 새 버전이 등록되면 해당 그룹만 재로드
+
+사용 예:
+    python -m modeling.serving --models modeling/models --port 8766 --warm
+    curl 'localhost:8766/forecast?groups=Lifestyle1,Lifestyle2&horizon=8&quantiles=0.1,0.5,0.9'
+    curl -X POST localhost:8766/forecast -d '{"groups": ["Lifestyle1"], "horizon": 12, "model": "arima"}'
+"""
+import sys
+import json
+import time
+import argparse
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from statistics import NormalDist
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import parse_qs, urlparse
+import logging
+from modeling.model_registry import ModelRegistry
+logger = logging.getLogger(__name__)
+
+SERVING_HORIZON = 52  # 미리 계산하는 최대 예측 기간(주)
+CACHE_SIZE = 256  # LRU 캐시 그룹 수
+RELOAD_INTERVAL = 5.0  # 레지스트리 변경 확인 간격(초)
+MODEL_KINDS = ('prophet', 'arima', 'ensemble')
+ONE_SIGMA = NormalDist().cdf(1) - NormalDist().cdf(-1)  # ±1σ 구간 비율
+
+def _prophet_moments(models: Dict[str, Any], horizon: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Prophet 미래 구간 평균·표준편차 (마지막 학습일이 같은 그룹끼리 일괄 계산)
+    Returns:
+        {그룹: {'dates', 'mean', 'std'}}
+    """
+    from modeling.prophet_fast import export_prophet_params, fast_predict_batch
+    buckets = {}
+    for group, model in models.items():
+        buckets.setdefault(model.history['ds'].max(), {})[group] = export_prophet_params(model)
+
+    moments = {}
+    for last_date, params in buckets.items():
+        dates = pd.date_range(last_date, periods=horizon + 1, freq='W')[1:]  # make_future_dataframe와 동일
+        result = fast_predict_batch(params, dates, uncertainty='analytic', interval_width=ONE_SIGMA)
+        for g, group in enumerate(result['groups']):
+            moments[group] = {
+                'dates': dates,
+                'mean': result['yhat'][g],
+                'std': result['yhat_upper'][g] - result['yhat'][g]
+            }
+    return moments
+
+def _arima_moments(model: Any, horizon: int) -> Dict[str, np.ndarray]:
+    """ARIMA 평균·표준편차 (±1σ 신뢰구간에서 환산)"""
+    mean, conf_int = model.predict(n_periods=horizon, return_conf_int=True, alpha=1 - ONE_SIGMA)
+    mean = np.asarray(mean, dtype=float)
+    return {'mean': mean, 'std': np.asarray(conf_int, dtype=float)[:, 1] - mean}
+
+class ForecastService:
+    """
+    레지스트리 모델 기반 예측 조회
+    앙상블 구간은 두 모델 오차가 독립인 정규분포라는 가정으로 결합 (σ² = Σ wᵢ²σᵢ²)
+    """
+
+    def __init__(
+        self,
+        registry_root: str = 'modeling/models',
+        cache_size: int = CACHE_SIZE,
+        horizon: int = SERVING_HORIZON,
+        reload_interval: float = RELOAD_INTERVAL
+    ):
+        self.registry = ModelRegistry(registry_root)
+        self.cache_size = cache_size
+        self.horizon = horizon
+        self.reload_interval = reload_interval
+        self._cache = OrderedDict()  # 그룹 → 미리 계산한 예측 (최근 조회 순)
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._stop = threading.Event()
+        self.stats = {'hits': 0, 'misses': 0, 'loads': 0, 'reloads': 0, 'evictions': 0}
+
+    # 모델 로드 ---------------------------------------------------------------
+    def _versions(self, group: str) -> Dict[str, int]:
+        return {kind: self.registry.versions(group, kind)[-1]['version'] for kind in MODEL_KINDS if (group, kind) in self.registry}
+
+    def _build(self, groups: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """그룹별 최신 모델 로드 → 평균·표준편차 계산"""
+        versions = {group: self._versions(group) for group in groups}
+        entries = {group: {'versions': versions[group], 'models': {}} for group in groups if versions[group]}
+
+        prophet_models = {}
+        for group, entry in entries.items():
+            version = entry['versions'].get('prophet')
+            if version is not None:
+                prophet_models[group] = self.registry.load(group, 'prophet', version)
+            if 'arima' in entry['versions']:
+                try:
+                    entry['models']['arima'] = _arima_moments(
+                        self.registry.load(group, 'arima', entry['versions']['arima']), self.horizon
+                    )
+                except Exception as e:
+                    logger.error(f"[{group}] ARIMA 예측 실패: {str(e)}")
+            if 'ensemble' in entry['versions']:
+                entry['weights'] = self.registry.load(group, 'ensemble', entry['versions']['ensemble'])
+        try:
+            prophet = _prophet_moments(prophet_models, self.horizon) if prophet_models else {}
+        except ValueError as e:
+            logger.error(f"Prophet 일괄 예측 실패: {str(e)}")
+            prophet = {}
+
+        for group, entry in entries.items():
+            models = entry['models']
+            if group in prophet:
+                entry['dates'] = prophet[group]['dates']
+                models['prophet'] = {'mean': prophet[group]['mean'], 'std': prophet[group]['std']}
+            weights = entry.get('weights')
+            if weights and 'prophet' in models and 'arima' in models:
+                wp, wa = weights['prophet'], weights['arima']
+                models['ensemble'] = {
+                    'mean': wp * models['prophet']['mean'] + wa * models['arima']['mean'],
+                    'std': np.sqrt((wp * models['prophet']['std']) ** 2 + (wa * models['arima']['std']) ** 2)
+                }
+        self.stats['loads'] += len(entries)
+        return entries
+
+    def _get(self, groups: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """캐시 조회, 없는 그룹은 일괄 로드 후 캐시 (초과 시 가장 오래 조회되지 않은 그룹 제거)"""
+        found, missing = {}, []
+        with self._lock:
+            for group in groups:
+                if group in self._cache:
+                    self._cache.move_to_end(group)
+                    found[group] = self._cache[group]
+                else:
+                    missing.append(group)
+            self.stats['hits'] += len(found)
+            self.stats['misses'] += len(missing)
+        if missing:
+            with self._build_lock:
+                built = self._build(missing)
+            with self._lock:
+                for group, entry in built.items():
+                    self._cache[group] = entry
+                    self._cache.move_to_end(group)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+                    self.stats['evictions'] += 1
+            found.update(built)
+        return found
+
+    def warm(self, groups: Optional[Sequence[str]] = None) -> int:
+        """그룹 미리 로드 (기본: 레지스트리 전체, 캐시 크기까지)"""
+        groups = list(groups or self.registry.styles())[:self.cache_size]
+        return len(self._get(groups))
+
+    # 조회 --------------------------------------------------------------------
+    def forecast(
+        self,
+        groups: Sequence[str],
+        horizon: Optional[int] = None,
+        quantiles: Sequence[float] = (),
+        model: str = 'ensemble'
+    ) -> Dict[str, Any]:
+        """
+        그룹 × 기간 × 분위수 예측
+        Returns:
+            {'horizon', 'model', 'groups': {그룹: {'dates', 'mean', 'quantiles': {q: 값}, 'versions'}}, 'missing'}
+        """
+        horizon = horizon or self.horizon
+        if not 1 <= horizon <= self.horizon:
+            raise ValueError(f"horizon은 1~{self.horizon} 범위여야 합니다: {horizon}")
+        if model not in MODEL_KINDS:
+            raise ValueError(f"지원하지 않는 모델: {model}")
+        if any(not 0 < q < 1 for q in quantiles):
+            raise ValueError(f"분위수는 0과 1 사이여야 합니다: {list(quantiles)}")
+        z = {q: NormalDist().inv_cdf(q) for q in quantiles}
+
+        entries = self._get(groups)
+        response = {'horizon': horizon, 'model': model, 'groups': {}, 'missing': []}
+        for group in groups:
+            entry = entries.get(group)
+            moments = entry['models'].get(model) if entry else None
+            if moments is None:
+                response['missing'].append(group)
+                continue
+            mean, std = moments['mean'][:horizon], moments['std'][:horizon]
+            dates = entry.get('dates')
+            response['groups'][group] = {
+                'dates': [d.strftime('%Y-%m-%d') for d in dates[:horizon]] if dates is not None else None,
+                'mean': mean.round(4).tolist(),
+                'quantiles': {str(q): (mean + z[q] * std).round(4).tolist() for q in quantiles},
+                'versions': entry['versions']
+            }
+        return response
+
+    # 재로드 ------------------------------------------------------------------
+    def check_reload(self) -> List[str]:
+        """캐시된 그룹 중 새 버전이 등록된 그룹 재로드"""
+        with self._lock:
+            cached = {group: entry['versions'] for group, entry in self._cache.items()}
+        stale = [group for group, versions in cached.items() if self._versions(group) != versions]
+        if stale:
+            with self._build_lock:
+                built = self._build(stale)
+            with self._lock:
+                for group in stale:
+                    if group in built and group in self._cache:
+                        self._cache[group] = built[group]
+                    else:
+                        self._cache.pop(group, None)
+            self.stats['reloads'] += len(stale)
+            logger.info(f"새 모델 버전 반영: {stale}")
+        return stale
+
+    def watch(self) -> threading.Thread:
+        """레지스트리 변경 감시 스레드 시작"""
+        def loop() -> None:
+            while not self._stop.wait(self.reload_interval):
+                try:
+                    self.check_reload()
+                except Exception as e:
+                    logger.error(f"모델 재로드 실패: {str(e)}", exc_info=True)
+        thread = threading.Thread(target=loop, daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    # HTTP --------------------------------------------------------------------
+    def serve(self, host: str = '127.0.0.1', port: int = 8766) -> ThreadingHTTPServer:
+        """예측 HTTP 서버 (백그라운드 스레드)"""
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send(self, code: int, payload: Dict[str, Any]) -> None:
+                body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _forecast(self, query: Dict[str, Any]) -> None:
+                started = time.perf_counter()
+                try:
+                    response = service.forecast(
+                        query['groups'], query.get('horizon'), query.get('quantiles', ()), query.get('model', 'ensemble')
+                    )
+                except (KeyError, TypeError, ValueError) as e:
+                    self._send(400, {'error': f"{type(e).__name__}: {str(e)}"})
+                    return
+                response['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 3)
+                self._send(200, response)
+
+            def do_GET(self) -> None:
+                url = urlparse(self.path)
+                if url.path == '/health':
+                    self._send(200, {'cached': len(service._cache), **service.stats})
+                elif url.path == '/groups':
+                    self._send(200, {'groups': service.registry.styles()})
+                elif url.path == '/forecast':
+                    params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                    try:
+                        query = {
+                            'groups': [g for g in params.get('groups', '').split(',') if g],
+                            'horizon': int(params['horizon']) if 'horizon' in params else None,
+                            'quantiles': [float(q) for q in params.get('quantiles', '').split(',') if q],
+                            'model': params.get('model', 'ensemble')
+                        }
+                    except ValueError as e:
+                        self._send(400, {'error': str(e)})
+                        return
+                    self._forecast(query)
+                else:
+                    self._send(404, {'error': 'not found'})
+
+            def do_POST(self) -> None:
+                if urlparse(self.path).path != '/forecast':
+                    self._send(404, {'error': 'not found'})
+                    return
+                try:
+                    query = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                except ValueError as e:
+                    self._send(400, {'error': f"JSON 파싱 실패: {str(e)}"})
+                    return
+                self._forecast(query)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug(format % args)
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        logger.info(f"예측 서버: http://{host}:{server.server_address[1]}/forecast")
+        return server
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='로컬 예측 서비스')
+    parser.add_argument('--models', default='modeling/models', help='모델 레지스트리 경로')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE, help='LRU 캐시 그룹 수')
+    parser.add_argument('--horizon', type=int, default=SERVING_HORIZON, help='최대 예측 기간(주)')
+    parser.add_argument('--reload-interval', type=float, default=RELOAD_INTERVAL, help='레지스트리 변경 확인 간격(초)')
+    parser.add_argument('--warm', action='store_true', help='시작 시 전체 그룹 미리 로드')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    service = ForecastService(args.models, args.cache_size, args.horizon, args.reload_interval)
+    if args.warm:
+        logger.info(f"미리 로드한 그룹: {service.warm()}")
+    server = service.serve(args.host, args.port)
+    service.watch()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.shutdown()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
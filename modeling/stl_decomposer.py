@@ -1,25 +1,31 @@
 # modeling.stl_decomposer.py
-from statsmodels.tsa.seasonal import STL
-from statsmodels.tsa.stattools import adfuller, acf
 import pandas as pd
 import numpy as np
 from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, Tuple
+from modeling.containers import DecompositionSet
 import logging
 logger = logging.getLogger(__name__)
 
 def _calculate_acf(resid: pd.Series, nlags: int = 10) -> float:
     """잔차 자기상관 함수 계산"""
+    from statsmodels.tsa.stattools import acf
     acf_values = acf(resid, nlags=nlags, fft=False)
     return np.mean(np.abs(acf_values[1:]))  # 0차 항 제외
 
 def _check_stationarity(series: pd.Series, threshold: float = 0.05) -> bool:
     """ADF 검정을 통한 정상성 확인"""
+    from statsmodels.tsa.stattools import adfuller
     result = adfuller(series.dropna())
     return result[1] < threshold
 
-def _decompose_group(args: Tuple[str, pd.DataFrame, int]) -> Dict:
-    """그룹별 분해 병렬 처리"""
+def _decompose_group(args: Tuple[str, pd.DataFrame, int]) -> DecompositionSet:
+    """그룹별 분해 병렬 처리 (프로세스 간 전달은 구조체 배열 컨테이너)"""
+    return DecompositionSet.from_decompositions(_decompose_single(args))
+
+def _decompose_single(args: Tuple[str, pd.DataFrame, int]) -> Dict:
+    """그룹 1개 STL 분해"""
+    from statsmodels.tsa.seasonal import STL
     group_name, group_df, period = args
     
     # 1. NaN/Inf 값 최종 정제
@@ -85,7 +91,7 @@ def decompose_trend(df: pd.DataFrame, period: int = None) -> Dict:
     STL 분해를 통해 계절성, 추세, 잔차 분리
     Returns:
         {
-            'decompositions': {
+            'decompositions': DecompositionSet {  # 그룹별 뷰 (to_pandas()로 dict 변환)
                 '그룹명': {
                     'observed': pd.Series,
                     'trend': pd.Series,
@@ -98,7 +104,7 @@ def decompose_trend(df: pd.DataFrame, period: int = None) -> Dict:
             'quality_report': pd.DataFrame
         }
     """
-    results = {}
+    parts = []
     
     # 그룹별 병렬 처리 준비
     tasks = []
@@ -107,7 +113,8 @@ def decompose_trend(df: pd.DataFrame, period: int = None) -> Dict:
         
         # ▼▼▼ 로깅 추가 ▼▼▼
         logger.info(f"[{style}] 데이터 길이: {len(style_df)}주")
-        logger.debug(f"데이터 통계:\n{style_df['ratio'].describe().to_string()}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"데이터 통계:\n{style_df['ratio'].describe().to_string()}")
         
         # 주기 자동 계산 (최소 1년 주기 보장)
         auto_period = period if period else max(52, len(style_df)//2)
@@ -120,11 +127,10 @@ def decompose_trend(df: pd.DataFrame, period: int = None) -> Dict:
         # 결과 수집
         for future in futures:
             try:
-                result = future.result()
-                if result is not None:
-                    results.update(result)
+                parts.append(future.result())
             except Exception as e:
                 logger.error(f"분해 오류: {str(e)}", exc_info=True)
+    results = DecompositionSet.concat(parts) if parts else DecompositionSet.from_decompositions({})
 
     # 품질 보고서 생성
     quality_data = []
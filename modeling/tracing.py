@@ -0,0 +1,181 @@
+# modeling/tracing.py
+"""
+파이프라인 계측 (단계·그룹별 시간 구간, 최대 RSS, 행·모델 수)
+- 비활성 상태에서는 span/count가 즉시 반환 (계측 비용 없음)
+- 워커 프로세스 구간은 capture()로 수집해 결과와 함께 부모로 전달 → merge()
+- Chrome trace(JSON, chrome://tracing·Perfetto) 및 요약 표 출력
+
+사용 예:
+    with tracing.trace('modeling/reports/trace'):
+        run_phase2(df)
+"""
+import os
+import json
+import time
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+import pandas as pd
+import logging
+logger = logging.getLogger(__name__)
+
+try:
+    import resource  # 최대 RSS (Unix)
+except ImportError:
+    resource = None
+
+TRACE_DIR = 'modeling/reports/trace'
+TRACE_FILE = 'trace.json'
+SUMMARY_FILE = 'trace_summary.csv'
+
+_enabled = False
+_events = []  # Chrome trace 이벤트
+_lock = threading.Lock()
+_local = threading.local()  # 스레드별 활성 구간 스택
+
+def _now_us() -> float:
+    return time.perf_counter_ns() / 1000
+
+def peak_rss_mb(children: bool = False) -> Optional[float]:
+    """현재 프로세스 최대 RSS(MB) (children=True: 종료된 자식 프로세스 중 최대)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if os.uname().sysname == 'Darwin' else 1024), 1)
+
+def is_enabled() -> bool:
+    return _enabled
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+def reset() -> None:
+    with _lock:
+        _events.clear()
+
+def _stack() -> List[Dict[str, Any]]:
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+@contextmanager
+def span(name: str, cat: str = 'stage', **args: Any) -> Iterator[None]:
+    """시간 구간 기록 (종료 시 최대 RSS 포함)"""
+    if not _enabled:
+        yield
+        return
+    event = {
+        'name': name, 'cat': cat, 'ph': 'X', 'ts': _now_us(),
+        'pid': os.getpid(), 'tid': threading.get_ident(), 'args': dict(args)
+    }
+    stack = _stack()
+    stack.append(event)
+    try:
+        yield
+    finally:
+        stack.pop()
+        event['dur'] = _now_us() - event['ts']
+        event['args']['peak_rss_mb'] = peak_rss_mb()
+        with _lock:
+            _events.append(event)
+
+def count(key: str, value: float = 1) -> None:
+    """현재 구간에 수량 누적 (행 수·모델 수 등)"""
+    if not _enabled:
+        return
+    stack = _stack()
+    if stack:
+        args = stack[-1]['args']
+        args[key] = args.get(key, 0) + value
+
+@contextmanager
+def capture(enabled: bool) -> Iterator[List[Dict[str, Any]]]:
+    """
+    워커 프로세스 구간 수집
+    부모의 활성 여부를 전달받아 해당 블록에서만 기록, 종료 시 수집된 이벤트를 목록에 채움
+    """
+    events = []
+    if not enabled:
+        yield events
+        return
+    global _enabled
+    previous, _enabled = _enabled, True
+    with _lock:
+        start = len(_events)
+    try:
+        yield events
+    finally:
+        with _lock:
+            events.extend(_events[start:])
+            del _events[start:]
+        _enabled = previous
+
+def merge(events: List[Dict[str, Any]]) -> None:
+    """워커에서 수집한 구간 병합"""
+    if _enabled and events:
+        with _lock:
+            _events.extend(events)
+
+def events() -> List[Dict[str, Any]]:
+    with _lock:
+        return list(_events)
+
+def export_chrome(path: str) -> str:
+    """Chrome trace 형식 저장"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    payload = {'traceEvents': events(), 'displayTimeUnit': 'ms'}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, default=str)
+    return path
+
+def summary() -> pd.DataFrame:
+    """
+    구간 이름별 요약
+    Returns:
+        name, cat, calls, total_s, mean_s, max_s, peak_rss_mb 및 누적 수량 컬럼 (total_s 내림차순)
+    """
+    rows = defaultdict(lambda: defaultdict(float))
+    for event in events():
+        row = rows[(event['name'], event['cat'])]
+        row['calls'] += 1
+        row['total_s'] += event['dur'] / 1e6
+        row['max_s'] = max(row['max_s'], event['dur'] / 1e6)
+        for key, value in event['args'].items():
+            if key == 'peak_rss_mb':
+                row[key] = max(row[key], value or 0)
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                row[key] += value
+    if not rows:
+        return pd.DataFrame(columns=['name', 'cat', 'calls', 'total_s', 'mean_s', 'max_s', 'peak_rss_mb'])
+    df = pd.DataFrame([{'name': name, 'cat': cat, **row} for (name, cat), row in rows.items()])
+    df['mean_s'] = df['total_s'] / df['calls']
+    df = df.fillna(0).astype({'calls': int})
+    leading = ['name', 'cat', 'calls', 'total_s', 'mean_s', 'max_s', 'peak_rss_mb']
+    df = df[leading + [col for col in df.columns if col not in leading]]
+    return df.sort_values('total_s', ascending=False).reset_index(drop=True)
+
+@contextmanager
+def trace(output_dir: Optional[str] = TRACE_DIR) -> Iterator[None]:
+    """블록 실행 계측 후 Chrome trace·요약 표 저장 (output_dir이 None이면 로그만)"""
+    previous = _enabled
+    reset()
+    enable()
+    try:
+        with span('run', cat='run'):
+            yield
+    finally:
+        if not previous:
+            disable()
+        table = summary()
+        if output_dir:
+            export_chrome(os.path.join(output_dir, TRACE_FILE))
+            table.to_csv(os.path.join(output_dir, SUMMARY_FILE), index=False)
+            logger.info(f"계측 결과 저장: {output_dir}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("단계별 소요 시간:\n%s", table.round(3).to_string(index=False))
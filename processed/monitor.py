@@ -1,6 +1,4 @@
 # monitor.py 
-import seaborn as sns
-import matplotlib.pyplot as plt
 from datetime import datetime
 import pandas as pd
 import numpy as np
@@ -19,7 +17,9 @@ def update_dashboard(df: pd.DataFrame) -> pd.DataFrame:
     groups = df['group_name'].unique()
     print(f"표시할 그룹: {groups}")
     
-    # 그래프 생성
+    # 그래프 생성 (시각화 라이브러리는 호출 시점에 로드)
+    import seaborn as sns
+    import matplotlib.pyplot as plt
     sns.set_theme(style="whitegrid")
     plt.figure(figsize=(15, 6))
     # 데이터를 복사하여 처리
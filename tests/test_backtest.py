@@ -0,0 +1,40 @@
+# tests/test_backtest.py
+import numpy as np
+import pandas as pd
+from modeling.backtest import stack_backtests
+
+def _fold(cutoff: str, horizon: int, offset: float) -> pd.DataFrame:
+    """cutoff 다음 주부터 horizon개 예측 (yhat = 실측 + offset)"""
+    ds = pd.date_range(pd.Timestamp(cutoff) + pd.Timedelta(weeks=1), periods=horizon, freq='W')
+    y = np.arange(horizon, dtype=float) + pd.Timestamp(cutoff).dayofyear
+    return pd.DataFrame({'ds': ds, 'yhat': y + offset, 'y': y, 'cutoff': pd.Timestamp(cutoff)})
+
+def test_stack_aligns_members_on_cutoff_date():
+    """모델별 fold 집합이 달라도 같은 cutoff·날짜끼리만 정렬"""
+    c0, c2 = '2024-01-07', '2024-07-07'
+    member_folds = {
+        'prophet': {'A': pd.concat([_fold(c0, 3, 1.0), _fold(c2, 3, 1.0)], ignore_index=True)},
+        'arima': {'A': _fold(c2, 3, 2.0)}
+    }
+    groups, members, preds, actual = stack_backtests(member_folds)
+    assert groups == ['A'] and members == ['prophet', 'arima']
+
+    valid = ~np.isnan(actual[0])
+    assert valid.sum() == 3
+    expected = _fold(c2, 3, 0.0)['y'].to_numpy()
+    np.testing.assert_allclose(actual[0][valid], expected)
+    np.testing.assert_allclose(preds['yhat'][0, 0][valid], expected + 1.0)
+    np.testing.assert_allclose(preds['yhat'][1, 0][valid], expected + 2.0)
+
+def test_stack_masks_missing_dates_within_cutoff():
+    """같은 cutoff에서 한 모델에만 있는 예측 날짜는 제외"""
+    c0 = '2024-01-07'
+    member_folds = {
+        'prophet': {'A': _fold(c0, 4, 1.0)},
+        'arima': {'A': _fold(c0, 4, 2.0).iloc[1:]}
+    }
+    _, _, preds, actual = stack_backtests(member_folds)
+    valid = ~np.isnan(actual[0])
+    assert valid.sum() == 3
+    np.testing.assert_allclose(actual[0][valid], _fold(c0, 4, 0.0)['y'].to_numpy()[1:])
+    assert not np.isnan(preds['yhat'][:, 0][:, valid]).any()